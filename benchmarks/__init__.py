@@ -0,0 +1,7 @@
+"""
+Benchmarks
+
+Timing scripts for the data pipeline. Run a module directly, e.g.
+``python -m benchmarks.long_format`` or ``python -m benchmarks.scoring``
+(per-stage timings on synthetic data from ``benchmarks.synthetic``).
+"""
@@ -0,0 +1,91 @@
+"""
+Long Format Benchmark
+
+Compares melt_to_long_format (SeriesPanel.to_long) with the DataFrame.melt
+approach it replaced, on the full ZIP-level ZHVI file and on the small
+filtered subset the dashboard trend charts use. The compact case is the
+categorical, region-grouped layout (compact=True).
+
+Usage:
+    python -m benchmarks.long_format [data_dir]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.data_loader import (
+    load_zhvi_zip,
+    get_date_columns,
+    get_metadata_columns,
+    melt_to_long_format,
+)
+from src.series_panel import get_panel
+
+
+def melt_baseline(df: pd.DataFrame, value_name: str = 'value') -> pd.DataFrame:
+    """The previous implementation: DataFrame.melt plus date parsing."""
+    df_long = df.melt(
+        id_vars=get_metadata_columns(df),
+        value_vars=get_date_columns(df),
+        var_name='date',
+        value_name=value_name
+    )
+    df_long['date'] = pd.to_datetime(df_long['date'])
+    return df_long
+
+
+def _time(fn, repeat: int = 3):
+    """Best wall time of `repeat` runs, plus the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def run(data_dir=None):
+    df = load_zhvi_zip(data_dir)
+    get_panel(df)  # Build outside the timed region, as the app does
+    zips = df['region_name'].iloc[:10].tolist()
+
+    cases = {
+        'full': (
+            lambda: melt_baseline(df),
+            lambda: melt_to_long_format(df),
+        ),
+        'full, compact': (
+            lambda: melt_baseline(df),
+            lambda: melt_to_long_format(df, compact=True),
+        ),
+        '10 ZIPs': (
+            lambda: melt_baseline(df[df['region_name'].isin(zips)]),
+            lambda: melt_to_long_format(df, regions=zips),
+        ),
+        '10 ZIPs, since 2020': (
+            lambda: melt_baseline(df[df['region_name'].isin(zips)]).query("date >= '2020-01-01'"),
+            lambda: melt_to_long_format(df, regions=zips, start='2020-01-01'),
+        ),
+    }
+
+    print(f"ZHVI: {len(df):,} regions x {len(get_date_columns(df))} dates")
+    print(f"{'case':<22}{'melt s':>10}{'new s':>10}{'speedup':>9}{'melt MB':>10}{'new MB':>10}")
+    for name, (baseline, vectorized) in cases.items():
+        t_old, old = _time(baseline)
+        t_new, new = _time(vectorized)
+        assert len(old) == len(new)
+        print(
+            f"{name:<22}{t_old:>10.3f}{t_new:>10.3f}{t_old / t_new:>8.1f}x"
+            f"{_mb(old):>10.1f}{_mb(new):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run(Path(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,227 @@
+"""
+Scoring Benchmark
+
+Times each stage of the scoring pipeline, plus PropertyAnalyzer and
+AlertManager, on synthetic Zillow data (see benchmarks.synthetic) at several
+region counts and history lengths, and writes the timings as JSON.
+
+Stages: load (CSV parse), panel (SeriesPanel build), appreciation, metro
+metrics, value gap, merge (attach metro/county values by position),
+normalize (metro and value gap scores), composite, sort (full ranking),
+top_k (best 100), the end-to-end flip_opportunity_score, analyze_zip (per
+ZIP), analyze_many (every ZIP, no reports) and alerts (per alert). Each
+stage reports its best time over --repeat runs and its first (cold) run.
+
+Pass an earlier results file as --baseline to flag stages that got slower
+than --tolerance; the exit status is then 1.
+
+Usage:
+    python -m benchmarks.scoring [--regions 26000 100000 1000000]
+        [--months 60 312] [--data-root DIR] [--output FILE]
+        [--baseline FILE] [--tolerance 0.25] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import ensure_datasets
+from src.alert_system import AlertManager
+from src.data_loader import load_all_datasets
+from src.property_analyzer import PropertyAnalyzer
+from src.scoring_engine import (
+    BALANCED,
+    calculate_price_appreciation,
+    calculate_value_tier_gap,
+    composite_scores,
+    compute_component_scores,
+    flip_opportunity_score,
+    gather,
+    get_metro_metrics,
+    lookup_positions,
+    normalize_to_score,
+    score_metros,
+    top_k_positions,
+)
+from src.series_panel import get_panel
+
+
+DEFAULT_DATA_ROOT = Path(__file__).parent / "data"
+
+# Larger sizes are skipped (a float64 matrix of 1e8 cells is 800 MB)
+MAX_CELLS = 10 ** 8
+
+
+def _time(fn: Callable, repeat: int) -> Dict:
+    """Best and first wall time of `repeat` runs, plus the last result."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {'seconds': min(times), 'first_seconds': times[0], 'repeat': repeat, 'result': result}
+
+
+def run_case(data_dir: Path, repeat: int = 3, n_analyses: int = 50, n_alerts: int = 100) -> Dict[str, Dict]:
+    """Time every stage on one generated dataset directory."""
+    stages: Dict[str, Dict] = {}
+
+    def stage(name: str, fn: Callable, runs: int = repeat, items: Optional[int] = None):
+        timing = _time(fn, runs)
+        if items:
+            timing['items'] = items
+        stages[name] = timing
+        return timing.pop('result')
+
+    # 1. Load and index
+    datasets = stage('load', lambda: load_all_datasets(data_dir), runs=1)
+    stage('panel', lambda: [get_panel(df) for df in datasets.values()], runs=1)
+
+    # 2. Component steps, as compute_component_scores runs them
+    appreciation = stage('appreciation', lambda: calculate_price_appreciation(datasets['zhvi_zip']))
+    metro_metrics = stage('metro_metrics', lambda: get_metro_metrics(datasets))
+    value_gap = stage('value_gap', lambda: calculate_value_tier_gap(
+        datasets['zhvi_zip'], datasets['zhvi_bottom_tier']
+    ))
+    metro_scores = stage('normalize_metros', lambda: score_metros(metro_metrics))
+
+    def merge():
+        result = appreciation.copy()
+        positions = lookup_positions(result['metro'], metro_scores['metro'])
+        for col in ['velocity_score', 'distress_score', 'pricing_power_score',
+                    'days_to_pending', 'price_cut_pct', 'sale_to_list']:
+            result[col] = gather(metro_scores[col], positions)
+        positions = lookup_positions(result['county_name'], value_gap['county_name'])
+        result['value_gap_pct'] = gather(value_gap['value_gap_pct'], positions)
+        return result
+    merged = stage('merge', merge)
+    stage('normalize', lambda: normalize_to_score(merged['value_gap_pct']))
+
+    # 3. Composite and ranking
+    components = compute_component_scores(datasets)
+    composites = stage('composite', lambda: composite_scores(components, [BALANCED]))[:, 0]
+    stage('sort', lambda: top_k_positions(composites, len(composites)))
+    stage('top_k', lambda: top_k_positions(composites, 100))
+    scores = stage('flip_opportunity_score', lambda: flip_opportunity_score(datasets))
+
+    # 4. Consumers of the scores
+    analyzer = PropertyAnalyzer(datasets)
+    zips = scores['region_name'].head(n_analyses).tolist()
+    stage('analyze_zip', lambda: [analyzer.analyze_zip(z, scores) for z in zips],
+          runs=1, items=len(zips))
+    stage('analyze_many', lambda: analyzer.analyze_many(scores_df=scores).frame,
+          runs=1, items=len(datasets['zhvi_zip']))
+
+    opportunities = [
+        {
+            'zip_code': row['region_name'],
+            'city': row['city'],
+            'state': row['state'],
+            'metro': row['metro'],
+            'current_score': float(row['composite_score']),
+            'current_value': float(row['current_value']),
+        }
+        for _, row in scores.head(n_alerts).iterrows()
+    ]
+
+    def create_alerts():
+        with tempfile.TemporaryDirectory() as tmp:
+            return AlertManager(Path(tmp)).bulk_create_alerts(opportunities)
+    stage('alerts', create_alerts, runs=1, items=len(opportunities))
+
+    return stages
+
+
+def environment() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[Dict]:
+    """Stages slower than baseline by more than tolerance (as a fraction)."""
+    previous = {(r['regions'], r['months'], r['stage']): r['seconds'] for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get((r['regions'], r['months'], r['stage']))
+        if old and r['seconds'] > old * (1 + tolerance):
+            regressions.append({**r, 'baseline_seconds': old, 'ratio': r['seconds'] / old})
+    return regressions
+
+
+def run(
+    regions: List[int],
+    months: List[int],
+    data_root: Path = DEFAULT_DATA_ROOT,
+    repeat: int = 3
+) -> List[Dict]:
+    """Benchmark every (regions, months) size; returns one record per stage."""
+    results = []
+    for n_regions in regions:
+        for n_months in months:
+            if n_regions * n_months > MAX_CELLS:
+                print(f"Skipping {n_regions:,} x {n_months} (over {MAX_CELLS:,} cells)")
+                continue
+
+            start = time.perf_counter()
+            data_dir = ensure_datasets(data_root, n_regions, n_months)
+            print(f"\n{n_regions:,} ZIPs x {n_months} months "
+                  f"(data ready in {time.perf_counter() - start:.1f}s)")
+
+            for name, timing in run_case(data_dir, repeat=repeat).items():
+                results.append({'regions': n_regions, 'months': n_months, 'stage': name, **timing})
+                per_item = f"  ({timing['seconds'] / timing['items'] * 1000:.3f} ms each)" if 'items' in timing else ''
+                print(f"  {name:<24}{timing['seconds']:>10.4f}s{per_item}")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scoring pipeline on synthetic data")
+    parser.add_argument('--regions', type=int, nargs='+', default=[26000, 100000, 1000000])
+    parser.add_argument('--months', type=int, nargs='+', default=[60, 312])
+    parser.add_argument('--data-root', type=Path, default=DEFAULT_DATA_ROOT,
+                        help="Where generated datasets are kept (reused across runs)")
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results.json'))
+    parser.add_argument('--baseline', type=Path, help="Earlier results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = run(args.regions, args.months, args.data_root, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump({
+            'benchmark': 'scoring',
+            'created': datetime.now().isoformat(),
+            'environment': environment(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\nWrote {len(results)} timings to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['regions']:,} x {r['months']} {r['stage']}: "
+                  f"{r['baseline_seconds']:.4f}s -> {r['seconds']:.4f}s ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Synthetic Zillow Data
+
+Writes Zillow-shaped CSVs (the six files in data_loader.DATASET_FILES) at
+any number of ZIPs and months, so the pipeline can be measured at national
+scale without the real ZIP-level downloads.
+
+Geography is nested like the real data: ZIPs belong to counties of uneven
+size, most counties belong to a metro and every metro sits in one state.
+ZIP values follow a random walk around a metro trend with a few late starts
+and gaps. Metro files cover the last eight years at most, with sale-to-list
+weekly, as Zillow publishes them.
+
+Usage:
+    python -m benchmarks.synthetic out_dir [n_regions] [n_months]
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import DATASET_FILES
+
+
+STATES = [
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL',
+    'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT',
+    'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI',
+    'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
+]
+
+# Metro-level files start in 2018 in the real data
+METRO_MONTHS = 96
+
+END_DATE = '2025-11-30'
+
+
+def dataset_dir(root: Path, n_regions: int, n_months: int, seed: int = 0) -> Path:
+    """Directory for one generated size, e.g. root/zip26000-m312-s0."""
+    return Path(root) / f"zip{n_regions}-m{n_months}-s{seed}"
+
+
+def _region_frame(region_type: str, names, states, id_offset: int = 0) -> pd.DataFrame:
+    n = len(names)
+    return pd.DataFrame({
+        'RegionID': np.arange(n) + id_offset,
+        'SizeRank': np.arange(n),
+        'RegionName': names,
+        'RegionType': region_type,
+        'StateName': states,
+    })
+
+
+def _write(meta: pd.DataFrame, values: np.ndarray, dates, path: Path, float_format: str,
+           header: bool = True, mode: str = 'w') -> None:
+    frame = pd.concat(
+        [meta.reset_index(drop=True), pd.DataFrame(values, columns=list(dates))],
+        axis=1
+    )
+    frame.to_csv(path, index=False, float_format=float_format, header=header, mode=mode)
+
+
+def generate_datasets(
+    out_dir: Path,
+    n_regions: int = 26000,
+    n_months: int = 312,
+    seed: int = 0,
+    chunk_rows: int = 100000
+) -> Path:
+    """
+    Write a synthetic dataset of n_regions ZIPs and n_months of ZHVI history.
+
+    The ZIP file is written in chunks of chunk_rows, so memory stays bounded
+    at a million regions. Returns out_dir.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    dates = pd.date_range(end=END_DATE, periods=n_months, freq='ME')
+    date_cols = dates.strftime('%Y-%m-%d')
+
+    # 1. Geography: metros in states, counties in metros, ZIPs in counties
+    n_metros = int(np.clip(n_regions // 30, 20, 900))
+    n_counties = max(n_regions // 8, 40)
+    metro_state = rng.choice(STATES, n_metros)
+    metro_names = np.array([f"Metro {i}, {s}" for i, s in enumerate(metro_state)], dtype=object)
+
+    county_metro = rng.integers(0, n_metros, n_counties)
+    county_has_metro = rng.random(n_counties) > 0.1
+    county_state = metro_state[county_metro]
+    county_names = np.array([f"County {i}" for i in range(n_counties)], dtype=object)
+
+    # Uneven county sizes (a few large, many small)
+    county_weight = 1 / np.arange(1, n_counties + 1) ** 0.7
+    zip_county = rng.choice(n_counties, n_regions, p=county_weight / county_weight.sum())
+    zip_county = zip_county[rng.permutation(n_regions)]
+
+    # 2. Metro price trends (monthly drift) and county price levels
+    metro_drift = rng.normal(0.003, 0.002, n_metros)[:, None] + rng.normal(0, 0.004, (n_metros, n_months))
+    county_level = rng.lognormal(12.2, 0.45, n_counties)
+
+    # 3. ZIP-level ZHVI, written in row chunks
+    zip_path = out_dir / DATASET_FILES['zhvi_zip']
+    for start in range(0, n_regions, chunk_rows):
+        rows = np.arange(start, min(start + chunk_rows, n_regions))
+        counties = zip_county[rows]
+        metros = county_metro[counties]
+
+        growth = metro_drift[metros] + rng.normal(0, 0.006, (len(rows), n_months))
+        values = county_level[counties, None] * rng.lognormal(0, 0.35, (len(rows), 1))
+        values = values * np.exp(np.cumsum(growth, axis=1) - growth.sum(axis=1, keepdims=True))
+
+        # Late starts and scattered gaps
+        late = rng.random(len(rows)) < 0.05
+        first = rng.integers(0, max(n_months // 2, 1), len(rows))
+        values[late[:, None] & (np.arange(n_months) < first[:, None])] = np.nan
+        values[rng.random(values.shape) < 0.005] = np.nan
+
+        meta = pd.DataFrame({
+            'RegionID': 60000 + rows,
+            'SizeRank': rows,
+            'RegionName': [f"{z:05d}" for z in rows],
+            'RegionType': 'zip',
+            'StateName': county_state[counties],
+            'State': county_state[counties],
+            'City': [f"City {c}" for c in counties],
+            'Metro': np.where(county_has_metro[counties], metro_names[metros], None),
+            'CountyName': county_names[counties],
+        })
+        _write(meta, values, date_cols, zip_path, '%.0f',
+               header=start == 0, mode='w' if start == 0 else 'a')
+
+    # 4. Bottom-tier ZHVI by county (some counties appear twice, as in Zillow)
+    bottom_rows = np.concatenate([np.arange(n_counties), rng.integers(0, n_counties, n_counties // 20)])
+    bottom = (county_level[bottom_rows, None] * rng.uniform(0.6, 0.8, (len(bottom_rows), 1))
+              * np.exp(np.cumsum(metro_drift[county_metro[bottom_rows]], axis=1)
+                       - metro_drift[county_metro[bottom_rows]].sum(axis=1, keepdims=True)))
+    _write(
+        _region_frame('county', county_names[bottom_rows], county_state[bottom_rows], 1000),
+        bottom, date_cols, out_dir / DATASET_FILES['zhvi_bottom_tier'], '%.0f'
+    )
+
+    # 5. Metro market metrics over the metro history window
+    metro_meta = _region_frame('msa', metro_names, metro_state, 390000)
+    months = min(n_months, METRO_MONTHS)
+    metro_dates = date_cols[-months:]
+    heat_trend = rng.normal(50, 15, (n_metros, 1))
+
+    metrics = {
+        'days_to_pending': (rng.normal(35, 10, (n_metros, 1)) + rng.normal(0, 4, (n_metros, months)), '%.0f'),
+        'price_cuts': (np.clip(rng.normal(0.15, 0.05, (n_metros, 1)) + rng.normal(0, 0.02, (n_metros, months)), 0, 1), '%.4f'),
+        'market_heat': (heat_trend + rng.normal(0, 5, (n_metros, months)), '%.0f'),
+    }
+    for name, (values, fmt) in metrics.items():
+        _write(metro_meta, values, metro_dates, out_dir / DATASET_FILES[name], fmt)
+
+    weeks = pd.date_range(end=END_DATE, periods=months * 52 // 12, freq='W-SAT')
+    sale_to_list = rng.normal(0.99, 0.015, (n_metros, 1)) + rng.normal(0, 0.005, (n_metros, len(weeks)))
+    # Weekly series only cover the larger metros
+    covered = np.arange(n_metros) < max(n_metros // 4, 10)
+    _write(metro_meta[covered], sale_to_list[covered], weeks.strftime('%Y-%m-%d'),
+           out_dir / DATASET_FILES['sale_to_list'], '%.4f')
+
+    return out_dir
+
+
+def ensure_datasets(root: Path, n_regions: int, n_months: int, seed: int = 0) -> Path:
+    """Generated dataset directory for a size, writing it only if missing."""
+    out_dir = dataset_dir(root, n_regions, n_months, seed)
+    if not all((out_dir / name).exists() for name in DATASET_FILES.values()):
+        generate_datasets(out_dir, n_regions, n_months, seed)
+    return out_dir
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1])
+    regions = int(sys.argv[2]) if len(sys.argv) > 2 else 26000
+    n_months = int(sys.argv[3]) if len(sys.argv) > 3 else 312
+    generate_datasets(target, regions, n_months)
+    print(f"Wrote {regions:,} ZIPs x {n_months} months to {target}")
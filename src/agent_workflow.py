@@ -20,6 +20,11 @@ import pandas as pd
 import numpy as np
 import hashlib
 
+from .data_loader import refresh_datasets
+from .profiling import PipelineProfile
+from .region_index import get_region_index
+from .scoring_engine import top_k_rows
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -154,16 +159,77 @@ class BaseAgent(ABC):
 class DataRefreshAgent(BaseAgent):
     """
     Agent that checks for new Zillow data updates.
-    Simulates monthly data refresh (typically around 16th of month).
+
+    With a cache_dir, syncs the dataset cache against the CSVs on disk and
+    passes the resulting DataDelta descriptors downstream. Otherwise
+    simulates monthly data refresh (typically around 16th of month).
     """
 
-    def __init__(self, log_dir: Path):
+    def __init__(
+        self,
+        log_dir: Path,
+        data_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None
+    ):
         super().__init__("DataRefreshAgent", log_dir)
         self.refresh_day = 16  # Day of month Zillow typically updates
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+
+    def _refresh_cache(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Sync the dataset cache and report per-dataset deltas."""
+        start_time = datetime.now()
+        current_date = context.get('current_date', datetime.now())
+        state = context.get('state', AgentState())
+
+        deltas = refresh_datasets(self.data_dir, self.cache_dir)
+        new_data_available = bool(deltas)
+        new_version = f"v{current_date.strftime('%Y%m')}"
+
+        # Downstream agents can limit rescoring to the changed regions
+        context['data_deltas'] = deltas
+
+        result = {
+            'new_data_available': new_data_available,
+            'data_version': new_version if new_data_available else state.data_version,
+            'checked_at': current_date.isoformat(),
+            'deltas': {name: delta.to_dict() for name, delta in deltas.items()}
+        }
+
+        duration = (datetime.now() - start_time).total_seconds()
+        self.log_action(
+            "data_refresh",
+            {
+                'new_data': new_data_available,
+                'version': result['data_version'],
+                'datasets': {
+                    name: {
+                        'new_dates': delta.new_dates,
+                        'changed_regions': len(delta.changed_regions),
+                        'unusual_regions': len(delta.unusual_regions),
+                        'full_reload': delta.full_reload
+                    }
+                    for name, delta in deltas.items()
+                }
+            },
+            duration=duration
+        )
+
+        if new_data_available:
+            state.last_data_refresh = current_date.isoformat()
+            state.data_version = new_version
+
+        self.status = AgentStatus.COMPLETED
+        self.last_run = current_date
+
+        return result
 
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Check if new data is available."""
         self.status = AgentStatus.RUNNING
+        if self.cache_dir is not None:
+            return self._refresh_cache(context)
+
         start_time = datetime.now()
 
         current_date = context.get('current_date', datetime.now())
@@ -252,16 +318,25 @@ class ScoringAgent(BaseAgent):
             duration=duration
         )
 
+        # Stage profile of the run that produced scores_df, if one was recorded
+        profile = context.get('scoring_profile')
+        if profile is not None:
+            profile = profile.to_dict()
+            self.log_action("scoring_profiled", profile, duration=profile['total_seconds'])
+
         state.last_scoring_run = current_date.isoformat()
 
         self.status = AgentStatus.COMPLETED
         self.last_run = current_date
 
-        return {
+        result = {
             'success': True,
             'stats': stats,
             'scored_at': current_date.isoformat()
         }
+        if profile is not None:
+            result['profile'] = profile
+        return result
 
 
 class OpportunityDetectionAgent(BaseAgent):
@@ -299,7 +374,12 @@ class OpportunityDetectionAgent(BaseAgent):
         new_opportunities = []
         changed_opportunities = []
 
-        for _, row in high_scores.iterrows():
+        # Previous score of each high-scoring ZIP, found in one batch lookup
+        previous_positions = np.full(len(high_scores), -1)
+        if previous_scores_df is not None:
+            previous_positions = get_region_index(previous_scores_df).positions(high_scores['region_name'])
+
+        for i, (_, row) in enumerate(high_scores.iterrows()):
             zip_hash = self._compute_hash(row)
             is_new = zip_hash not in state.known_opportunity_hashes
 
@@ -307,13 +387,9 @@ class OpportunityDetectionAgent(BaseAgent):
             previous_score = None
             score_change = 0
 
-            if previous_scores_df is not None:
-                prev_row = previous_scores_df[
-                    previous_scores_df['region_name'] == row['region_name']
-                ]
-                if len(prev_row) > 0:
-                    previous_score = prev_row.iloc[0]['composite_score']
-                    score_change = row['composite_score'] - previous_score
+            if previous_positions[i] >= 0:
+                previous_score = previous_scores_df['composite_score'].iat[previous_positions[i]]
+                score_change = row['composite_score'] - previous_score
 
             opportunity = {
                 'zip_code': row['region_name'],
@@ -755,7 +831,7 @@ class ReportGeneratorAgent(BaseAgent):
 
         # Add top opportunities
         if scores_df is not None:
-            top_5 = scores_df.head(5)
+            top_5 = top_k_rows(scores_df, 'composite_score', 5)
             report['top_opportunities'] = [
                 {
                     'zip': row['region_name'],
@@ -862,10 +938,14 @@ class AgentOrchestrator:
         self,
         current_date: datetime,
         scores_df: Optional[pd.DataFrame] = None,
-        previous_scores_df: Optional[pd.DataFrame] = None
+        previous_scores_df: Optional[pd.DataFrame] = None,
+        scoring_profile: Optional[PipelineProfile] = None
     ) -> Dict[str, Any]:
         """
         Run the daily agent workflow.
+
+        Pass the PipelineProfile recorded while computing scores_df as
+        scoring_profile to have the ScoringAgent log its stages.
         """
         results = {
             'run_date': current_date.isoformat(),
@@ -876,7 +956,8 @@ class AgentOrchestrator:
             'current_date': current_date,
             'state': self.state,
             'scores_df': scores_df,
-            'previous_scores_df': previous_scores_df
+            'previous_scores_df': previous_scores_df,
+            'scoring_profile': scoring_profile
         }
 
         # 1. Check for data refresh
@@ -0,0 +1,337 @@
+"""
+Data Cache Module
+
+Binary on-disk cache for parsed Zillow CSVs. Each cached dataset is stored as:
+- a .npy value matrix (regions x dates)
+- a pickled metadata table (non-date columns)
+- a JSON manifest describing the source file it was built from
+- optionally, pickled validation statistics for the cached frame
+- optionally, a pickled quantile sketch of month-over-month changes, kept
+  up to date by incremental appends
+
+A cache entry is only used while its source fingerprint (size/mtime, falling
+back to a content hash) still matches the CSV on disk.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Bump when the on-disk layout changes so old entries are rebuilt
+CACHE_VERSION = 1
+
+
+def _file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: Path, with_hash: bool = False) -> Dict:
+    """Describe a source file by size and mtime (and optionally content hash)."""
+    stat = Path(path).stat()
+    fingerprint = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint['sha1'] = _file_hash(path)
+    return fingerprint
+
+
+def cache_key(path: Path) -> str:
+    """Cache entry name for a source file (stem plus a short path digest)."""
+    path = Path(path).resolve()
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:8]
+    return f"{path.stem}-{digest}"
+
+
+def cache_paths(path: Path, cache_dir: Path) -> Dict[str, Path]:
+    """Paths of the manifest, metadata and value files for a source file."""
+    key = cache_key(path)
+    cache_dir = Path(cache_dir)
+    return {
+        'manifest': cache_dir / f"{key}.json",
+        'metadata': cache_dir / f"{key}.meta.pkl",
+        'values': cache_dir / f"{key}.values.npy",
+        'validation': cache_dir / f"{key}.validation.pkl",
+        'changes': cache_dir / f"{key}.changes.pkl",
+    }
+
+
+def _atomic_write(target: Path, write_fn) -> None:
+    """Write via a temp file and rename so readers never see partial files."""
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        write_fn(tmp)
+        os.replace(tmp, target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def read_manifest(path: Path, cache_dir: Path) -> Optional[Dict]:
+    """Load the manifest for a source file, or None if there is no entry."""
+    manifest_path = cache_paths(path, cache_dir)['manifest']
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(path: Path, manifest: Optional[Dict], cache_dir: Optional[Path] = None) -> bool:
+    """
+    Check whether a manifest still describes the source file.
+
+    Size and mtime are compared first. If only the mtime differs (file was
+    touched or copied) the content hash decides, and the manifest is updated
+    so the next check is cheap again.
+    """
+    if manifest is None:
+        return False
+    if manifest.get('version') != CACHE_VERSION or manifest.get('pandas') != pd.__version__:
+        return False
+
+    cached = manifest['source']
+    current = source_fingerprint(path)
+    if current['size'] != cached['size']:
+        return False
+    if current['mtime_ns'] == cached['mtime_ns']:
+        return True
+    if 'sha1' not in cached or _file_hash(path) != cached['sha1']:
+        return False
+
+    if cache_dir is not None:
+        manifest['source']['mtime_ns'] = current['mtime_ns']
+        try:
+            _write_manifest(manifest, cache_paths(path, cache_dir)['manifest'])
+        except OSError:
+            pass
+    return True
+
+
+def _write_manifest(manifest: Dict, target: Path) -> None:
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    _atomic_write(target, write)
+
+
+def _save_npy(target: Path, values: np.ndarray) -> None:
+    # Pass a file object: np.save appends '.npy' to bare temp-file names
+    with open(target, 'wb') as f:
+        np.save(f, values)
+
+
+def write_cache(
+    df: pd.DataFrame,
+    path: Path,
+    cache_dir: Path,
+    date_columns: List[str]
+) -> bool:
+    """
+    Write a parsed dataset to the cache.
+
+    Returns False (and leaves any previous entry untouched) if the cache
+    directory is not writable.
+    """
+    paths = cache_paths(path, cache_dir)
+    meta_cols = [c for c in df.columns if c not in set(date_columns)]
+    values = np.ascontiguousarray(df[date_columns].to_numpy(dtype=np.float64))
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'pandas': pd.__version__,
+        'source': {'name': Path(path).name, **source_fingerprint(path, with_hash=True)},
+        'columns': [str(c) for c in df.columns],
+        'date_columns': list(date_columns),
+        'metadata_columns': meta_cols,
+        # Date columns parsed as something other than float64 (e.g. int64)
+        'value_dtypes': {
+            str(c): str(t) for c, t in df[date_columns].dtypes.items() if t != np.float64
+        },
+    }
+
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        _atomic_write(paths['values'], lambda tmp: _save_npy(tmp, values))
+        _atomic_write(paths['metadata'], lambda tmp: df[meta_cols].to_pickle(tmp))
+        _write_manifest(manifest, paths['manifest'])
+    except OSError:
+        return False
+    return True
+
+
+def read_cache(
+    path: Path,
+    cache_dir: Path,
+    mmap: bool = False
+) -> Optional[pd.DataFrame]:
+    """
+    Load a dataset from the cache if the entry is fresh, else return None.
+
+    With mmap=True the value matrix is opened read-only with np.load's
+    mmap_mode instead of being read into memory. The frame's date columns
+    are then backed by the page cache, so every process that maps the same
+    entry shares one physical copy.
+    """
+    manifest = read_manifest(path, cache_dir)
+    if not is_fresh(path, manifest, cache_dir):
+        return None
+
+    paths = cache_paths(path, cache_dir)
+    try:
+        meta = pd.read_pickle(paths['metadata'])
+        values = np.load(paths['values'], mmap_mode='r' if mmap else None)
+    except (OSError, ValueError):
+        return None
+
+    return _assemble_frame(meta, values, manifest)
+
+
+def read_cache_column(path: Path, cache_dir: Path, position: int) -> np.ndarray:
+    """Read a single date column of a cache entry (fresh or not)."""
+    values = np.load(cache_paths(path, cache_dir)['values'], mmap_mode='r')
+    return np.array(values[:, position])
+
+
+def read_cached_metadata(path: Path, cache_dir: Path) -> Optional[pd.DataFrame]:
+    """Load just the metadata table of a cache entry (fresh or not)."""
+    try:
+        return pd.read_pickle(cache_paths(path, cache_dir)['metadata'])
+    except (OSError, ValueError):
+        return None
+
+
+def read_validation(path: Path, cache_dir: Path) -> Optional[Dict]:
+    """
+    Load stored validation statistics if they still describe the source file.
+
+    Statistics are tied to the manifest's source fingerprint, so they expire
+    together with the cache entry (including after an incremental append).
+    """
+    manifest = read_manifest(path, cache_dir)
+    if not is_fresh(path, manifest, cache_dir):
+        return None
+    try:
+        stats = pd.read_pickle(cache_paths(path, cache_dir)['validation'])
+    except (OSError, ValueError):
+        return None
+    if stats.get('source', {}).get('sha1') != manifest['source'].get('sha1'):
+        return None
+    return stats
+
+
+def write_validation(path: Path, cache_dir: Path, stats: Dict) -> bool:
+    """
+    Store validation statistics next to a fresh cache entry.
+
+    Returns False if there is no fresh entry to attach them to or the cache
+    directory is not writable.
+    """
+    manifest = read_manifest(path, cache_dir)
+    if not is_fresh(path, manifest, cache_dir):
+        return False
+    stats = {**stats, 'source': manifest['source']}
+    try:
+        _atomic_write(
+            cache_paths(path, cache_dir)['validation'],
+            lambda tmp: pd.to_pickle(stats, tmp)
+        )
+    except OSError:
+        return False
+    return True
+
+
+def read_change_sketch(path: Path, cache_dir: Path, manifest: Dict):
+    """
+    Load the stored change sketch if it was built for this manifest's source.
+
+    Unlike read_validation() the entry need not be fresh: the refresh path
+    reads the sketch of a stale entry before appending to it.
+    """
+    try:
+        stored = pd.read_pickle(cache_paths(path, cache_dir)['changes'])
+    except (OSError, ValueError, AttributeError):
+        return None
+    if stored.get('source', {}).get('sha1') != manifest['source'].get('sha1'):
+        return None
+    return stored['sketch']
+
+
+def write_change_sketch(path: Path, cache_dir: Path, sketch) -> bool:
+    """Store a change sketch for the current cache entry (False on failure)."""
+    manifest = read_manifest(path, cache_dir)
+    if manifest is None:
+        return False
+    stored = {'sketch': sketch, 'source': manifest['source']}
+    try:
+        _atomic_write(
+            cache_paths(path, cache_dir)['changes'],
+            lambda tmp: pd.to_pickle(stored, tmp)
+        )
+    except OSError:
+        return False
+    return True
+
+
+def append_to_cache(
+    path: Path,
+    cache_dir: Path,
+    manifest: Dict,
+    new_date_columns: List[str],
+    new_values: np.ndarray,
+    delta: Dict
+) -> bool:
+    """
+    Extend a cache entry with trailing date columns from an updated source.
+
+    The existing matrix is widened with new_values, the manifest is pointed
+    at the current source file and the delta descriptor is stored under
+    'last_delta'. Returns False if the cache could not be written.
+    """
+    paths = cache_paths(path, cache_dir)
+    try:
+        old_values = np.load(paths['values'], mmap_mode='r')
+        values = np.hstack([old_values, new_values.astype(old_values.dtype)])
+        del old_values
+
+        updated = dict(manifest)
+        updated['source'] = {'name': Path(path).name, **source_fingerprint(path, with_hash=True)}
+        updated['columns'] = manifest['columns'] + list(new_date_columns)
+        updated['date_columns'] = manifest['date_columns'] + list(new_date_columns)
+        updated['last_delta'] = delta
+
+        _atomic_write(paths['values'], lambda tmp: _save_npy(tmp, values))
+        _write_manifest(updated, paths['manifest'])
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _assemble_frame(meta: pd.DataFrame, values: np.ndarray, manifest: Dict) -> pd.DataFrame:
+    """Rebuild the wide frame from metadata table and value matrix."""
+    values_df = pd.DataFrame(values, columns=manifest['date_columns'], index=meta.index, copy=False)
+    if manifest.get('value_dtypes'):
+        # A per-column astype leaves one block per column; the copy
+        # consolidates them into one block per dtype, as read_csv returns
+        values_df = values_df.astype(manifest['value_dtypes']).copy()
+
+    # Concatenate once (no insert loop, which fragments the frame); neither
+    # the concat nor the column reorder copies a memory-mapped matrix
+    df = pd.concat([meta, values_df], axis=1)
+    if list(df.columns) != manifest['columns']:
+        df = df[manifest['columns']]
+    return df
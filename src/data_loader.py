@@ -7,13 +7,55 @@ Functions to load and preprocess Zillow Research datasets for house flipper anal
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, asdict, field
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .data_cache import (
+    CACHE_VERSION,
+    append_to_cache,
+    cache_paths,
+    is_fresh,
+    read_cache,
+    read_cache_column,
+    read_change_sketch,
+    read_cached_metadata,
+    read_manifest,
+    read_validation,
+    write_cache,
+    write_change_sketch,
+    write_validation,
+)
+from .normalization import StreamingNormalizer
 
 
 # Default data directory
 DATA_DIR = Path(__file__).parent.parent / "data" / "raw" / "zillow"
 
+# Default location for the binary dataset cache (see data_cache.py)
+CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
+
+# Source CSV for each dataset key
+DATASET_FILES = {
+    'zhvi_zip': "zhvi_all_homes_zip.csv",
+    'zhvi_bottom_tier': "zhvi_bottom_tier_county.csv",
+    'market_heat': "market_heat_index_metro.csv",
+    'days_to_pending': "days_to_pending_metro.csv",
+    'price_cuts': "price_cuts_metro.csv",
+    'sale_to_list': "sale_to_list_metro.csv",
+}
+
+# Month-over-month changes beyond these percentiles of a dataset's history
+# mark a region as unusual in a refresh (see DataDelta.unusual_regions)
+UNUSUAL_CHANGE_PERCENTILE = 1.0
+
+# Columns that must not be type-inferred (ZIPs keep leading zeros)
+_CSV_DTYPES = {
+    'zhvi_zip': {'RegionName': str},
+}
+
 
 def _identify_date_columns(columns: List[str]) -> List[str]:
     """Identify columns that are dates (format YYYY-MM-DD)."""
@@ -45,55 +87,460 @@ def _standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
 
 
-def _validate_dataframe(df: pd.DataFrame, name: str) -> Dict:
-    """Validate a dataframe and return validation info."""
-    date_cols = _identify_date_columns(df.columns.tolist())
-    meta_cols = _identify_metadata_columns(df.columns.tolist())
+# Low-cardinality metadata stored as categoricals by the compact profile.
+# region_name is left as a string: it is unique per row (so a categorical
+# saves nothing) and ZIPs are looked up as zero-padded strings everywhere.
+COMPACT_CATEGORICAL_COLUMNS = [
+    'state', 'state_name', 'metro', 'county_name', 'city', 'region_type'
+]
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    downcast_values: bool = True,
+    rtol: float = 1e-6
+) -> pd.DataFrame:
+    """
+    Shrink a Zillow frame's memory footprint.
+
+    - Repeated metadata strings become categoricals
+    - Integer IDs are downcast (e.g. int64 -> int32)
+    - Date columns become float32 if every value round-trips within rtol
+
+    The bytes saved are recorded in df.attrs['memory_saved_bytes'].
+
+    Only the metadata columns are converted; the date columns are shared
+    with df (not copied) unless they are downcast, so a memory-mapped
+    value matrix stays mapped with downcast_values=False.
+    """
+    before = df.memory_usage(deep=True).sum()
+    date_cols = get_date_columns(df)
+
+    # A shallow copy shares every column with df until one is replaced
+    result = df.copy(deep=False)
+
+    for col in COMPACT_CATEGORICAL_COLUMNS:
+        if col in result.columns and not isinstance(result[col].dtype, pd.CategoricalDtype):
+            result[col] = result[col].astype('category')
+
+    for col in ['region_id', 'size_rank', 'state_fips', 'municipal_fips']:
+        if col in result.columns and pd.api.types.is_integer_dtype(result[col]):
+            result[col] = pd.to_numeric(result[col], downcast='integer')
+
+    if downcast_values and date_cols:
+        values = df[date_cols].to_numpy(dtype=np.float64)
+        values32 = values.astype(np.float32)
+        if np.allclose(values32, values, rtol=rtol, atol=0, equal_nan=True):
+            downcast = pd.DataFrame(values32, columns=date_cols, index=result.index, copy=False)
+            result = pd.concat([result.drop(columns=date_cols), downcast], axis=1)[df.columns]
 
-    # Parse dates for date range
+    result.attrs['memory_saved_bytes'] = int(before - result.memory_usage(deep=True).sum())
+    return result
+
+
+def _dataset_stats(df: pd.DataFrame, name: str) -> Dict:
+    """
+    Compute validation statistics for a wide dataset in one pass.
+
+    The value block is scanned once for missing values; per-date coverage,
+    per-region coverage and gap positions are all derived from that mask.
+
+    Returns:
+        Dict with:
+        - summary: dataset-level fields (see validate_all_datasets)
+        - column_coverage: Series of observed fraction per date column
+        - region_coverage: DataFrame per region (row-aligned with df) with
+          observed, coverage, first_date, last_date, interior_missing
+          (missing months between first and last observation) and stale
+          (latest date missing)
+        - columns: Column list the statistics were computed for
+    """
+    columns = df.columns.tolist()
+    date_cols = _identify_date_columns(columns)
+    meta_cols = _identify_metadata_columns(columns)
     dates = pd.to_datetime(date_cols)
 
-    validation = {
+    valid = df[date_cols].notna().to_numpy()
+    n_regions, n_dates = valid.shape
+
+    observed = valid.sum(axis=1)
+    has_any = observed > 0
+    # argmax finds the first True; undefined (0) for empty rows, masked below
+    first = np.where(has_any, valid.argmax(axis=1), -1)
+    last = np.where(has_any, n_dates - 1 - valid[:, ::-1].argmax(axis=1), -1)
+    interior_missing = np.where(has_any, last - first + 1 - observed, 0)
+    stale = has_any & (last < n_dates - 1)
+
+    region_coverage = pd.DataFrame({
+        'observed': observed,
+        'coverage': observed / max(n_dates, 1),
+        # -1 (no observations) becomes NaT
+        'first_date': dates.take(first, allow_fill=True, fill_value=pd.NaT),
+        'last_date': dates.take(last, allow_fill=True, fill_value=pd.NaT),
+        'interior_missing': interior_missing,
+        'stale': stale,
+    }, index=df.index)
+    if 'region_name' in df.columns:
+        region_coverage.insert(0, 'region_name', df['region_name'].to_numpy())
+
+    column_coverage = pd.Series(valid.sum(axis=0) / max(n_regions, 1), index=date_cols)
+
+    missing_values = int(df[meta_cols].isna().to_numpy().sum()) + int(valid.size - observed.sum())
+    summary = {
         'name': name,
         'shape': df.shape,
-        'num_regions': len(df),
-        'num_dates': len(date_cols),
-        'date_range': (dates.min(), dates.max()) if len(dates) > 0 else (None, None),
+        'num_regions': n_regions,
+        'num_dates': n_dates,
+        'date_range': (dates.min(), dates.max()) if n_dates > 0 else (None, None),
         'metadata_columns': meta_cols,
-        'missing_values': df.isnull().sum().sum(),
-        'missing_pct': (df.isnull().sum().sum() / df.size) * 100,
+        'missing_values': missing_values,
+        'missing_pct': missing_values / df.size * 100 if df.size else 0.0,
+        'regions_with_gaps': int((interior_missing > 0).sum()),
+        'stale_regions': int(stale.sum()),
+        'empty_regions': int((~has_any).sum()),
+    }
+
+    return {
+        'summary': summary,
+        'column_coverage': column_coverage,
+        'region_coverage': region_coverage,
+        'columns': columns,
+    }
+
+
+def _validate_dataframe(
+    df: pd.DataFrame,
+    name: str,
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None
+) -> Dict:
+    """
+    Validation statistics for one dataset, reusing stored ones when possible.
+
+    With a cache_dir, statistics stored next to the dataset's cache entry
+    are reused while the source file is unchanged and the frame still has
+    the cached columns (windowed frames are validated afresh and not stored).
+    """
+    path = (data_dir or DATA_DIR) / DATASET_FILES[name] if name in DATASET_FILES else None
+    columns = df.columns.tolist()
+
+    stats = None
+    if cache_dir is not None and path is not None:
+        stats = read_validation(path, cache_dir)
+        if stats is not None and (stats['columns'] != columns or
+                                  stats['summary']['num_regions'] != len(df)):
+            stats = None
+
+    if stats is None:
+        stats = _dataset_stats(df, name)
+        if cache_dir is not None and path is not None:
+            manifest = read_manifest(path, cache_dir)
+            if manifest is not None and manifest['columns'] == [str(c) for c in columns]:
+                write_validation(path, cache_dir, stats)
+
+    # Memory depends on how this frame was loaded (compact, mmap), not the file
+    stats['summary'] = {
+        **stats['summary'],
+        'memory_mb': df.memory_usage(deep=True).sum() / 1e6,
+        'memory_saved_mb': df.attrs.get('memory_saved_bytes', 0) / 1e6,
     }
+    return stats
 
-    return validation
 
+def _window_columns(date_cols: List[str], months: int) -> List[str]:
+    """Date columns falling in the last `months` calendar months."""
+    if not date_cols:
+        return []
+    periods = pd.to_datetime(date_cols).to_period('M')
+    cutoff = periods.max() - months
+    return [col for col, period in zip(date_cols, periods) if period > cutoff]
+
+
+def read_csv_window(
+    path: Path,
+    months: Optional[int] = None,
+    chunksize: int = 5000,
+    dtype: Optional[Dict] = None
+) -> pd.DataFrame:
+    """
+    Read a wide Zillow CSV keeping only metadata plus a trailing date window.
+
+    Only the header is read up front. The body is then parsed in row chunks
+    with the unneeded date columns projected away, so peak memory stays close
+    to the size of the returned frame instead of the whole file.
+
+    Args:
+        path: CSV file
+        months: Keep date columns in the last N calendar months (all if None).
+                For weekly files this keeps every week in those months.
+        chunksize: Rows parsed per chunk
+        dtype: dtype overrides passed to pd.read_csv (raw column names)
+
+    Returns:
+        DataFrame with standardized column names
+    """
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    date_cols = _identify_date_columns(header)
+    keep_dates = date_cols if months is None else _window_columns(date_cols, months)
+    keep = set(_identify_metadata_columns(header)) | set(keep_dates)
+    usecols = [col for col in header if col in keep]
+
+    chunks = pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
+    df = pd.concat(chunks, ignore_index=True)[usecols]
+    return _standardize_column_names(df)
+
+
+@dataclass
+class DataDelta:
+    """Describes what changed in a dataset since its cached version."""
+    dataset: str
+    new_dates: List[str]
+    # Regions whose value moved in any new period (vs. the period before it)
+    changed_regions: List[str] = field(default_factory=list)
+    full_reload: bool = False  # True when the whole file had to be re-parsed
+    # Regions with a new period-over-period change outside the dataset's
+    # historical UNUSUAL_CHANGE_PERCENTILE bounds (incremental appends only)
+    unusual_regions: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DataDelta':
+        return cls(**data)
+
+
+def _pct_changes(block: np.ndarray) -> np.ndarray:
+    """Period-over-period % changes along the columns (NaN where undefined)."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        changes = np.diff(block, axis=1) / block[:, :-1] * 100
+    return np.where(np.isfinite(changes), changes, np.nan)
+
+
+def _change_sketch(path: Path, cache_dir: Path, manifest: Dict) -> StreamingNormalizer:
+    """
+    Quantile sketch of every cached period-over-period change.
+
+    Loaded from the cache when one was stored for this entry; otherwise built
+    once from the cached matrix, a few columns (about a million values) at a
+    time. Later appends only add their new columns.
+    """
+    sketch = read_change_sketch(path, cache_dir, manifest)
+    if sketch is not None:
+        return sketch
+
+    # Seeded so the same cache gives the same flags
+    sketch = StreamingNormalizer(clip_percentile=UNUSUAL_CHANGE_PERCENTILE, seed=0)
+    values = np.load(cache_paths(path, cache_dir)['values'], mmap_mode='r')
+    n_rows, n_cols = values.shape
+    step = max(1, (1 << 20) // max(n_rows, 1))
+    for first in range(0, n_cols - 1, step):
+        sketch.update(_pct_changes(np.asarray(values[:, first:first + step + 1])))
+    return sketch
+
+
+def _append_new_months(name: str, path: Path, cache_dir: Path) -> Optional[DataDelta]:
+    """
+    Bring a stale cache entry up to date by appending only new date columns.
+
+    Applies when the updated CSV has the cached columns as a prefix followed
+    by later dates, and the same regions in the same order. Only metadata
+    and the new columns are parsed. Returns None (caller does a full reload)
+    when the update does not have that shape.
+
+    Revisions Zillow makes to earlier months are not picked up here; run
+    with rebuild_cache=True periodically to refresh the full history.
+
+    The new changes are checked against the entry's change sketch before
+    being added to it, so the sketch stays current at the cost of the new
+    columns only.
+    """
+    manifest = read_manifest(path, cache_dir)
+    if manifest is None or manifest.get('version') != CACHE_VERSION:
+        return None
+
+    raw_header = pd.read_csv(path, nrows=0).columns.tolist()
+    header = _standardize_column_names(pd.DataFrame(columns=raw_header)).columns.tolist()
+    cached_cols = manifest['columns']
+    new_cols = header[len(cached_cols):]
+
+    if header[:len(cached_cols)] != cached_cols or not new_cols:
+        return None
+    if _identify_date_columns(new_cols) != new_cols:
+        return None
+    if not manifest['date_columns'] or sorted(new_cols) != new_cols:
+        return None
+    if new_cols[0] <= manifest['date_columns'][-1]:
+        return None
+
+    meta_cols = manifest['metadata_columns']
+    usecols = [raw for raw, col in zip(raw_header, header) if col in meta_cols]
+    usecols += raw_header[len(cached_cols):]
+    update = _standardize_column_names(
+        pd.read_csv(path, usecols=usecols, dtype=_CSV_DTYPES.get(name))
+    )
+
+    cached_meta = read_cached_metadata(path, cache_dir)
+    if cached_meta is None or not update[meta_cols].equals(cached_meta):
+        return None
+
+    new_values = update[new_cols].to_numpy(dtype=np.float64)
+
+    # A region changed if any new value differs from the one before it
+    block = np.column_stack([read_cache_column(path, cache_dir, -1), new_values])
+    before, after = block[:, :-1], block[:, 1:]
+    same = np.isclose(after, before) | (np.isnan(after) & np.isnan(before))
+    changed = ~same.all(axis=1)
+    # A region is unusual if a new change falls outside the historical bounds
+    sketch = _change_sketch(path, cache_dir, manifest)
+    new_changes = _pct_changes(block)
+    unusual = np.zeros(len(new_values), dtype=bool)
+    if sketch.sketch.count:
+        lower, upper = sketch.bounds()
+        with np.errstate(invalid='ignore'):
+            unusual = ((new_changes < lower) | (new_changes > upper)).any(axis=1)
+
+    region_names = np.asarray(
+        update['region_name'] if 'region_name' in update.columns else update.index
+    )
+    delta = DataDelta(
+        dataset=name,
+        new_dates=new_cols,
+        changed_regions=[str(r) for r in region_names[changed]],
+        unusual_regions=[str(r) for r in region_names[unusual]],
+    )
 
-def load_zhvi_zip(data_dir: Optional[Path] = None) -> pd.DataFrame:
+    if not append_to_cache(path, cache_dir, manifest, new_cols, new_values, delta.to_dict()):
+        return None
+    write_change_sketch(path, cache_dir, sketch.update(new_changes))
+    return delta
+
+
+def _load_window(
+    name: str,
+    path: Path,
+    cache_dir: Optional[Path],
+    months: int
+) -> pd.DataFrame:
+    """Load metadata plus the last `months` of date columns for a dataset."""
+    if cache_dir is not None:
+        cached = read_cache(path, cache_dir, mmap=True)
+        if cached is not None:
+            date_cols = get_date_columns(cached)
+            keep = set(_window_columns(date_cols, months))
+            columns = [c for c in cached.columns if c not in date_cols or c in keep]
+            # Copy so the small window does not pin the whole mapping
+            return cached[columns].copy()
+
+    return read_csv_window(path, months=months, dtype=_CSV_DTYPES.get(name))
+
+
+def _load_dataset(
+    name: str,
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    mmap: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Load one dataset by key, going through the binary cache when enabled.
+
+    With a cache_dir, a fresh cache entry is used instead of parsing the CSV.
+    A stale entry whose source only gained trailing months is extended in
+    place; otherwise a missing or stale entry (source file changed) falls
+    back to the CSV and rewrites the cache. rebuild_cache forces the CSV path.
+
+    With mmap=True (cache_dir defaults to CACHE_DIR) the date columns are a
+    read-only memory map of the cached value matrix. Copy the frame before
+    modifying its values.
+
+    With compact=True the frame goes through compact_dtypes(). Values of a
+    memory-mapped frame stay float64, since downcasting would make a
+    private copy of the shared matrix.
+
+    With months=N only the last N calendar months of date columns are
+    loaded: sliced from a fresh cache entry if there is one, otherwise read
+    from the CSV with read_csv_window(). Windowed reads never write the cache.
+    """
+    path = (data_dir or DATA_DIR) / DATASET_FILES[name]
+    if mmap and cache_dir is None:
+        cache_dir = CACHE_DIR
+
+    if months is not None:
+        df = _load_window(name, path, cache_dir, months)
+        return compact_dtypes(df) if compact else df
+
+    df = None
+    if cache_dir is not None and not rebuild_cache:
+        df = read_cache(path, cache_dir, mmap=mmap)
+        if df is None and _append_new_months(name, path, cache_dir) is not None:
+            df = read_cache(path, cache_dir, mmap=mmap)
+
+    if df is None:
+        df = pd.read_csv(path, dtype=_CSV_DTYPES.get(name))
+        df = _standardize_column_names(df)
+
+        if cache_dir is not None:
+            written = write_cache(df, path, cache_dir, get_date_columns(df))
+            if mmap and written:
+                # Swap the parsed copy for the shared mapping just written
+                df = read_cache(path, cache_dir, mmap=True)
+
+    if compact:
+        df = compact_dtypes(df, downcast_values=not mmap)
+
+    return df
+
+
+def load_zhvi_zip(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    mmap: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load ZIP-level Zillow Home Value Index (all homes).
 
     Returns DataFrame with standardized column names.
     Geographic level: ZIP code
+    With mmap=True the monthly values are shared read-only across processes.
+    With months=N only the last N months are loaded (see read_csv_window).
     """
-    path = (data_dir or DATA_DIR) / "zhvi_all_homes_zip.csv"
-    df = pd.read_csv(path, dtype={'RegionName': str})
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'zhvi_zip', data_dir, cache_dir, rebuild_cache,
+        mmap=mmap, compact=compact, months=months
+    )
 
 
-def load_zhvi_bottom_tier_county(data_dir: Optional[Path] = None) -> pd.DataFrame:
+def load_zhvi_bottom_tier_county(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load County-level bottom tier home values.
 
     Bottom tier represents homes in the 5th-35th percentile of value.
     Geographic level: County
     """
-    path = (data_dir or DATA_DIR) / "zhvi_bottom_tier_county.csv"
-    df = pd.read_csv(path)
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'zhvi_bottom_tier', data_dir, cache_dir, rebuild_cache, compact=compact, months=months
+    )
 
 
-def load_market_heat_index(data_dir: Optional[Path] = None) -> pd.DataFrame:
+def load_market_heat_index(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load Metro-level Market Heat Index.
 
@@ -101,13 +548,18 @@ def load_market_heat_index(data_dir: Optional[Path] = None) -> pd.DataFrame:
     Scale: Typically 0-100+
     Geographic level: Metro (MSA)
     """
-    path = (data_dir or DATA_DIR) / "market_heat_index_metro.csv"
-    df = pd.read_csv(path)
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'market_heat', data_dir, cache_dir, rebuild_cache, compact=compact, months=months
+    )
 
 
-def load_days_to_pending(data_dir: Optional[Path] = None) -> pd.DataFrame:
+def load_days_to_pending(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load Metro-level Days to Pending.
 
@@ -115,13 +567,18 @@ def load_days_to_pending(data_dir: Optional[Path] = None) -> pd.DataFrame:
     Lower values = faster market velocity.
     Geographic level: Metro (MSA)
     """
-    path = (data_dir or DATA_DIR) / "days_to_pending_metro.csv"
-    df = pd.read_csv(path)
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'days_to_pending', data_dir, cache_dir, rebuild_cache, compact=compact, months=months
+    )
 
 
-def load_price_cuts(data_dir: Optional[Path] = None) -> pd.DataFrame:
+def load_price_cuts(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load Metro-level Price Cuts percentage.
 
@@ -129,13 +586,18 @@ def load_price_cuts(data_dir: Optional[Path] = None) -> pd.DataFrame:
     Higher values may indicate distress or overpricing.
     Geographic level: Metro (MSA)
     """
-    path = (data_dir or DATA_DIR) / "price_cuts_metro.csv"
-    df = pd.read_csv(path)
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'price_cuts', data_dir, cache_dir, rebuild_cache, compact=compact, months=months
+    )
 
 
-def load_sale_to_list(data_dir: Optional[Path] = None) -> pd.DataFrame:
+def load_sale_to_list(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None
+) -> pd.DataFrame:
     """
     Load Metro-level Sale-to-List ratio.
 
@@ -145,30 +607,257 @@ def load_sale_to_list(data_dir: Optional[Path] = None) -> pd.DataFrame:
     Geographic level: Metro (MSA)
     Note: This dataset is WEEKLY (not monthly like others).
     """
-    path = (data_dir or DATA_DIR) / "sale_to_list_metro.csv"
-    df = pd.read_csv(path)
-    df = _standardize_column_names(df)
-    return df
+    return _load_dataset(
+        'sale_to_list', data_dir, cache_dir, rebuild_cache, compact=compact, months=months
+    )
 
 
-def load_all_datasets(data_dir: Optional[Path] = None) -> Dict[str, pd.DataFrame]:
+class LazyDataset:
     """
-    Load all Zillow datasets into a dictionary.
+    Handle to a dataset that defers all I/O until a date window is requested.
+
+    Returned by load_all_datasets(lazy=True). Each requested window is loaded
+    once (see _load_dataset's months option) and kept; a narrower window is
+    then sliced from a wider one already in memory rather than re-read.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        data_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        mmap: bool = False,
+        compact: bool = False
+    ):
+        self.name = name
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+        self.mmap = mmap
+        self.compact = compact
+        self._windows: Dict[Optional[int], pd.DataFrame] = {}
+
+    def __repr__(self) -> str:
+        loaded = ['all' if m is None else m for m in self._windows] or 'nothing'
+        return f"LazyDataset({self.name!r}, loaded={loaded})"
+
+    @property
+    def path(self) -> Path:
+        return (self.data_dir or DATA_DIR) / DATASET_FILES[self.name]
+
+    def window(self, months: Optional[int] = None) -> pd.DataFrame:
+        """
+        Metadata plus the date columns in the last `months` calendar months.
+
+        Repeated calls with the same window return the same frame, so
+        panels built on it (see series_panel.get_panel) are reused.
+        """
+        if months in self._windows:
+            return self._windows[months]
+
+        wider = [m for m in self._windows if m is None or (months is not None and m > months)]
+        if wider:
+            source = self._windows[min(wider, key=lambda m: float('inf') if m is None else m)]
+            date_cols = get_date_columns(source)
+            keep = set(_window_columns(date_cols, months))
+            df = source[[c for c in source.columns if c not in date_cols or c in keep]].copy()
+        else:
+            df = _load_dataset(
+                self.name, self.data_dir, self.cache_dir,
+                mmap=self.mmap and months is None, compact=self.compact, months=months
+            )
+
+        self._windows[months] = df
+        return df
+
+    def load(self) -> pd.DataFrame:
+        """The full dataset (every date column)."""
+        return self.window(None)
+
+
+def resolve_datasets(
+    datasets: Dict,
+    months: Dict[str, Optional[int]]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Turn any LazyDataset handles in a datasets dict into DataFrames.
+
+    Args:
+        datasets: Dict of DataFrames and/or LazyDataset handles
+        months: Window to load per dataset key (None or missing = full file)
 
     Returns:
-        Dict with keys: 'zhvi_zip', 'zhvi_bottom_tier', 'market_heat',
-                       'days_to_pending', 'price_cuts', 'sale_to_list'
+        Dict with the same keys holding DataFrames
     """
     return {
-        'zhvi_zip': load_zhvi_zip(data_dir),
-        'zhvi_bottom_tier': load_zhvi_bottom_tier_county(data_dir),
-        'market_heat': load_market_heat_index(data_dir),
-        'days_to_pending': load_days_to_pending(data_dir),
-        'price_cuts': load_price_cuts(data_dir),
-        'sale_to_list': load_sale_to_list(data_dir),
+        name: ds.window(months.get(name)) if isinstance(ds, LazyDataset) else ds
+        for name, ds in datasets.items()
     }
 
 
+def _timed_load(name: str, *args, **kwargs) -> Tuple[pd.DataFrame, float]:
+    """Load one dataset and return it with its wall-clock load time."""
+    start = time.perf_counter()
+    df = _load_dataset(name, *args, **kwargs)
+    return df, time.perf_counter() - start
+
+
+def load_all_datasets(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild_cache: bool = False,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None,
+    mmap: bool = False,
+    compact: bool = False,
+    months: Optional[int] = None,
+    lazy: bool = False
+) -> Dict[str, Union[pd.DataFrame, LazyDataset]]:
+    """
+    Load all Zillow datasets into a dictionary.
+
+    Args:
+        data_dir: Directory with the raw Zillow CSVs (defaults to DATA_DIR)
+        cache_dir: Enable the binary cache in this directory (e.g. CACHE_DIR)
+        rebuild_cache: Re-parse all CSVs and overwrite their cache entries
+        parallel: Load and standardize the files concurrently in a thread pool
+        max_workers: Pool size for parallel loading (defaults to one per file)
+        timings: Optional dict that is filled with per-dataset load seconds
+                 plus a 'total' entry
+        mmap: Memory-map the cached ZIP-level ZHVI matrix (read-only) so
+              dashboard workers and simulation processes share its pages
+        compact: Use categorical metadata and float32 values where precision
+                 allows (see compact_dtypes)
+        months: Only load the last N calendar months of every dataset, e.g.
+                13 for scoring with the default 12-month appreciation lookback
+        lazy: Return a LazyDataset handle per key instead of loading anything;
+              call handle.window(months=N) to load just that window.
+              flip_opportunity_score() accepts these handles directly.
+
+    Returns:
+        Dict with keys: 'zhvi_zip', 'zhvi_bottom_tier', 'market_heat',
+                       'days_to_pending', 'price_cuts', 'sale_to_list';
+        values are DataFrames, or LazyDataset handles with lazy=True (pass
+        them through resolve_datasets() where DataFrames are needed)
+    """
+    start = time.perf_counter()
+    if mmap and cache_dir is None:
+        cache_dir = CACHE_DIR
+
+    if lazy:
+        return {
+            name: LazyDataset(
+                name, data_dir, cache_dir,
+                mmap=mmap and name == 'zhvi_zip', compact=compact
+            )
+            for name in DATASET_FILES
+        }
+    args = (data_dir, cache_dir, rebuild_cache)
+
+    if parallel:
+        # pandas' C parser and np.load release the GIL, so threads overlap
+        # well and avoid pickling the loaded frames back from a process pool
+        workers = max_workers or len(DATASET_FILES)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                name: pool.submit(
+                    _timed_load, name, *args,
+                    mmap=mmap and name == 'zhvi_zip', compact=compact, months=months
+                )
+                for name in DATASET_FILES
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {
+            name: _timed_load(
+                name, *args,
+                mmap=mmap and name == 'zhvi_zip', compact=compact, months=months
+            )
+            for name in DATASET_FILES
+        }
+
+    if timings is not None:
+        timings.update({name: elapsed for name, (_, elapsed) in results.items()})
+        timings['total'] = time.perf_counter() - start
+
+    return {name: df for name, (df, _) in results.items()}
+
+
+def refresh_datasets(
+    data_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None
+) -> Dict[str, DataDelta]:
+    """
+    Sync the dataset cache with the CSVs on disk and report what changed.
+
+    Datasets whose cache entry is still fresh are skipped. New trailing
+    months are appended incrementally; anything else is re-parsed in full.
+
+    Returns:
+        Dict of dataset key -> DataDelta, only for datasets that changed
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    deltas = {}
+
+    for name, filename in DATASET_FILES.items():
+        path = (data_dir or DATA_DIR) / filename
+        if not path.exists():
+            continue
+
+        manifest = read_manifest(path, cache_dir)
+        if is_fresh(path, manifest, cache_dir):
+            continue
+
+        delta = _append_new_months(name, path, cache_dir)
+        if delta is None:
+            df = _load_dataset(name, data_dir, cache_dir, rebuild_cache=True)
+            known = set(manifest['date_columns']) if manifest else set()
+            delta = DataDelta(
+                dataset=name,
+                new_dates=[c for c in get_date_columns(df) if c not in known],
+                changed_regions=df['region_name'].astype(str).tolist() if 'region_name' in df.columns else [],
+                full_reload=True,
+            )
+        deltas[name] = delta
+
+    return deltas
+
+
+def get_process_memory() -> Dict[str, float]:
+    """
+    Memory footprint of the current process in MB.
+
+    Returns:
+        Dict with:
+        - rss: Resident set size
+        - private: Anonymous (process-private) resident memory
+        - shared: File-backed/shared resident memory, including memory maps
+        - peak_rss: High-water mark of rss
+
+    On platforms without /proc only peak_rss is available.
+    """
+    fields = {'VmRSS': 'rss', 'RssAnon': 'private', 'VmHWM': 'peak_rss'}
+    shared_fields = ('RssFile', 'RssShmem')
+    footprint = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in fields or key in shared_fields:
+                    mb = int(value.split()[0]) / 1024
+                    if key in fields:
+                        footprint[fields[key]] = mb
+                    else:
+                        footprint['shared'] = footprint.get('shared', 0.0) + mb
+    except OSError:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        footprint['peak_rss'] = peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return footprint
+
+
 def get_date_columns(df: pd.DataFrame) -> List[str]:
     """Get list of date columns from a dataframe."""
     return _identify_date_columns(df.columns.tolist())
@@ -186,14 +875,36 @@ def get_date_range(df: pd.DataFrame) -> Tuple[pd.Timestamp, pd.Timestamp]:
     return dates.min(), dates.max()
 
 
-def validate_all_datasets(datasets: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+def validate_all_datasets(
+    datasets: Dict[str, pd.DataFrame],
+    cache_dir: Optional[Path] = None,
+    data_dir: Optional[Path] = None,
+    details: Optional[Dict[str, Dict]] = None
+) -> pd.DataFrame:
     """
     Validate all datasets and return summary DataFrame.
+
+    Includes each dataset's in-memory size (memory_mb) and, for frames
+    loaded with compact=True, the memory saved by the compact profile.
+
+    Regions with missing months are counted in regions_with_gaps (missing
+    between first and last observation) and stale_regions (latest month
+    missing, which scores as NaN).
+
+    Args:
+        datasets: Dict of loaded datasets
+        cache_dir: Reuse/store statistics next to the binary cache entries
+        data_dir: Directory of the source CSVs (defaults to DATA_DIR)
+        details: Optional dict that is filled with each dataset's full
+                 statistics, including per-date column_coverage and
+                 per-region region_coverage (see gap_regions)
     """
     validations = []
     for name, df in datasets.items():
-        val = _validate_dataframe(df, name)
-        validations.append(val)
+        stats = _validate_dataframe(df, name, data_dir, cache_dir)
+        validations.append(stats['summary'])
+        if details is not None:
+            details[name] = stats
 
     summary = pd.DataFrame(validations)
     summary['date_start'] = summary['date_range'].apply(lambda x: x[0])
@@ -203,22 +914,49 @@ def validate_all_datasets(datasets: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     return summary
 
 
-def melt_to_long_format(df: pd.DataFrame, value_name: str = 'value') -> pd.DataFrame:
+def gap_regions(stats: Dict) -> pd.DataFrame:
+    """Regions with interior gaps or a missing latest month, from validation details."""
+    coverage = stats['region_coverage']
+    return coverage[(coverage['interior_missing'] > 0) | coverage['stale']]
+
+
+def melt_to_long_format(
+    df: pd.DataFrame,
+    value_name: str = 'value',
+    regions: Optional[List] = None,
+    start=None,
+    end=None,
+    id_columns: Optional[List[str]] = None,
+    compact: bool = False
+) -> pd.DataFrame:
     """
     Convert wide-format Zillow data to long format.
 
     Transforms date columns from wide to long, creating 'date' and value columns.
+    Built from the frame's SeriesPanel (see SeriesPanel.to_long), with the
+    regions/start/end filters applied before the long frame is built. By
+    default the output matches DataFrame.melt: metadata keeps its dtypes and
+    rows are grouped by date. compact=True returns categorical metadata with
+    rows grouped by region instead, which avoids copying values and strings.
     """
-    date_cols = get_date_columns(df)
-    meta_cols = get_metadata_columns(df)
-
-    df_long = df.melt(
-        id_vars=meta_cols,
-        value_vars=date_cols,
-        var_name='date',
-        value_name=value_name
+    from .series_panel import get_panel
+
+    df_long = get_panel(df).to_long(
+        value_name=value_name,
+        regions=regions,
+        start=start,
+        end=end,
+        id_columns=id_columns,
+        categorical=compact,
+        date_major=not compact
     )
-    df_long['date'] = pd.to_datetime(df_long['date'])
+
+    # The panel holds float64; melt keeps e.g. float32 from compact_dtypes()
+    date_cols = get_date_columns(df)
+    if not compact and date_cols:
+        value_dtype = np.result_type(*df[date_cols].dtypes.unique())
+        if df_long[value_name].dtype != value_dtype:
+            df_long[value_name] = df_long[value_name].astype(value_dtype)
 
     return df_long
 
@@ -226,8 +964,16 @@ def melt_to_long_format(df: pd.DataFrame, value_name: str = 'value') -> pd.DataF
 if __name__ == "__main__":
     # Quick test
     print("Loading all datasets...")
-    datasets = load_all_datasets()
+    load_times = {}
+    datasets = load_all_datasets(parallel=True, timings=load_times)
+    for name, seconds in load_times.items():
+        print(f"  {name}: {seconds:.2f}s")
 
     print("\nValidation Summary:")
     summary = validate_all_datasets(datasets)
     print(summary.to_string())
+
+    flagged = summary[(summary['regions_with_gaps'] > 0) | (summary['stale_regions'] > 0)]
+    for _, row in flagged.iterrows():
+        print(f"  {row['name']}: {row['regions_with_gaps']} regions with gaps, "
+              f"{row['stale_regions']} missing the latest month")
@@ -0,0 +1,183 @@
+"""
+Filter Index Module
+
+Prebuilt indexes over a score table for fast repeated filtering.
+
+The dashboard re-filters the same score table on every sidebar change. A
+FilterIndex builds, once per table:
+- bitmap indexes (packed bits, one per distinct value) for state and metro
+- sorted value arrays for composite_score, appreciation_pct,
+  days_to_pending and price_cut_pct, so a threshold is a binary search
+
+A query turns each criterion into a packed bitmap, ANDs them together and
+materializes the matching rows in one take.
+"""
+
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Columns with a bitmap (equality) and sorted-array (range) index
+CATEGORY_COLUMNS = ['state', 'metro']
+RANGE_COLUMNS = ['composite_score', 'appreciation_pct', 'days_to_pending', 'price_cut_pct']
+
+
+class FilterIndex:
+    """
+    Bitmap and sorted-array indexes over the rows of a score table.
+
+    Indexes are built per column on first use, then reused by every query.
+    Rows keep their original order (and index labels) in query results.
+    Only a weak reference to the table is kept (to build indexes lazily), so
+    a cached index never keeps its table alive.
+    """
+
+    def __init__(self, score_df: pd.DataFrame):
+        self._frame = weakref.ref(score_df)
+        self.n_rows = len(score_df)
+        self._columns = list(score_df.columns)
+        self._bitmaps: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray, int]] = {}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The indexed table (ReferenceError once it has been collected)."""
+        score_df = self._frame()
+        if score_df is None:
+            raise ReferenceError("the score table of this FilterIndex no longer exists")
+        return score_df
+
+    def matches(self, score_df: pd.DataFrame) -> bool:
+        """Whether the index still describes a frame's shape."""
+        return len(score_df) == self.n_rows and list(score_df.columns) == self._columns
+
+    # ----- Index construction -----
+
+    def _category_index(self, column: str) -> Tuple[pd.Index, np.ndarray]:
+        """Distinct values of a column and a packed row bitmap for each."""
+        if column not in self._bitmaps:
+            codes, uniques = pd.factorize(self.frame[column], use_na_sentinel=False)
+            # Set each row's bit in its value's bitmap directly: a dense
+            # (values x rows) bool matrix would be 8x the packed size
+            bitmaps = np.zeros((len(uniques), (self.n_rows + 7) // 8), dtype=np.uint8)
+            rows = np.arange(self.n_rows)
+            bits = (0x80 >> (rows & 7)).astype(np.uint8)
+            np.bitwise_or.at(bitmaps, (codes, rows >> 3), bits)
+            self._bitmaps[column] = (pd.Index(uniques), bitmaps)
+        return self._bitmaps[column]
+
+    def _range_index(self, column: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Row order by value, the sorted values and the non-missing count."""
+        if column not in self._sorted:
+            values = self.frame[column].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            sorted_values = values[order]
+            # NaN sorts last and never passes a comparison
+            n_valid = len(values) - int(np.isnan(values).sum())
+            self._sorted[column] = (order, sorted_values, n_valid)
+        return self._sorted[column]
+
+    # ----- Bitmaps for single criteria -----
+
+    def _rows_bitmap(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Packed bitmap with the given row positions set.
+
+        Goes through a full n_rows bool mask, so each range criterion costs
+        O(n_rows) per query on top of the matching rows (still well under
+        the cost of materializing the result).
+        """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    def isin(self, column: str, values: List) -> np.ndarray:
+        """Packed bitmap of rows whose column value is one of values."""
+        uniques, bitmaps = self._category_index(column)
+        found = uniques.get_indexer(pd.Index(values).unique())
+        found = found[found >= 0]
+        if len(found) == 0:
+            return np.zeros(bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(bitmaps[found], axis=0)
+
+    def at_least(self, column: str, threshold: float) -> np.ndarray:
+        """Packed bitmap of rows with column >= threshold (see _rows_bitmap)."""
+        order, sorted_values, n_valid = self._range_index(column)
+        start = np.searchsorted(sorted_values[:n_valid], threshold, side='left')
+        return self._rows_bitmap(order[start:n_valid])
+
+    def at_most(self, column: str, threshold: float) -> np.ndarray:
+        """Packed bitmap of rows with column <= threshold (see _rows_bitmap)."""
+        order, sorted_values, n_valid = self._range_index(column)
+        end = np.searchsorted(sorted_values[:n_valid], threshold, side='right')
+        return self._rows_bitmap(order[:end])
+
+    # ----- Queries -----
+
+    def positions(
+        self,
+        min_score: Optional[float] = None,
+        states: Optional[List[str]] = None,
+        metros: Optional[List[str]] = None,
+        min_appreciation: Optional[float] = None,
+        max_days_to_pending: Optional[float] = None,
+        min_price_cuts: Optional[float] = None
+    ) -> np.ndarray:
+        """Row positions matching every given criterion, in table order."""
+        # 1. One bitmap per active criterion
+        bitmaps = []
+        if min_score is not None:
+            bitmaps.append(self.at_least('composite_score', min_score))
+        if states:
+            bitmaps.append(self.isin('state', states))
+        if metros:
+            bitmaps.append(self.isin('metro', metros))
+        if min_appreciation is not None:
+            bitmaps.append(self.at_least('appreciation_pct', min_appreciation))
+        if max_days_to_pending is not None:
+            bitmaps.append(self.at_most('days_to_pending', max_days_to_pending))
+        if min_price_cuts is not None:
+            bitmaps.append(self.at_least('price_cut_pct', min_price_cuts))
+
+        if not bitmaps:
+            return np.arange(self.n_rows)
+
+        # 2. Intersect and decode to row positions
+        combined = np.bitwise_and.reduce(bitmaps, axis=0)
+        return np.flatnonzero(np.unpackbits(combined, count=self.n_rows))
+
+    def query(self, score_df: pd.DataFrame, **criteria) -> pd.DataFrame:
+        """Rows of score_df (the indexed table) matching positions() criteria."""
+        return score_df.take(self.positions(**criteria))
+
+
+# Indexes built so far, keyed by id() of the score table. The weakref lets an
+# entry drop out when its table is garbage collected.
+_INDEXES: Dict[int, Tuple[weakref.ref, FilterIndex]] = {}
+
+
+def get_filter_index(score_df: pd.DataFrame) -> FilterIndex:
+    """
+    Get the FilterIndex for a score table, building it on first use.
+
+    The index is rebuilt if columns or the row count changed. Call
+    invalidate_filter_index() after editing values in place.
+    """
+    key = id(score_df)
+    entry = _INDEXES.get(key)
+    if entry is not None:
+        ref, index = entry
+        if ref() is score_df and index.matches(score_df):
+            return index
+
+    index = FilterIndex(score_df)
+    _INDEXES[key] = (weakref.ref(score_df, lambda _, k=key: _INDEXES.pop(k, None)), index)
+    return index
+
+
+def invalidate_filter_index(score_df: pd.DataFrame) -> None:
+    """Drop the cached index for a table so the next lookup rebuilds it."""
+    _INDEXES.pop(id(score_df), None)
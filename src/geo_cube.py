@@ -0,0 +1,262 @@
+"""
+Geographic Cube Module
+
+Partial aggregates of a score table for fast geographic summaries.
+
+A GeoCube splits the ZIPs into cells, one per (state, metro, county)
+combination, and keeps per cell:
+- row count, and count / sum / max of composite_score
+- count / sum of appreciation_pct
+- the sorted current_value of its ZIPs, so medians stay exact; passing
+  points_per_cell keeps at most that many weighted points per cell
+  instead, trading exact medians for a smaller cube
+
+Any level (state, metro or county), restricted to any states and metros, is
+then summarized by combining the partials of the matching cells, so
+drill-down from state to metro to county never goes back to the ZIP rows.
+Value summaries merge by taking the union of their points; the median is
+read from the merged points.
+"""
+
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Summary level -> score table column
+LEVEL_COLUMNS = {
+    'state': 'state',
+    'metro': 'metro',
+    'county': 'county_name'
+}
+
+
+def _weighted_medians(
+    values: np.ndarray,
+    weights: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int
+) -> np.ndarray:
+    """
+    Median of weighted points per group (NaN for groups without points).
+
+    With unit weights this is the ordinary median: when the cumulative
+    weight reaches exactly half, the two middle points are averaged.
+    """
+    medians = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return medians
+
+    order = np.lexsort((values, groups))
+    values, weights, groups = values[order], weights[order], groups[order]
+
+    totals = np.bincount(groups, weights=weights, minlength=n_groups).astype(np.int64)
+    sizes = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # Cumulative weight within each group
+    cumulative = np.cumsum(weights)
+    cumulative -= np.repeat(np.cumsum(totals) - totals, sizes)
+
+    # First point per group whose cumulative weight covers half the total
+    below = 2 * cumulative < totals[groups]
+    has_points = sizes > 0
+    first = (starts + np.bincount(groups, weights=below, minlength=n_groups).astype(np.int64))[has_points]
+
+    middle = values[first]
+    at_half = (2 * cumulative[first] == totals[has_points]) & (first + 1 < starts[has_points] + sizes[has_points])
+    following = values[np.minimum(first + 1, len(values) - 1)]
+    medians[has_points] = np.where(at_half, (middle + following) / 2, middle)
+    return medians
+
+
+class GeoCube:
+    """
+    Cell-level partial aggregates of one score table.
+
+    By default every current_value is kept, so median_value is exact. With
+    points_per_cell set, cells larger than that keep weighted rank-bucket
+    points instead and their medians are approximate.
+
+    Attributes:
+        levels: Per level, the distinct geography values (sorted)
+        cell_codes: Per level, each cell's code into levels (-1 if missing)
+        n_rows, n_scores, score_sum, score_max, n_appreciation,
+        appreciation_sum: Per-cell aggregates
+        point_values, point_weights, point_cells: current_value summary
+                                                  points of every cell
+    """
+
+    def __init__(self, score_df: pd.DataFrame, points_per_cell: Optional[int] = None):
+        self.points_per_cell = points_per_cell
+        self._n_source_rows = len(score_df)
+        self._source_columns = list(score_df.columns)
+
+        # 1. Cell of each row
+        self.levels: Dict[str, pd.Index] = {}
+        row_codes = {}
+        key = np.zeros(len(score_df), dtype=np.int64)
+        for level, col in LEVEL_COLUMNS.items():
+            codes, uniques = pd.factorize(score_df[col], sort=True)
+            self.levels[level] = pd.Index(uniques, name=col)
+            row_codes[level] = codes
+            key = key * (len(uniques) + 1) + (codes + 1)
+
+        cell_keys, first_rows, cell = np.unique(key, return_index=True, return_inverse=True)
+        n_cells = len(cell_keys)
+        self.cell_codes = {level: codes[first_rows] for level, codes in row_codes.items()}
+
+        # 2. Composite and appreciation partials
+        scores = score_df['composite_score'].to_numpy(dtype=np.float64)
+        has_score = ~np.isnan(scores)
+        self.n_rows = np.bincount(cell, minlength=n_cells)
+        self.n_scores = np.bincount(cell, weights=has_score, minlength=n_cells)
+        self.score_sum = np.bincount(cell, weights=np.where(has_score, scores, 0.0), minlength=n_cells)
+        self.score_max = np.full(n_cells, np.nan)
+        np.fmax.at(self.score_max, cell, scores)
+
+        appreciation = score_df['appreciation_pct'].to_numpy(dtype=np.float64)
+        has_appreciation = ~np.isnan(appreciation)
+        self.n_appreciation = np.bincount(cell, weights=has_appreciation, minlength=n_cells)
+        self.appreciation_sum = np.bincount(
+            cell, weights=np.where(has_appreciation, appreciation, 0.0), minlength=n_cells
+        )
+
+        # 3. Value summary: each cell's sorted values
+        values = score_df['current_value'].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.lexsort((values[valid], cell[valid]))]
+        sorted_cells = cell[order]
+        if points_per_cell is None:
+            self.point_values = values[order]
+            self.point_weights = np.ones(len(order), dtype=np.int64)
+            self.point_cells = sorted_cells
+            return
+
+        # Or at most points_per_cell rank buckets per cell, each kept as its
+        # middle value
+        sizes = np.bincount(sorted_cells, minlength=n_cells)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        rank = np.arange(len(order)) - starts[sorted_cells]
+        rank_bucket = rank * points_per_cell // sizes[sorted_cells]
+
+        point_key = sorted_cells.astype(np.int64) * points_per_cell + rank_bucket
+        point_starts = np.flatnonzero(np.diff(point_key, prepend=-1))
+        self.point_weights = np.diff(np.append(point_starts, len(order)))
+        self.point_values = values[order[point_starts + (self.point_weights - 1) // 2]]
+        self.point_cells = sorted_cells[point_starts]
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.n_rows)
+
+    def matches(self, score_df: pd.DataFrame) -> bool:
+        """Whether the cube still describes a frame's shape."""
+        return (len(score_df) == self._n_source_rows
+                and list(score_df.columns) == self._source_columns)
+
+    def _select_cells(
+        self,
+        states: Optional[List[str]],
+        metros: Optional[List[str]]
+    ) -> np.ndarray:
+        selected = np.ones(self.n_cells, dtype=bool)
+        for level, wanted in (('state', states), ('metro', metros)):
+            if wanted:
+                codes = self.levels[level].get_indexer(pd.Index(wanted).unique())
+                selected &= np.isin(self.cell_codes[level], codes[codes >= 0])
+        return selected
+
+    def summarize(
+        self,
+        level: str = 'state',
+        states: Optional[List[str]] = None,
+        metros: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Summarize the ZIPs matching the filters by geographic level.
+
+        Args:
+            level: 'state', 'metro', or 'county'
+            states, metros: Keep ZIPs in these states / metros
+
+        Returns:
+            summarize_by_geography() output for the matching ZIPs
+        """
+        if level not in LEVEL_COLUMNS:
+            level = 'state'
+        groups_index = self.levels[level]
+        n_groups = len(groups_index)
+
+        # 1. Cells that pass the filters and have a key at this level
+        cell_group = self.cell_codes[level]
+        selected = self._select_cells(states, metros) & (cell_group >= 0)
+        cells = np.flatnonzero(selected)
+        group = cell_group[cells]
+
+        # 2. Combine cell partials into group aggregates
+        def combine(partial: np.ndarray) -> np.ndarray:
+            return np.bincount(group, weights=partial[cells], minlength=n_groups)
+
+        n_rows = combine(self.n_rows)
+        n_scores = combine(self.n_scores)
+        n_appreciation = combine(self.n_appreciation)
+        max_score = np.full(n_groups, np.nan)
+        np.fmax.at(max_score, group, self.score_max[cells])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_score = np.where(n_scores > 0, combine(self.score_sum) / n_scores, np.nan)
+            avg_appreciation = np.where(
+                n_appreciation > 0, combine(self.appreciation_sum) / n_appreciation, np.nan
+            )
+
+        # 3. Medians from the merged value summaries
+        point_group = np.full(self.n_cells, -1)
+        point_group[cells] = group
+        point_group = point_group[self.point_cells]
+        in_groups = point_group >= 0
+        median_value = _weighted_medians(
+            self.point_values[in_groups], self.point_weights[in_groups],
+            point_group[in_groups], n_groups
+        )
+
+        present = n_rows > 0
+        summary = pd.DataFrame({
+            'num_opportunities': n_scores[present].astype(np.int64),
+            'avg_score': avg_score[present],
+            'max_score': max_score[present],
+            'median_value': median_value[present],
+            'avg_appreciation': avg_appreciation[present],
+        }, index=groups_index[present]).round(2)
+
+        return summary.sort_values('avg_score', ascending=False, kind='stable')
+
+
+# Cubes built so far, keyed by id() of the score table. The weakref lets an
+# entry drop out when its table is garbage collected.
+_CUBES: Dict[int, Tuple[weakref.ref, GeoCube]] = {}
+
+
+def get_geo_cube(score_df: pd.DataFrame) -> GeoCube:
+    """
+    Get the GeoCube for a score table, building it on first use.
+
+    The cube is rebuilt if columns or the row count changed. Call
+    invalidate_geo_cube() after editing values in place.
+    """
+    key = id(score_df)
+    entry = _CUBES.get(key)
+    if entry is not None:
+        ref, cube = entry
+        if ref() is score_df and cube.matches(score_df):
+            return cube
+
+    cube = GeoCube(score_df)
+    _CUBES[key] = (weakref.ref(score_df, lambda _, k=key: _CUBES.pop(k, None)), cube)
+    return cube
+
+
+def invalidate_geo_cube(score_df: pd.DataFrame) -> None:
+    """Drop the cached cube for a table so the next lookup rebuilds it."""
+    _CUBES.pop(id(score_df), None)
@@ -0,0 +1,278 @@
+"""
+Normalization Module
+
+Percentile-clipped 0-100 scaling used for every component score.
+
+A score is the value clipped at the clip_percentile and 100 - clip_percentile
+quantiles, then min-max scaled to 0-100. Two ways to get the quantiles:
+
+- exact: both quantiles from one partition of the non-missing values
+  (np.percentile with both q at once). Reproduces the original
+  normalize_to_score() bit for bit; used for every component score.
+- streaming: StreamingNormalizer keeps a mergeable KLL quantile sketch of
+  a few thousand values however much data it has seen, for inputs that
+  arrive in batches and are not kept, such as the monthly appends to the
+  dataset cache (see data_loader.refresh_datasets).
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ----- Quantile sketch -----
+
+class KLLSketch:
+    """
+    KLL streaming quantile sketch.
+
+    Values are buffered in levels; an item at level h stands for 2**h
+    inputs. When a level outgrows its capacity it is sorted and every other
+    item (random offset) moves up a level. Capacities shrink geometrically
+    below the top level, so at most about 3k items are kept and quantile rank error
+    is on the order of 1/k. Sketches with the same k can be merged.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd count the largest item stays behind
+                keep = items[len(items) - len(items) % 2:]
+                promoted = items[self._rng.integers(2):len(items) - len(items) % 2:2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values) -> 'KLLSketch':
+        """Add a batch of values (missing values are ignored)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold another sketch into this one."""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate quantiles (qs in [0, 1]); NaN if the sketch is empty."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level)
+            for level, level_items in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        # The extremes are tracked exactly
+        result = np.where(qs <= 0, self.min, result)
+        return np.where(qs >= 1, self.max, result)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+
+# ----- Normalization -----
+
+def quantile_bounds(valid: np.ndarray, clip_percentile: float = 5.0) -> Tuple[float, float]:
+    """
+    Exact clip bounds of non-missing values, from a single partition.
+
+    Matches two np.nanpercentile calls exactly: np.percentile uses the same
+    linear interpolation for each q, it just partitions once for both.
+    """
+    with np.errstate(invalid='ignore'):
+        lower, upper = np.percentile(valid, [clip_percentile, 100 - clip_percentile])
+    return lower, upper
+
+
+def _scale(
+    values: np.ndarray,
+    lower: float,
+    upper: float,
+    min_val: float,
+    max_val: float,
+    higher_is_better: bool
+) -> Optional[np.ndarray]:
+    """
+    Clip and min-max scale values given bounds and the data's min/max.
+
+    Clipping is monotonic, so min/max of the clipped values are the clipped
+    min/max and need no extra pass. A NaN bound (only possible with infinite
+    values) means no clipping, as with pandas' clip(). Returns None when the
+    clipped range is empty.
+    """
+    lower = -np.inf if np.isnan(lower) else lower
+    upper = np.inf if np.isnan(upper) else upper
+    min_val = np.clip(min_val, lower, upper)
+    max_val = np.clip(max_val, lower, upper)
+    if max_val == min_val:
+        return None
+
+    with np.errstate(invalid='ignore'):
+        normalized = (np.clip(values, lower, upper) - min_val) / (max_val - min_val) * 100
+    if not higher_is_better:
+        normalized = 100 - normalized
+    return normalized
+
+
+def normalize_to_score(
+    values: pd.Series,
+    higher_is_better: bool = True,
+    clip_percentile: float = 5.0
+) -> pd.Series:
+    """
+    Normalize values to 0-100 scale using percentile-based normalization.
+
+    Args:
+        values: Series of values to normalize
+        higher_is_better: If True, higher values get higher scores
+        clip_percentile: Clip extreme values at this percentile
+
+    Returns:
+        Series with scores 0-100
+    """
+    array = values.to_numpy(dtype=np.float64)
+    valid = array[~np.isnan(array)]
+
+    # Handle missing values
+    if valid.size == 0:
+        return pd.Series(np.nan, index=values.index)
+
+    lower, upper = quantile_bounds(valid, clip_percentile)
+
+    normalized = _scale(array, lower, upper, valid.min(), valid.max(), higher_is_better)
+    if normalized is None:
+        return pd.Series(50.0, index=values.index)
+    return pd.Series(normalized, index=values.index, name=values.name)
+
+
+def normalize_columns(
+    values: np.ndarray,
+    higher_is_better: bool = True,
+    clip_percentile: float = 5.0
+) -> np.ndarray:
+    """
+    Apply normalize_to_score() to every column of a matrix at once.
+
+    Each column (e.g. one month across all regions) is clipped at its own
+    percentiles and min-max scaled, giving the same numbers as calling
+    normalize_to_score() on that column alone.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+
+    has_valid = ~np.isnan(values).all(axis=0)
+    if not has_valid.any():
+        return result
+    columns = values[:, has_valid]
+
+    with np.errstate(invalid='ignore'):
+        lower, upper = np.nanpercentile(
+            columns, [clip_percentile, 100 - clip_percentile], axis=0
+        )
+    # A NaN bound (only from infinite values) means no clipping, as in pandas
+    lower = np.where(np.isnan(lower), -np.inf, lower)
+    upper = np.where(np.isnan(upper), np.inf, upper)
+    min_val = np.clip(np.nanmin(columns, axis=0), lower, upper)
+    max_val = np.clip(np.nanmax(columns, axis=0), lower, upper)
+
+    flat = max_val == min_val
+    with np.errstate(invalid='ignore', divide='ignore'):
+        normalized = (np.clip(columns, lower, upper) - min_val) / (max_val - min_val) * 100
+    if not higher_is_better:
+        normalized = 100 - normalized
+    # Constant columns score 50 everywhere, as in normalize_to_score()
+    normalized[:, flat] = 50.0
+
+    result[:, has_valid] = normalized
+    return result
+
+class StreamingNormalizer:
+    """
+    Score normalization whose bounds come from data seen in batches.
+
+    Feed batches with update(); transform() then scales any values against
+    the accumulated distribution without keeping the data. Sketches from
+    separate workers combine with merge().
+    """
+
+    def __init__(
+        self,
+        higher_is_better: bool = True,
+        clip_percentile: float = 5.0,
+        k: int = 200,
+        seed: Optional[int] = None
+    ):
+        self.higher_is_better = higher_is_better
+        self.clip_percentile = clip_percentile
+        self.sketch = KLLSketch(k=k, seed=seed)
+
+    def update(self, values) -> 'StreamingNormalizer':
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: 'StreamingNormalizer') -> 'StreamingNormalizer':
+        self.sketch.merge(other.sketch)
+        return self
+
+    def bounds(self) -> Tuple[float, float]:
+        """Current (lower, upper) clip bounds."""
+        lower, upper = self.sketch.quantiles(
+            [self.clip_percentile / 100, 1 - self.clip_percentile / 100]
+        )
+        return lower, upper
+
+    def transform(self, values: pd.Series) -> pd.Series:
+        """Scores 0-100 for values against everything seen so far."""
+        if self.sketch.count == 0:
+            return pd.Series(np.nan, index=values.index)
+        lower, upper = self.bounds()
+        normalized = _scale(
+            values.to_numpy(dtype=np.float64), lower, upper,
+            self.sketch.min, self.sketch.max, self.higher_is_better
+        )
+        if normalized is None:
+            return pd.Series(50.0, index=values.index)
+        return pd.Series(normalized, index=values.index, name=values.name)
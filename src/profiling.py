@@ -0,0 +1,153 @@
+"""
+Profiling Module
+
+Opt-in stage-level measurements for the scoring pipeline.
+
+Pass a PipelineProfile to flip_opportunity_score() (or score_strategies(),
+compute_component_scores(), apply_strategies()) and each step records:
+- wall time (perf_counter) and CPU time (process_time)
+- peak RSS: the process high-water mark when the step ended
+- allocated bytes: the peak of traced allocations above the level at step
+  start (tracemalloc, which numpy and pandas buffers report to); tracing
+  slows the pipeline, so it can be turned off with trace_allocations=False
+
+Without a profile the pipeline runs exactly as before.
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import ContextManager, Dict, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of one pipeline stage (summed if the stage ran twice)."""
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+    allocated_bytes: Optional[int] = None
+    calls: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class PipelineProfile:
+    """
+    Per-stage timings and memory of one or more pipeline runs.
+
+    Stages are kept in the order they first ran. Running a stage again adds
+    to its times and keeps the larger of its memory readings.
+    """
+
+    def __init__(self, trace_allocations: bool = True):
+        self.trace_allocations = trace_allocations
+        self.stages: Dict[str, StageMetrics] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as stage `name`."""
+        # Start tracing only if nobody else is, and stop it again after
+        started_tracing = self.trace_allocations and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if tracemalloc.is_tracing():
+            traced_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+
+            allocated = None
+            if self.trace_allocations and tracemalloc.is_tracing():
+                allocated = max(tracemalloc.get_traced_memory()[1] - traced_before, 0)
+            if started_tracing:
+                tracemalloc.stop()
+
+            metrics = self.stages.setdefault(name, StageMetrics(name))
+            metrics.wall_seconds += wall
+            metrics.cpu_seconds += cpu
+            metrics.calls += 1
+            metrics.peak_rss_bytes = _max_optional(metrics.peak_rss_bytes, peak_rss_bytes())
+            metrics.allocated_bytes = _max_optional(metrics.allocated_bytes, allocated)
+
+    @property
+    def total_seconds(self) -> float:
+        """Wall time summed over all stages."""
+        return sum(m.wall_seconds for m in self.stages.values())
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, e.g. for agent logs."""
+        return {
+            'total_seconds': self.total_seconds,
+            'stages': [m.to_dict() for m in self.stages.values()]
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per stage, with each stage's share of the total wall time."""
+        return profile_frame(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"PipelineProfile({len(self.stages)} stages, {self.total_seconds:.3f}s)"
+
+
+def profile_frame(profile: Dict) -> pd.DataFrame:
+    """
+    Stage table from a PipelineProfile.to_dict() result.
+
+    Returns:
+        DataFrame indexed by stage with wall/CPU seconds, share of total
+        wall time, peak RSS and allocated MB, and call count
+    """
+    columns = ['wall_seconds', 'cpu_seconds', 'share', 'peak_rss_mb', 'allocated_mb', 'calls']
+    stages = profile.get('stages', [])
+    if not stages:
+        return pd.DataFrame(columns=columns)
+
+    frame = pd.DataFrame(stages).set_index('name')
+    total = frame['wall_seconds'].sum()
+    frame['share'] = frame['wall_seconds'] / total if total > 0 else 0.0
+    frame['peak_rss_mb'] = frame['peak_rss_bytes'].astype('float64') / 2 ** 20
+    frame['allocated_mb'] = frame['allocated_bytes'].astype('float64') / 2 ** 20
+    frame.index.name = 'stage'
+    return frame[columns]
+
+
+def profile_stage(profile: Optional[PipelineProfile], name: str) -> ContextManager:
+    """profile.stage(name), or a no-op block when profiling is off."""
+    if profile is None:
+        return nullcontext()
+    return profile.stage(name)
+
+
+def _max_optional(current: Optional[int], new: Optional[int]) -> Optional[int]:
+    if current is None:
+        return new
+    if new is None:
+        return current
+    return max(current, new)
@@ -15,7 +15,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-from .data_loader import get_date_columns, load_all_datasets
+from .data_loader import load_all_datasets
+from .region_index import get_region_index
+from .seasonality import month_profiles
+from .scoring_engine import gather, top_k_positions, top_k_rows
+from .series_panel import get_panel
 
 
 @dataclass
@@ -122,13 +126,114 @@ class PropertyAnalysisReport:
         return result
 
 
+@dataclass
+class BatchAnalysis:
+    """
+    Analysis of many ZIP codes at once (see PropertyAnalyzer.analyze_many).
+
+    Attributes:
+        frame: One row per analyzed ZIP with the scalar fields of every
+               report section (trend, momentum, risk, recommendation)
+        reports: Full PropertyAnalysisReport per row, if requested
+    """
+    frame: pd.DataFrame
+    reports: Optional[List[PropertyAnalysisReport]] = None
+
+
+# Factor messages of the report lists, each shown when its mask is set
+MOMENTUM_FACTORS = [
+    ('accelerating', "Accelerating appreciation"),
+    ('decelerating', "Decelerating appreciation"),
+    ('fast_velocity', "Fast market velocity"),
+    ('strong_demand', "Strong buyer demand"),
+    ('consistent', "Consistent upward trend"),
+]
+
+RISK_FACTORS = [
+    ('declining', "Declining market trend", "Focus on deep value properties only"),
+    ('high_entry', "High entry cost limits buyer pool", "Ensure strong comps and conservative ARV"),
+    ('low_value', "Very low value market - limited upside", "Focus on rental potential as backup"),
+    ('slow_market', "Slow market - extended holding period likely", "Build in longer timeline to projections"),
+    ('weak_momentum', "Weak market momentum", "Wait for momentum improvement or seek deeper discounts"),
+    ('hot_market', "Hot market - competition risk", "Act quickly on good deals"),
+]
+
+
+def _trend_columns(
+    values: np.ndarray,
+    dates: pd.DatetimeIndex,
+    detrend_seasonality: bool = False
+) -> Dict[str, np.ndarray]:
+    """_analyze_trends() for every row of a value block."""
+    n, n_dates = values.shape
+    last = values[:, -1] if n_dates else np.full(n, np.nan)
+    current = np.where(np.isnan(last), 0.0, last)
+
+    # 1. Year-over-year and two-year change
+    value_1yr = current
+    if n_dates >= 13:
+        value_1yr = np.where(np.isnan(values[:, -13]), current, values[:, -13])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        yoy = np.where(value_1yr > 0, (current - value_1yr) / value_1yr * 100, 0.0)
+
+        value_2yr = np.full(n, np.nan)
+        two_year = np.full(n, np.nan)
+        if n_dates >= 25:
+            value_2yr = values[:, -25]
+            two_year = np.where(value_2yr != 0, (current - value_2yr) / value_2yr * 100, np.nan)
+            # A change of exactly zero is reported as missing, as in analyze_zip
+            two_year = np.where(two_year == 0, np.nan, two_year)
+
+        # 2. Volatility: std of monthly % changes, skipping missing ones
+        changes = np.diff(values, axis=1) / values[:, :-1] * 100
+        valid = ~np.isnan(changes)
+        count = valid.sum(axis=1)
+        mean = np.where(valid, changes, 0.0).sum(axis=1) / count
+        variance = np.where(valid, (changes - mean[:, None]) ** 2, 0.0).sum(axis=1) / count
+        volatility = np.where(count > 0, np.sqrt(variance), 0.0)
+    volatility_score = np.where(np.isnan(volatility), 100.0, np.minimum(100.0, volatility * 10))
+
+    # 3. Seasonality from calendar-month profiles
+    peak_month = np.full(n, np.nan)
+    trough_month = np.full(n, np.nan)
+    seasonality = np.zeros(n, dtype=bool)
+    if n_dates >= 24:
+        summary = month_profiles(values, dates, detrend=detrend_seasonality).peaks_and_troughs()
+        peak_month, trough_month = summary['peak_month'], summary['trough_month']
+        seasonality = summary['detected']
+
+    return {
+        'current_value': current,
+        'value_1yr_ago': value_1yr,
+        'value_2yr_ago': value_2yr,
+        'yoy_change_pct': yoy,
+        'two_year_change_pct': two_year,
+        'volatility_score': volatility_score,
+        'seasonality_detected': seasonality,
+        'peak_month': peak_month,
+        'trough_month': trough_month,
+    }
+
+
 class PropertyAnalyzer:
     """
     Comprehensive property analysis engine.
     """
 
-    def __init__(self, datasets: Optional[Dict[str, pd.DataFrame]] = None):
+    def __init__(
+        self,
+        datasets: Optional[Dict[str, pd.DataFrame]] = None,
+        detrend_seasonality: bool = False
+    ):
+        """
+        Args:
+            datasets: Dict of loaded datasets (loads if None)
+            detrend_seasonality: Find peak/trough months from ratios to a
+                                 12-month moving average instead of raw
+                                 monthly means (see src.seasonality)
+        """
         self.datasets = datasets or load_all_datasets()
+        self.detrend_seasonality = detrend_seasonality
 
     def analyze_zip(
         self,
@@ -139,31 +244,29 @@ class PropertyAnalyzer:
         Generate comprehensive analysis for a ZIP code.
         """
         # Get ZIP data from ZHVI
-        zhvi_df = self.datasets['zhvi_zip']
-        zip_data = zhvi_df[zhvi_df['region_name'] == zip_code]
+        panel = get_panel(self.datasets['zhvi_zip'])
+        pos = panel.row_position(zip_code)
 
-        if len(zip_data) == 0:
+        if pos is None:
             return None
 
-        zip_row = zip_data.iloc[0]
-        date_cols = get_date_columns(zhvi_df)
+        zip_row = panel.meta.iloc[pos]
+        values = panel.values[pos]
 
         # Get score data if available
         score_row = None
         if scores_df is not None:
-            score_data = scores_df[scores_df['region_name'] == zip_code]
-            if len(score_data) > 0:
-                score_row = score_data.iloc[0]
+            score_row = get_region_index(scores_df).row(zip_code)
 
         # Perform analyses
-        trend = self._analyze_trends(zip_row, date_cols)
-        momentum = self._calculate_momentum(zip_row, score_row, date_cols)
+        trend = self._analyze_trends(values, panel.dates)
+        momentum = self._calculate_momentum(values, score_row)
         risk = self._assess_risk(zip_row, score_row, trend, momentum)
         recommendation = self._generate_recommendation(
             zip_row, score_row, trend, momentum, risk
         )
         market_context = self._get_market_context(zip_row, score_row)
-        comparables = self._find_comparables(zip_row, scores_df)
+        comparables = self._find_comparables(zip_row, values[-1], scores_df)
 
         report = PropertyAnalysisReport(
             zip_code=zip_code,
@@ -172,7 +275,7 @@ class PropertyAnalyzer:
             metro=str(zip_row.get('metro', '')),
             county=str(zip_row.get('county_name', '')),
             analysis_timestamp=datetime.now().isoformat(),
-            current_score=float(score_row['composite_score']) if score_row is not None else 0,
+            current_score=float(score_row['composite_score']) if score_row is not None else 0.0,
             trend_analysis=trend,
             momentum=momentum,
             risk=risk,
@@ -183,15 +286,408 @@ class PropertyAnalyzer:
 
         return report
 
+    def analyze_many(
+        self,
+        zip_codes: Optional[List[str]] = None,
+        scores_df: Optional[pd.DataFrame] = None,
+        reports: bool = False,
+        chunk_size: int = 50000
+    ) -> BatchAnalysis:
+        """
+        Analyze many ZIP codes in vectorized passes over the ZHVI matrix.
+
+        Trend, momentum, risk and recommendation match analyze_zip() for
+        each ZIP, computed as array operations over all rows at once.
+
+        Args:
+            zip_codes: ZIPs to analyze (default: every ZIP in the ZHVI data);
+                       ZIPs without ZHVI data are skipped
+            scores_df: Optional scores, as for analyze_zip()
+            reports: Also build a PropertyAnalysisReport per ZIP (adds
+                     market context and comparables, which are per ZIP)
+            chunk_size: Rows per pass over the value matrix (bounds memory)
+
+        Returns:
+            BatchAnalysis with one frame row per ZIP, in the given order
+        """
+        panel = get_panel(self.datasets['zhvi_zip'])
+
+        # 1. Panel rows and first matching score rows
+        if zip_codes is None:
+            positions = np.arange(panel.n_regions)
+        else:
+            positions = panel.row_positions(zip_codes)
+            positions = positions[positions >= 0]
+        meta = panel.meta.iloc[positions].reset_index(drop=True)
+        zips = meta[panel.key]
+
+        score = {}
+        score_positions = np.full(len(positions), -1)
+        if scores_df is not None:
+            score_positions = get_region_index(scores_df).positions(zips)
+        has_score = score_positions >= 0
+        # Score columns missing from scores_df take analyze_zip()'s defaults
+        defaults = {'days_to_pending': 60.0, 'price_cut_pct': 20.0}
+        for col in ['composite_score', 'velocity_score', 'appreciation_score',
+                    'days_to_pending', 'price_cut_pct']:
+            if scores_df is not None and col in scores_df.columns:
+                score[col] = gather(scores_df[col], score_positions)
+            else:
+                score[col] = np.where(has_score, defaults.get(col, np.nan), np.nan)
+
+        # 2. Trend columns, chunk by chunk
+        parts = [
+            _trend_columns(panel.values[positions[i:i + chunk_size]], panel.dates,
+                           self.detrend_seasonality)
+            for i in range(0, len(positions), chunk_size)
+        ] or [_trend_columns(panel.values[:0], panel.dates)]
+        trend = {k: np.concatenate([part[k] for part in parts]) for k in parts[0]}
+        columns, masks = self._batch_columns(panel.values, positions, trend, score, has_score)
+
+        frame = pd.DataFrame({
+            'zip_code': zips.to_numpy(),
+            'city': meta['city'].to_numpy() if 'city' in meta.columns else '',
+            'state': meta['state'].to_numpy() if 'state' in meta.columns else '',
+            'metro': meta['metro'].to_numpy() if 'metro' in meta.columns else '',
+            'county': meta['county_name'].to_numpy() if 'county_name' in meta.columns else '',
+            **columns
+        })
+        for col in ['peak_month', 'trough_month']:
+            frame[col] = frame[col].astype('Int64')
+
+        result = BatchAnalysis(frame=frame)
+        if reports:
+            latest = panel.values[positions, -1] if panel.n_dates else np.full(len(positions), np.nan)
+            result.reports = self._batch_reports(frame, meta, latest, masks, scores_df, score_positions)
+        return result
+
+    def _batch_columns(
+        self,
+        values: np.ndarray,
+        positions: np.ndarray,
+        trend: Dict[str, np.ndarray],
+        score: Dict[str, np.ndarray],
+        has_score: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """
+        Momentum, risk and recommendation columns for analyze_many().
+
+        Returns:
+            (columns, masks): frame columns, and the boolean masks behind
+            each report's factor and rationale lists
+        """
+        n_dates = values.shape[1]
+        current = trend['current_value']
+        yoy = trend['yoy_change_pct']
+        volatility_score = np.round(trend['volatility_score'], 1)
+
+        direction = np.select([yoy > 5, yoy < -5], ['up', 'down'], 'stable')
+        strength = np.select(
+            [yoy > 10, yoy > 5, yoy < -10, yoy < -5],
+            ['strong', 'moderate', 'strong', 'moderate'], 'weak'
+        )
+
+        # 1. Momentum
+        short_term = long_term = np.zeros(len(positions))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if n_dates >= 7:
+                last = values[positions, -1]
+                short_term = (last - values[positions, -4]) / values[positions, -4] * 100
+                long_term = (last - values[positions, -7]) / values[positions, -7] * 100
+
+        velocity = np.where(np.isnan(score['velocity_score']), 50.0, score['velocity_score'])
+        appreciation = np.where(np.isnan(score['appreciation_score']), 50.0, score['appreciation_score'])
+        dtp, price_cuts = score['days_to_pending'], score['price_cut_pct']
+        demand = np.where(
+            ~np.isnan(dtp) & ~np.isnan(price_cuts),
+            np.clip(100 - dtp + (25 - price_cuts) * 2, 0, 100), 50.0
+        )
+        consistency = np.full(len(positions), 50.0)
+        if n_dates >= 12:
+            consistency = (np.diff(values[positions, -12:], axis=1) > 0).sum(axis=1) / 11 * 100
+
+        momentum = velocity * 0.25 + appreciation * 0.30 + demand * 0.25 + consistency * 0.20
+        momentum_grade = np.select(
+            [momentum >= 80, momentum >= 65, momentum >= 50, momentum >= 35],
+            ['A', 'B', 'C', 'D'], 'F'
+        )
+        momentum_score = np.round(momentum, 1)
+
+        accelerating = short_term > long_term
+        masks = {
+            'accelerating': accelerating,
+            'decelerating': ~accelerating & (short_term < long_term * 0.5),
+            'fast_velocity': velocity > 70,
+            'strong_demand': demand > 70,
+            'consistent': consistency > 70,
+        }
+
+        # 2. Risk
+        declining = direction == 'down'
+        market_risk = volatility_score + np.where(declining, 20, 0)
+        price_risk = np.select(
+            [current > 400000, current > 300000, current < 100000], [70, 50, 60], 30
+        )
+        days = np.where(np.isnan(dtp), 60.0, dtp)
+        liquidity_risk = np.select([days > 60, days > 45], [70, 50], 25)
+        timing_risk = np.select([momentum_score < 40, momentum_score > 80], [70, 40], 35)
+
+        risk = market_risk * 0.25 + price_risk * 0.25 + liquidity_risk * 0.30 + timing_risk * 0.20
+        risk_grade = np.select([risk < 35, risk < 50, risk < 70], ['Low', 'Medium', 'High'], 'Very High')
+        risk_score = np.round(risk, 1)
+        masks.update({
+            'declining': declining,
+            'high_entry': current > 400000,
+            'low_value': current < 100000,
+            'slow_market': days > 60,
+            'weak_momentum': momentum_score < 40,
+            'hot_market': momentum_score > 80,
+        })
+
+        # 3. Recommendation (a missing composite falls through to AVOID)
+        composite = np.where(has_score, score['composite_score'], 50.0)
+        opportunity = (composite / 100 * 0.4 + momentum_score / 100 * 0.35
+                       + (1 - risk_score / 100) * 0.25) * 100
+        tiers = [opportunity >= 70, opportunity >= 55, opportunity >= 40]
+        action = np.select(tiers, ['STRONG BUY', 'BUY', 'HOLD'], 'AVOID')
+        confidence = np.select(tiers, ['High', 'Medium-High', 'Medium'], 'Low')
+        discount = np.select(tiers, [0.15, 0.12, 0.10], 0.20)
+
+        target_price = current * (1 - discount)
+        estimated_arv = current * 1.15
+        estimated_profit = estimated_arv - target_price - current * 0.10
+        with np.errstate(invalid='ignore', divide='ignore'):
+            profit_margin = estimated_profit / target_price * 100
+
+        hold_days = np.trunc(days).astype(np.int64)
+        hold_period = (pd.Series(np.maximum(30, hold_days + 30)).astype(str) + '-'
+                       + pd.Series(np.maximum(60, hold_days + 60)).astype(str) + ' days')
+        exit_strategy = np.select(
+            [profit_margin > 25, profit_margin > 15],
+            ['Retail sale to owner-occupant', 'Wholesale to investor or retail sale'],
+            'Wholesale or rental hold'
+        )
+        masks.update({
+            'strong_composite': composite >= 65,
+            'good_momentum': np.isin(momentum_grade, ['A', 'B']),
+            'low_risk': risk_grade == 'Low',
+            'strong_uptrend': (direction == 'up') & (strength == 'strong'),
+            'composite': composite,
+        })
+
+        columns = {
+            'current_score': np.where(has_score, score['composite_score'], 0.0),
+            **{k: v for k, v in trend.items() if k not in ('yoy_change_pct', 'two_year_change_pct',
+                                                           'volatility_score')},
+            'yoy_change_pct': np.round(yoy, 2),
+            'two_year_change_pct': np.round(trend['two_year_change_pct'], 2),
+            'trend_direction': direction,
+            'trend_strength': strength,
+            'volatility_score': volatility_score,
+            'momentum_score': momentum_score,
+            'momentum_grade': momentum_grade,
+            'velocity_score': np.round(velocity, 1),
+            'appreciation_score': np.round(appreciation, 1),
+            'demand_score': np.round(demand, 1),
+            'trend_consistency': np.round(consistency, 1),
+            'overall_risk_score': risk_score,
+            'risk_grade': risk_grade,
+            'market_risk': np.round(market_risk, 1),
+            'price_risk': price_risk.astype(np.float64),
+            'liquidity_risk': liquidity_risk.astype(np.float64),
+            'timing_risk': timing_risk.astype(np.float64),
+            'action': action,
+            'confidence': confidence,
+            'opportunity_score': np.round(opportunity, 1),
+            'target_purchase_price': np.round(target_price, 0),
+            'estimated_arv': np.round(estimated_arv, 0),
+            'estimated_profit': np.round(estimated_profit, 0),
+            'profit_margin_pct': np.round(profit_margin, 1),
+            'recommended_hold_period': hold_period.to_numpy(),
+            'exit_strategy': exit_strategy,
+        }
+        return columns, masks
+
+    def _batch_reports(
+        self,
+        frame: pd.DataFrame,
+        meta: pd.DataFrame,
+        latest: np.ndarray,
+        masks: Dict[str, np.ndarray],
+        scores_df: Optional[pd.DataFrame],
+        score_positions: np.ndarray
+    ) -> List[PropertyAnalysisReport]:
+        """PropertyAnalysisReport objects for the rows of an analyze_many() frame."""
+        contexts = self._batch_market_context(meta, scores_df, score_positions)
+        comparables = self._batch_comparables(meta['metro'] if 'metro' in meta.columns else None,
+                                              frame['zip_code'], latest, scores_df)
+
+        timestamp = datetime.now().isoformat()
+        reports = []
+        meta_text = {col: [str(v) for v in meta[col]] if col in meta.columns else [''] * len(meta)
+                     for col in ['city', 'state', 'metro', 'county_name']}
+        for i, row in enumerate(frame.to_dict('records')):
+            trend = TrendAnalysis(
+                current_value=row['current_value'],
+                value_1yr_ago=row['value_1yr_ago'],
+                value_2yr_ago=None if np.isnan(row['value_2yr_ago']) else row['value_2yr_ago'],
+                yoy_change_pct=row['yoy_change_pct'],
+                two_year_change_pct=None if np.isnan(row['two_year_change_pct']) else row['two_year_change_pct'],
+                trend_direction=row['trend_direction'],
+                trend_strength=row['trend_strength'],
+                volatility_score=row['volatility_score'],
+                seasonality_detected=bool(row['seasonality_detected']),
+                peak_month=None if pd.isna(row['peak_month']) else int(row['peak_month']),
+                trough_month=None if pd.isna(row['trough_month']) else int(row['trough_month'])
+            )
+            momentum = MomentumScore(
+                momentum_score=row['momentum_score'],
+                momentum_grade=row['momentum_grade'],
+                velocity_score=row['velocity_score'],
+                appreciation_score=row['appreciation_score'],
+                demand_score=row['demand_score'],
+                trend_consistency=row['trend_consistency'],
+                momentum_factors=[text for key, text in MOMENTUM_FACTORS if masks[key][i]]
+            )
+            risk = RiskAssessment(
+                overall_risk_score=row['overall_risk_score'],
+                risk_grade=row['risk_grade'],
+                market_risk=row['market_risk'],
+                price_risk=row['price_risk'],
+                liquidity_risk=row['liquidity_risk'],
+                timing_risk=row['timing_risk'],
+                risk_factors=[text for key, text, _ in RISK_FACTORS if masks[key][i]],
+                mitigations=[fix for key, _, fix in RISK_FACTORS if masks[key][i]]
+            )
+
+            composite = masks['composite'][i]
+            rationale = []
+            if masks['strong_composite'][i]:
+                rationale.append(f"Strong composite score of {composite:.1f}")
+            if masks['good_momentum'][i]:
+                rationale.append(f"Good market momentum (Grade {row['momentum_grade']})")
+            if masks['low_risk'][i]:
+                rationale.append("Lower than average risk profile")
+            if masks['strong_uptrend'][i]:
+                rationale.append("Strong upward price trend")
+            if not rationale:
+                rationale.append("Meets basic investment criteria with standard risk profile")
+
+            recommendation = InvestmentRecommendation(
+                action=row['action'],
+                confidence=row['confidence'],
+                target_purchase_price=row['target_purchase_price'],
+                estimated_arv=row['estimated_arv'],
+                estimated_profit=row['estimated_profit'],
+                profit_margin_pct=row['profit_margin_pct'],
+                recommended_hold_period=row['recommended_hold_period'],
+                exit_strategy=row['exit_strategy'],
+                rationale=rationale,
+                key_metrics={
+                    'opportunity_score': row['opportunity_score'],
+                    'composite_score': float(np.round(composite, 1)),
+                    'momentum_score': row['momentum_score'],
+                    'risk_score': row['overall_risk_score']
+                }
+            )
+
+            reports.append(PropertyAnalysisReport(
+                zip_code=row['zip_code'],
+                city=meta_text['city'][i],
+                state=meta_text['state'][i],
+                metro=meta_text['metro'][i],
+                county=meta_text['county_name'][i],
+                analysis_timestamp=timestamp,
+                current_score=row['current_score'],
+                trend_analysis=trend,
+                momentum=momentum,
+                risk=risk,
+                recommendation=recommendation,
+                market_context=contexts[i],
+                comparable_zips=comparables[i]
+            ))
+
+        return reports
+
+    def _batch_market_context(
+        self,
+        meta: pd.DataFrame,
+        scores_df: Optional[pd.DataFrame],
+        score_positions: np.ndarray
+    ) -> List[Dict]:
+        """_get_market_context() for every row of an analyze_many() batch."""
+        n = len(meta)
+        unknown = pd.Series(['Unknown'] * n, dtype=object)
+        metros = meta['metro'] if 'metro' in meta.columns else unknown
+        counties = meta['county_name'] if 'county_name' in meta.columns else unknown
+        contexts = [{'metro': str(m), 'county': str(c)} for m, c in zip(metros, counties)]
+
+        # 1. Score columns, None where missing
+        if scores_df is not None:
+            for col in ['days_to_pending', 'price_cut_pct', 'sale_to_list', 'appreciation_pct']:
+                values = (gather(scores_df[col], score_positions) if col in scores_df.columns
+                          else np.full(n, np.nan))
+                for i in np.flatnonzero(score_positions >= 0):
+                    contexts[i][col] = None if np.isnan(values[i]) else float(values[i])
+
+        # 2. Latest metro market heat
+        if 'market_heat' in self.datasets:
+            heat = get_panel(self.datasets['market_heat'])
+            if heat.n_dates > 0:
+                heat_positions = heat.row_positions(metros.tolist())
+                for i in np.flatnonzero((heat_positions >= 0) & metros.notna().to_numpy()):
+                    contexts[i]['market_heat'] = float(heat.values[heat_positions[i], -1])
+
+        return contexts
+
+    def _batch_comparables(
+        self,
+        metros: Optional[pd.Series],
+        zip_codes: pd.Series,
+        latest: np.ndarray,
+        scores_df: Optional[pd.DataFrame],
+        n_comps: int = 5
+    ) -> List[List[Dict]]:
+        """_find_comparables() for every row of an analyze_many() batch."""
+        if scores_df is None or metros is None:
+            return [[] for _ in range(len(zip_codes))]
+
+        index = get_region_index(scores_df)
+        names = scores_df['region_name'].to_numpy()
+        values = scores_df['current_value'].to_numpy(dtype=np.float64)
+        fields = {
+            'city': scores_df['city'].tolist() if 'city' in scores_df.columns else [''] * len(scores_df),
+            'composite_score': scores_df['composite_score'].to_numpy(dtype=np.float64),
+            'appreciation_pct': (scores_df['appreciation_pct'].to_numpy(dtype=np.float64)
+                                 if 'appreciation_pct' in scores_df.columns else np.zeros(len(scores_df))),
+        }
+
+        comparables = []
+        for metro, zip_code, value in zip(metros, zip_codes, latest):
+            if pd.isna(metro):
+                comparables.append([])
+                continue
+            rows = index.group_positions('metro', metro)
+            rows = rows[names[rows] != zip_code]
+            rows = rows[top_k_positions(np.abs(values[rows] - value), n_comps, ascending=True)]
+            comparables.append([
+                {
+                    'zip_code': names[r],
+                    'city': fields['city'][r],
+                    'current_value': float(np.round(values[r], 0)),
+                    'composite_score': float(np.round(fields['composite_score'][r], 1)),
+                    'appreciation_pct': float(np.round(fields['appreciation_pct'][r], 1))
+                }
+                for r in rows
+            ])
+        return comparables
+
     def _analyze_trends(
         self,
-        zip_row: pd.Series,
-        date_cols: List[str]
+        values: np.ndarray,
+        dates: pd.DatetimeIndex
     ) -> TrendAnalysis:
         """Analyze historical price trends."""
-        values = zip_row[date_cols].values.astype(float)
-        dates = pd.to_datetime(date_cols)
-
         current_value = values[-1] if not np.isnan(values[-1]) else 0
 
         # 1 year ago (12 months)
@@ -223,39 +719,28 @@ class PropertyAnalyzer:
         volatility = np.std(monthly_changes) if len(monthly_changes) > 0 else 0
         volatility_score = min(100, volatility * 10)  # Scale to 0-100
 
-        # Check for seasonality (simplified)
+        # Check for seasonality (calendar-month profile)
+        peak_month = None
+        trough_month = None
+        seasonality = False
         if len(values) >= 24:
-            monthly_avgs = {}
-            for i, date in enumerate(dates):
-                month = date.month
-                if month not in monthly_avgs:
-                    monthly_avgs[month] = []
-                if not np.isnan(values[i]):
-                    monthly_avgs[month].append(values[i])
-
-            avg_by_month = {m: np.mean(v) for m, v in monthly_avgs.items() if v}
-            if avg_by_month:
-                peak_month = max(avg_by_month, key=avg_by_month.get)
-                trough_month = min(avg_by_month, key=avg_by_month.get)
-                seasonality = max(avg_by_month.values()) / min(avg_by_month.values()) > 1.05
-            else:
-                peak_month = None
-                trough_month = None
-                seasonality = False
-        else:
-            peak_month = None
-            trough_month = None
-            seasonality = False
+            summary = month_profiles(
+                values[None, :], dates, detrend=self.detrend_seasonality
+            ).peaks_and_troughs()
+            if not np.isnan(summary['peak_month'][0]):
+                peak_month = int(summary['peak_month'][0])
+                trough_month = int(summary['trough_month'][0])
+                seasonality = bool(summary['detected'][0])
 
         return TrendAnalysis(
-            current_value=current_value,
-            value_1yr_ago=value_1yr,
-            value_2yr_ago=value_2yr,
-            yoy_change_pct=round(yoy_change, 2),
-            two_year_change_pct=round(two_year_change, 2) if two_year_change else None,
+            current_value=float(current_value),
+            value_1yr_ago=float(value_1yr),
+            value_2yr_ago=float(value_2yr) if value_2yr is not None else None,
+            yoy_change_pct=float(np.round(yoy_change, 2)),
+            two_year_change_pct=float(np.round(two_year_change, 2)) if two_year_change else None,
             trend_direction=trend_direction,
             trend_strength=trend_strength,
-            volatility_score=round(volatility_score, 1),
+            volatility_score=float(np.round(volatility_score, 1)),
             seasonality_detected=seasonality,
             peak_month=peak_month,
             trough_month=trough_month
@@ -263,13 +748,10 @@ class PropertyAnalyzer:
 
     def _calculate_momentum(
         self,
-        zip_row: pd.Series,
-        score_row: Optional[pd.Series],
-        date_cols: List[str]
+        values: np.ndarray,
+        score_row: Optional[pd.Series]
     ) -> MomentumScore:
         """Calculate market momentum indicators."""
-        values = zip_row[date_cols].values.astype(float)
-
         # Calculate short-term vs long-term momentum
         if len(values) >= 6:
             short_term = (values[-1] - values[-4]) / values[-4] * 100  # 3 months
@@ -338,12 +820,12 @@ class PropertyAnalyzer:
             factors.append("Consistent upward trend")
 
         return MomentumScore(
-            momentum_score=round(momentum_score, 1),
+            momentum_score=float(np.round(momentum_score, 1)),
             momentum_grade=grade,
-            velocity_score=round(velocity_score, 1),
-            appreciation_score=round(appreciation_score, 1),
-            demand_score=round(demand_score, 1),
-            trend_consistency=round(trend_consistency, 1),
+            velocity_score=float(np.round(velocity_score, 1)),
+            appreciation_score=float(np.round(appreciation_score, 1)),
+            demand_score=float(np.round(demand_score, 1)),
+            trend_consistency=float(np.round(trend_consistency, 1)),
             momentum_factors=factors
         )
 
@@ -425,12 +907,12 @@ class PropertyAnalyzer:
             grade = "Very High"
 
         return RiskAssessment(
-            overall_risk_score=round(overall_risk, 1),
+            overall_risk_score=float(np.round(overall_risk, 1)),
             risk_grade=grade,
-            market_risk=round(market_risk, 1),
-            price_risk=round(price_risk, 1),
-            liquidity_risk=round(liquidity_risk, 1),
-            timing_risk=round(timing_risk, 1),
+            market_risk=float(np.round(market_risk, 1)),
+            price_risk=float(np.round(price_risk, 1)),
+            liquidity_risk=float(np.round(liquidity_risk, 1)),
+            timing_risk=float(np.round(timing_risk, 1)),
             risk_factors=risk_factors,
             mitigations=mitigations
         )
@@ -507,16 +989,16 @@ class PropertyAnalyzer:
         return InvestmentRecommendation(
             action=action,
             confidence=confidence,
-            target_purchase_price=round(target_price, 0),
-            estimated_arv=round(estimated_arv, 0),
-            estimated_profit=round(estimated_profit, 0),
-            profit_margin_pct=round(profit_margin, 1),
+            target_purchase_price=float(np.round(target_price, 0)),
+            estimated_arv=float(np.round(estimated_arv, 0)),
+            estimated_profit=float(np.round(estimated_profit, 0)),
+            profit_margin_pct=float(np.round(profit_margin, 1)),
             recommended_hold_period=hold_period,
             exit_strategy=exit_strategy,
             rationale=rationale,
             key_metrics={
-                'opportunity_score': round(opportunity_score, 1),
-                'composite_score': round(composite_score, 1),
+                'opportunity_score': float(np.round(opportunity_score, 1)),
+                'composite_score': float(np.round(composite_score, 1)),
                 'momentum_score': momentum.momentum_score,
                 'risk_score': risk.overall_risk_score
             }
@@ -542,18 +1024,17 @@ class PropertyAnalyzer:
         # Get metro-level data
         metro_name = zip_row.get('metro')
         if metro_name and 'market_heat' in self.datasets:
-            heat_df = self.datasets['market_heat']
-            metro_heat = heat_df[heat_df['region_name'] == metro_name]
-            if len(metro_heat) > 0:
-                date_cols = get_date_columns(heat_df)
-                if date_cols:
-                    context['market_heat'] = float(metro_heat.iloc[0][date_cols[-1]])
+            heat = get_panel(self.datasets['market_heat'])
+            pos = heat.row_position(metro_name)
+            if pos is not None and heat.n_dates > 0:
+                context['market_heat'] = float(heat.values[pos, -1])
 
         return context
 
     def _find_comparables(
         self,
         zip_row: pd.Series,
+        current_value: float,
         scores_df: Optional[pd.DataFrame],
         n_comps: int = 5
     ) -> List[Dict]:
@@ -563,32 +1044,29 @@ class PropertyAnalyzer:
 
         metro = zip_row.get('metro')
         current_zip = zip_row.get('region_name')
-        current_value = zip_row[get_date_columns(self.datasets['zhvi_zip'])[-1]]
 
         if pd.isna(metro):
             return []
 
         # Find ZIPs in same metro with similar values
-        metro_zips = scores_df[
-            (scores_df['metro'] == metro) &
-            (scores_df['region_name'] != current_zip)
-        ].copy()
+        metro_zips = scores_df.iloc[get_region_index(scores_df).group_positions('metro', metro)]
+        metro_zips = metro_zips[metro_zips['region_name'] != current_zip].copy()
 
         if len(metro_zips) == 0:
             return []
 
         # Sort by value similarity
         metro_zips['value_diff'] = abs(metro_zips['current_value'] - current_value)
-        metro_zips = metro_zips.sort_values('value_diff').head(n_comps)
+        metro_zips = top_k_rows(metro_zips, 'value_diff', n_comps, ascending=True)
 
         comps = []
         for _, row in metro_zips.iterrows():
             comps.append({
                 'zip_code': row['region_name'],
                 'city': row.get('city', ''),
-                'current_value': round(row['current_value'], 0),
-                'composite_score': round(row['composite_score'], 1),
-                'appreciation_pct': round(row.get('appreciation_pct', 0), 1)
+                'current_value': float(np.round(row['current_value'], 0)),
+                'composite_score': float(np.round(row['composite_score'], 1)),
+                'appreciation_pct': float(np.round(row.get('appreciation_pct', 0), 1))
             })
 
         return comps
@@ -599,23 +1077,16 @@ class PropertyAnalyzer:
         months: int = 24
     ) -> Optional[pd.DataFrame]:
         """Get historical price data for a ZIP."""
-        zhvi_df = self.datasets['zhvi_zip']
-        zip_data = zhvi_df[zhvi_df['region_name'] == zip_code]
+        panel = get_panel(self.datasets['zhvi_zip'])
+        pos = panel.row_position(zip_code)
 
-        if len(zip_data) == 0:
+        if pos is None:
             return None
 
-        date_cols = get_date_columns(zhvi_df)
-        recent_cols = date_cols[-months:] if len(date_cols) >= months else date_cols
-
-        history = []
-        for col in recent_cols:
-            history.append({
-                'date': col,
-                'value': float(zip_data.iloc[0][col])
-            })
-
-        return pd.DataFrame(history)
+        return pd.DataFrame({
+            'date': panel.date_columns[-months:],
+            'value': panel.values[pos, -months:],
+        })
 
 
 def analyze_property(zip_code: str, scores_df: pd.DataFrame = None) -> Optional[Dict]:
@@ -0,0 +1,122 @@
+"""
+Region Index Module
+
+Constant-time ZIP (or metro) lookups in datasets and score tables.
+
+Looking up one region with `df[df['region_name'] == zip_code]` scans every
+row. A RegionIndex maps each key value (region_name, region_id, ...) to its
+first row position once per frame, so single lookups are a dict hit and
+batch lookups one hash join. It can also list the rows of each value of
+another column (e.g. every ZIP in a metro).
+
+Indexes are shared through get_region_index(), which rebuilds them when a
+frame's shape changes; call invalidate_region_index() after editing key
+values in place.
+"""
+
+import weakref
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RegionIndex:
+    """
+    First row position of each key value in a frame.
+
+    Only a weak reference to the frame is kept, so a cached index never
+    keeps its frame alive.
+
+    Attributes:
+        key: Indexed column
+        positions_by_key: Map of key value to row position (first
+                          occurrence wins; missing keys are not indexed)
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str = 'region_name'):
+        self._frame = weakref.ref(df)
+        self.key = key
+        self.n_rows = len(df)
+        self._columns = df.columns
+
+        # Factorize once, then keep the first row of each distinct key
+        if key in df.columns:
+            codes, uniques = pd.factorize(df[key])
+            first = np.full(len(uniques), self.n_rows, dtype=np.int64)
+            np.minimum.at(first, codes[codes >= 0], np.flatnonzero(codes >= 0))
+            self.positions_by_key: Dict = dict(zip(uniques.tolist(), first.tolist()))
+            self._keys = pd.Index(uniques)
+            self._first = first
+        else:
+            self.positions_by_key = {}
+            self._keys = pd.Index([])
+            self._first = np.zeros(0, dtype=np.int64)
+        self._groups: Dict[str, Dict] = {}
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The indexed frame (ReferenceError once it has been collected)."""
+        df = self._frame()
+        if df is None:
+            raise ReferenceError("the frame of this RegionIndex no longer exists")
+        return df
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Whether the index was built from this frame's current rows/columns."""
+        return df.columns is self._columns and len(df) == self.n_rows
+
+    def __contains__(self, region) -> bool:
+        return region in self.positions_by_key
+
+    def position(self, region) -> Optional[int]:
+        """Row position of a region, or None if it is not in the frame."""
+        return self.positions_by_key.get(region)
+
+    def positions(self, regions: Sequence) -> np.ndarray:
+        """Row positions for many regions (-1 where missing)."""
+        found = self._keys.get_indexer(pd.Index(regions))
+        if len(self._first) == 0:
+            return np.full(len(found), -1, dtype=np.int64)
+        return np.where(found >= 0, self._first[np.maximum(found, 0)], -1)
+
+    def row(self, region) -> Optional[pd.Series]:
+        """First row of a region, or None if it is not in the frame."""
+        pos = self.position(region)
+        return None if pos is None else self.frame.iloc[pos]
+
+    def group_positions(self, column: str, value: Hashable) -> np.ndarray:
+        """Positions (ascending) of every row whose column equals value."""
+        if column not in self._groups:
+            self._groups[column] = self.frame.groupby(column, sort=False).indices
+        return self._groups[column].get(value, np.zeros(0, dtype=np.int64))
+
+
+# Indexes built so far, keyed by id() of the frame and the key column. The
+# weakref lets an entry drop out when its frame is garbage collected.
+_INDEXES: Dict[Tuple[int, str], Tuple[weakref.ref, RegionIndex]] = {}
+
+
+def get_region_index(df: pd.DataFrame, key: str = 'region_name') -> RegionIndex:
+    """
+    Get the RegionIndex of a frame, building it on first use.
+
+    The index is rebuilt if the columns or row count changed. Call
+    invalidate_region_index() after editing values in place.
+    """
+    cache_key = (id(df), key)
+    entry = _INDEXES.get(cache_key)
+    if entry is not None:
+        ref, index = entry
+        if ref() is df and index.matches(df):
+            return index
+
+    index = RegionIndex(df, key)
+    _INDEXES[cache_key] = (weakref.ref(df, lambda _, k=cache_key: _INDEXES.pop(k, None)), index)
+    return index
+
+
+def invalidate_region_index(df: pd.DataFrame) -> None:
+    """Drop the cached indexes of a frame so the next lookup rebuilds them."""
+    for cache_key in [k for k in _INDEXES if k[0] == id(df)]:
+        _INDEXES.pop(cache_key, None)
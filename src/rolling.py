@@ -0,0 +1,139 @@
+"""
+Rolling Window Module
+
+Trailing-window averages over a wide time series from running sums.
+
+A RollingWindow keeps, per region, the cumulative sum and count of the
+non-missing values up to every date. The mean over any lookback ending at
+any date is then two subtractions, and adding a new month (or week) only
+extends the running totals by one column. Differences of running sums can
+differ from a direct window sum in the last bits, so the latest-window
+metrics use SeriesPanel.window_mean; RollingWindow serves past dates and
+backfills (score_history).
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class RollingWindow:
+    """
+    Running sums and counts of a (regions x dates) value matrix.
+
+    Column j of the totals holds the sum/count of the first j dates, so
+    column 0 is all zeros. Buffers grow by doubling, making append()
+    amortized O(n_regions).
+    """
+
+    def __init__(self, n_regions: int, capacity: int = 16):
+        self.n_regions = n_regions
+        self._sums = np.zeros((n_regions, capacity + 1))
+        self._counts = np.zeros((n_regions, capacity + 1), dtype=np.int64)
+        self._dates = np.empty(capacity, dtype='datetime64[ns]')
+        self._n = 0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, dates) -> 'RollingWindow':
+        """Build from a full value matrix and its column dates."""
+        values = np.asarray(values, dtype=np.float64)
+        n_regions, n_dates = values.shape
+        window = cls(n_regions, capacity=max(n_dates, 1))
+
+        valid = ~np.isnan(values)
+        np.cumsum(np.where(valid, values, 0.0), axis=1, out=window._sums[:, 1:n_dates + 1])
+        np.cumsum(valid, axis=1, out=window._counts[:, 1:n_dates + 1])
+        window._dates[:n_dates] = pd.DatetimeIndex(dates).to_numpy()
+        window._n = n_dates
+        return window
+
+    @classmethod
+    def from_panel(cls, panel) -> 'RollingWindow':
+        """Build from a SeriesPanel."""
+        return cls.from_values(panel.values, panel.dates)
+
+    @property
+    def n_dates(self) -> int:
+        return self._n
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._dates[:self._n])
+
+    # ----- Updates -----
+
+    def _grow(self) -> None:
+        capacity = 2 * max(self._n, 1)
+        sums = np.zeros((self.n_regions, capacity + 1))
+        counts = np.zeros((self.n_regions, capacity + 1), dtype=np.int64)
+        sums[:, :self._n + 1] = self._sums[:, :self._n + 1]
+        counts[:, :self._n + 1] = self._counts[:, :self._n + 1]
+        dates = np.empty(capacity, dtype='datetime64[ns]')
+        dates[:self._n] = self._dates[:self._n]
+        self._sums, self._counts, self._dates = sums, counts, dates
+
+    def append(self, date, values: np.ndarray) -> None:
+        """Add the next date's values (one per region, NaN for missing)."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (self.n_regions,):
+            raise ValueError(f"Expected {self.n_regions} values, got {values.shape}")
+        if self._n and pd.Timestamp(date) <= pd.Timestamp(self._dates[self._n - 1]):
+            raise ValueError(f"Date {date} is not after the last date {self._dates[self._n - 1]}")
+        if self._n == self._dates.shape[0]:
+            self._grow()
+
+        valid = ~np.isnan(values)
+        n = self._n
+        self._sums[:, n + 1] = self._sums[:, n] + np.where(valid, values, 0.0)
+        self._counts[:, n + 1] = self._counts[:, n] + valid
+        self._dates[n] = np.datetime64(pd.Timestamp(date), 'ns')
+        self._n += 1
+
+    def extend(self, panel) -> int:
+        """
+        Append the dates of a newer panel that come after the last date.
+
+        The panel must have the same regions in the same order. Returns the
+        number of dates added.
+        """
+        if panel.n_regions != self.n_regions:
+            raise ValueError("Panel regions do not match the rolling window")
+        start = 0
+        if self._n:
+            start = int(np.searchsorted(panel.dates, self._dates[self._n - 1], side='right'))
+        for pos in range(start, panel.n_dates):
+            self.append(panel.dates[pos], panel.values[:, pos])
+        return panel.n_dates - start
+
+    # ----- Queries -----
+
+    def _window(self, end: np.ndarray, lookback: int):
+        begin = np.maximum(end - lookback, 0)
+        sums = self._sums[:, end] - self._sums[:, begin]
+        counts = self._counts[:, end] - self._counts[:, begin]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def mean(self, lookback: int, end: Optional[int] = None) -> np.ndarray:
+        """
+        Mean of the last `lookback` dates per region, skipping missing values.
+
+        Args:
+            lookback: Number of dates in the window (all if more than available)
+            end: Number of leading dates to consider (default: all), i.e. the
+                 window ends just before position `end`
+        """
+        end = self._n if end is None else min(end, self._n)
+        return self._window(np.array(end), lookback)
+
+    def means_asof(self, dates, lookback: int) -> np.ndarray:
+        """
+        Trailing means for the windows ending at or before each of `dates`.
+
+        Returns:
+            (n_regions, len(dates)) array, NaN where no observation falls
+            in the window
+        """
+        end = np.searchsorted(self._dates[:self._n], pd.DatetimeIndex(dates).to_numpy(), side='right')
+        return self._window(end, lookback)
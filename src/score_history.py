@@ -0,0 +1,358 @@
+"""
+Score History Module
+
+Composite flip scores for every ZIP at every historical month-end.
+
+Each month is scored the way flip_opportunity_score() scores the latest
+month: appreciation over the trailing lookback, metro metrics averaged over
+the trailing metro window, and the county value gap, each normalized across
+regions within that month. All months are computed together as column-wise
+operations on the SeriesPanel value matrices (metro windows via each
+panel's RollingWindow) instead of re-running the scoring pipeline once per
+month.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import load_all_datasets, resolve_datasets
+from .normalization import normalize_columns
+from .scoring_engine import (
+    BALANCED,
+    COMPONENT_COLUMNS,
+    METRO_DATASETS,
+    SCORE_COLUMNS,
+    FlipStrategy,
+    extra_match_counts,
+    lookup_positions,
+    match_counts,
+    strategy_weights,
+    top_k_positions,
+)
+from .series_panel import SeriesPanel, get_panel
+
+
+def _values_asof(panel: SeriesPanel, dates: pd.DatetimeIndex) -> np.ndarray:
+    """Latest value at or before each date, per region (NaN before the first date)."""
+    end = np.searchsorted(panel.dates, dates, side='right')
+    values = np.hstack([panel.values, np.full((panel.n_regions, 1), np.nan)])
+    # end == 0 selects the trailing NaN column
+    return values[:, np.where(end > 0, end - 1, panel.n_dates)]
+
+
+def _gather_rows(matrix: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Rows of a matrix at positions, with a NaN row where position is -1."""
+    padded = np.vstack([matrix, np.full((1, matrix.shape[1]), np.nan)])
+    return padded[positions]
+
+
+def _strategy_weights(strategy: FlipStrategy) -> Dict[str, float]:
+    """Weight of each component score column."""
+    return dict(zip(COMPONENT_COLUMNS, strategy_weights([strategy])[:, 0]))
+
+
+def _add_weighted(composite: np.ndarray, score: np.ndarray, weight: float) -> np.ndarray:
+    """Composite plus a weighted component (missing scores count as 50)."""
+    return composite + np.where(np.isnan(score), 50.0, score) * weight
+
+
+def _value_in_range(current: np.ndarray, min_home_value: float, max_home_value: float) -> np.ndarray:
+    return ~np.isnan(current) & (current >= min_home_value) & (current <= max_home_value)
+
+
+class ScoreHistory:
+    """
+    Composite scores for every ZIP (rows) at every month-end (columns).
+
+    Attributes:
+        meta: ZIP metadata, row-aligned with the matrices
+        dates: Month-end dates, aligned with the matrix columns
+        composite: (n_zips, n_dates) composite scores (NaN outside the value range)
+        current_value: (n_zips, n_dates) home values
+        in_range: (n_zips, n_dates) mask of ZIPs inside the value range
+        components: Component score and raw metric matrices by column name
+                    (empty unless built with keep_components=True)
+        strategy: Strategy the composites use
+    """
+
+    def __init__(
+        self,
+        meta: pd.DataFrame,
+        dates: pd.DatetimeIndex,
+        composite: np.ndarray,
+        current_value: np.ndarray,
+        in_range: np.ndarray,
+        components: Dict[str, np.ndarray],
+        strategy: FlipStrategy
+    ):
+        self.meta = meta
+        self.dates = dates
+        self.composite = composite
+        self.current_value = current_value
+        self.in_range = in_range
+        self.components = components
+        self.strategy = strategy
+        self._panel: Optional[SeriesPanel] = None
+
+    @property
+    def n_dates(self) -> int:
+        return len(self.dates)
+
+    def position(self, date) -> int:
+        """Column of the latest month-end at or before date."""
+        pos = int(np.searchsorted(self.dates, pd.Timestamp(date), side='right')) - 1
+        if pos < 0:
+            raise KeyError(f"No score history on or before {date}")
+        return pos
+
+    @property
+    def panel(self) -> SeriesPanel:
+        """The composite matrix as a SeriesPanel (row lookups, to_long)."""
+        if self._panel is None:
+            self._panel = SeriesPanel(
+                values=self.composite,
+                dates=self.dates,
+                date_columns=[d.strftime('%Y-%m-%d') for d in self.dates],
+                meta=self.meta
+            )
+        return self._panel
+
+    def at(
+        self,
+        date=None,
+        position: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Scores as of one month, shaped like flip_opportunity_score() output.
+
+        Args:
+            date: Month to use (latest month-end at or before it); default latest
+            position: Column index instead of a date
+            top_k: Keep only the k highest composite scores
+        """
+        if position is None:
+            position = self.n_dates - 1 if date is None else self.position(date)
+
+        rows = np.flatnonzero(self.in_range[:, position])
+        # Descending, missing last, as sort_values
+        rows = rows[top_k_positions(
+            self.composite[rows, position], len(rows) if top_k is None else top_k
+        )]
+        result = self.meta.iloc[rows].reset_index(drop=True)
+        result['current_value'] = self.current_value[rows, position]
+        for col, matrix in self.components.items():
+            result[col] = matrix[rows, position]
+        result['composite_score'] = self.composite[rows, position]
+        result['strategy'] = self.strategy.name
+
+        output_cols = [c for c in SCORE_COLUMNS if c in result.columns]
+        return result[output_cols].reset_index(drop=True)
+
+    def reweight(
+        self,
+        strategy: FlipStrategy,
+        min_home_value: float = 50000,
+        max_home_value: float = 500000
+    ) -> 'ScoreHistory':
+        """
+        The same history for another strategy and value range.
+
+        Components do not depend on either, so this is a weighted sum and a
+        mask over the kept component scores, giving the same composites as
+        score_history() with those arguments. The component and value
+        matrices are shared, not copied.
+
+        Args:
+            strategy: FlipStrategy defining weights
+            min_home_value, max_home_value: Value range for in_range
+
+        Returns:
+            ScoreHistory
+        """
+        if not self.components:
+            raise ValueError("reweight() needs a history built with keep_components=True")
+
+        weights = _strategy_weights(strategy)
+        composite = self.components['appreciation_score'] * weights['appreciation_score']
+        for name in COMPONENT_COLUMNS[1:]:
+            composite = _add_weighted(composite, self.components[name], weights[name])
+
+        in_range = _value_in_range(self.current_value, min_home_value, max_home_value)
+        composite[~in_range] = np.nan
+
+        return ScoreHistory(
+            meta=self.meta,
+            dates=self.dates,
+            composite=composite,
+            current_value=self.current_value,
+            in_range=in_range,
+            components=self.components,
+            strategy=strategy
+        )
+
+    def series(self, region) -> pd.Series:
+        """Composite score history of one ZIP (empty if unknown)."""
+        row = self.panel.row(region)
+        if row is None:
+            return pd.Series(dtype=np.float64, name='composite_score')
+        return pd.Series(row, index=self.dates, name='composite_score')
+
+    def to_long(
+        self,
+        regions: Optional[List] = None,
+        start=None,
+        end=None,
+        id_columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Long (region, date, composite_score) frame; see SeriesPanel.to_long."""
+        return self.panel.to_long(
+            value_name='composite_score',
+            regions=regions,
+            start=start,
+            end=end,
+            id_columns=id_columns
+        )
+
+
+def score_history(
+    datasets: Optional[Dict[str, pd.DataFrame]] = None,
+    strategy: FlipStrategy = BALANCED,
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6,
+    min_home_value: float = 50000,
+    max_home_value: float = 500000,
+    start=None,
+    keep_components: bool = False
+) -> ScoreHistory:
+    """
+    Score every ZIP at every ZHVI month-end.
+
+    Month t uses ZHVI at t and t - appreciation_lookback, metro metrics
+    averaged over the metro_lookback months (4x as many weeks for
+    sale-to-list) ending at t, and bottom-tier values as of t. Each metric
+    is normalized across regions within the month. For the latest month
+    this reproduces flip_opportunity_score() (up to floating point
+    summation order) when all files end in the same month.
+
+    Args:
+        datasets: Dict of loaded datasets or LazyDataset handles (loads if None)
+        strategy: FlipStrategy defining weights
+        appreciation_lookback, metro_lookback, min_home_value, max_home_value:
+            As for flip_opportunity_score()
+        start: First month to score (default: all months)
+        keep_components: Also keep the component score and raw metric
+                         matrices (used by ScoreHistory.at and reweight);
+                         costs about ten more matrices of the same size
+
+    Returns:
+        ScoreHistory
+    """
+    if datasets is None:
+        datasets = load_all_datasets()
+    datasets = resolve_datasets(datasets, {})
+
+    zhvi = get_panel(datasets['zhvi_zip'])
+    cols = np.arange(zhvi.n_dates)
+    if start is not None:
+        cols = cols[zhvi.dates >= pd.Timestamp(start)]
+    dates = zhvi.dates[cols]
+
+    components: Dict[str, np.ndarray] = {}
+
+    # 1. Appreciation at every month
+    current = zhvi.values[:, cols]
+    prev_cols = cols - appreciation_lookback
+    previous = np.full(current.shape, np.nan)
+    has_prev = prev_cols >= 0
+    previous[:, has_prev] = zhvi.values[:, prev_cols[has_prev]]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        appreciation_pct = (current - previous) / previous * 100
+    appreciation_score = normalize_columns(appreciation_pct, higher_is_better=True)
+
+    in_range = _value_in_range(current, min_home_value, max_home_value)
+
+    weights = _strategy_weights(strategy)
+    composite = appreciation_score * weights['appreciation_score']
+    if keep_components:
+        components['appreciation_pct'] = appreciation_pct
+        components['appreciation_score'] = appreciation_score
+    del previous, appreciation_pct
+
+    def add_component(name: str, score: np.ndarray) -> None:
+        nonlocal composite
+        composite = _add_weighted(composite, score, weights[name])
+        if keep_components:
+            components[name] = score
+
+    # 2. Metro metrics, scored per metro then gathered to ZIPs
+    metro_specs = [
+        # dataset, metric column, score column, window columns, scale, higher is better
+        ('days_to_pending', 'days_to_pending', 'velocity_score', metro_lookback, 1, False),
+        ('price_cuts', 'price_cut_pct', 'distress_score', metro_lookback, 100, True),
+        ('sale_to_list', 'sale_to_list', 'pricing_power_score', metro_lookback * 4, 1, False),
+    ]
+    for name, metric_col, score_col, n_columns, scale, higher in metro_specs:
+        panel = get_panel(datasets[name])
+        metric = panel.rolling.means_asof(dates, n_columns) * scale
+        score = normalize_columns(metric, higher_is_better=higher)
+
+        positions = lookup_positions(zhvi.meta['metro'], panel.meta['region_name'])
+        add_component(score_col, _gather_rows(score, positions))
+        if keep_components:
+            components[metric_col] = _gather_rows(metric, positions)
+
+    # 3. County value gap: median ZHVI per county vs bottom tier as of each month
+    county_codes, counties = pd.factorize(zhvi.meta['county_name'])
+    has_county = county_codes >= 0
+    county_median = (
+        pd.DataFrame(current[has_county])
+        .groupby(county_codes[has_county])
+        .median()
+        .reindex(range(len(counties)))
+        .to_numpy()
+    )
+
+    bottom = get_panel(datasets['zhvi_bottom_tier'])
+    bottom_values = _gather_rows(
+        _values_asof(bottom, dates),
+        lookup_positions(pd.Series(counties), bottom.meta['region_name'])
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        county_gap = (county_median - bottom_values) / bottom_values * 100
+
+    value_gap_pct = _gather_rows(county_gap, np.where(has_county, county_codes, -1))
+
+    # As in compute_component_scores, the bounds count a ZIP once per
+    # matching metro and bottom-tier row: append the gaps of the other rows
+    metro_repeats = np.prod([
+        match_counts(zhvi.meta['metro'], get_panel(datasets[name]).meta['region_name'])
+        for name in METRO_DATASETS
+    ], axis=0)
+    extra = extra_match_counts(zhvi.meta['county_name'], bottom.meta['region_name'], metro_repeats)
+    extra_rows = np.flatnonzero(extra)
+    merged_gaps = value_gap_pct
+    if len(extra_rows):
+        extra_values = _values_asof(bottom, dates)[extra_rows]
+        extra_median = county_median[counties.get_indexer(bottom.meta['region_name'].iloc[extra_rows])]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            extra_gap = (extra_median - extra_values) / extra_values * 100
+        merged_gaps = np.vstack([value_gap_pct, np.repeat(extra_gap, extra[extra_rows], axis=0)])
+    value_gap_score = normalize_columns(merged_gaps, higher_is_better=True)[:zhvi.n_regions]
+    add_component('value_gap_score', value_gap_score)
+    if keep_components:
+        components['value_gap_pct'] = value_gap_pct
+
+    composite[~in_range] = np.nan
+
+    return ScoreHistory(
+        meta=zhvi.meta,
+        dates=dates,
+        composite=composite,
+        current_value=current,
+        in_range=in_range,
+        components=components,
+        strategy=strategy
+    )
@@ -0,0 +1,225 @@
+"""
+Score Store Module
+
+Component scores kept per version of the input data.
+
+The five component scores do not depend on strategy weights or on the home
+value range, so they only need computing once per data version. A
+ComponentStore holds that table (in memory and, with a cache_dir, on disk);
+composites for any strategy and price window are then a reweight and mask
+over it (see scoring_engine.apply_strategies).
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_cache import _atomic_write
+from .data_loader import load_all_datasets, resolve_datasets
+from .scoring_engine import (
+    BALANCED,
+    FlipStrategy,
+    apply_strategies,
+    compute_component_scores,
+    scoring_windows,
+)
+from .series_panel import get_panel
+
+
+# Bump when the component table layout or scoring steps change
+STORE_VERSION = 2
+
+
+def data_version(
+    datasets: Dict[str, pd.DataFrame],
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6
+) -> str:
+    """
+    Content hash of everything component scoring reads.
+
+    Covers each dataset's metadata and the date window scoring uses (see
+    scoring_windows), so new months or revised values give a new version
+    while older history does not matter.
+    """
+    windows = scoring_windows(appreciation_lookback, metro_lookback)
+    datasets = resolve_datasets(datasets, windows)
+
+    digest = hashlib.sha1(
+        f"{STORE_VERSION}:{appreciation_lookback}:{metro_lookback}".encode()
+    )
+    for name in sorted(windows):
+        panel = get_panel(datasets[name])
+        n = 0
+        if panel.n_dates:
+            periods = panel.dates.to_period('M')
+            n = int((periods > periods.max() - windows[name]).sum())
+
+        digest.update(name.encode())
+        digest.update('|'.join(panel.date_columns[panel.n_dates - n:]).encode())
+        digest.update(np.ascontiguousarray(panel.window(n)).tobytes())
+        digest.update(pd.util.hash_pandas_object(panel.meta, index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+
+def _store_prefix(appreciation_lookback: int, metro_lookback: int) -> str:
+    return f"components-a{appreciation_lookback}-m{metro_lookback}-"
+
+
+def _store_path(
+    cache_dir: Path,
+    version: str,
+    appreciation_lookback: int,
+    metro_lookback: int
+) -> Path:
+    """File a store is saved to inside cache_dir."""
+    prefix = _store_prefix(appreciation_lookback, metro_lookback)
+    return Path(cache_dir) / f"{prefix}{version[:16]}.pkl"
+
+
+class ComponentStore:
+    """
+    Component scores for every ZIP with a current value, for one data version.
+
+    Attributes:
+        components: compute_component_scores() table without a value filter
+        version: data_version() of the datasets it was built from
+        appreciation_lookback, metro_lookback: Lookbacks used
+    """
+
+    def __init__(
+        self,
+        components: pd.DataFrame,
+        version: str,
+        appreciation_lookback: int = 12,
+        metro_lookback: int = 6
+    ):
+        self.components = components
+        self.version = version
+        self.appreciation_lookback = appreciation_lookback
+        self.metro_lookback = metro_lookback
+
+    @classmethod
+    def build(
+        cls,
+        datasets: Dict[str, pd.DataFrame],
+        appreciation_lookback: int = 12,
+        metro_lookback: int = 6,
+        version: Optional[str] = None
+    ) -> 'ComponentStore':
+        """Compute the component table for a set of datasets."""
+        if version is None:
+            version = data_version(datasets, appreciation_lookback, metro_lookback)
+        components = compute_component_scores(
+            datasets,
+            appreciation_lookback=appreciation_lookback,
+            metro_lookback=metro_lookback,
+            min_home_value=None,
+            max_home_value=None
+        )
+        return cls(components, version, appreciation_lookback, metro_lookback)
+
+    def scores(
+        self,
+        strategy: FlipStrategy = BALANCED,
+        min_home_value: float = 50000,
+        max_home_value: float = 500000,
+        top_k: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Same result as flip_opportunity_score() for this data version."""
+        return apply_strategies(
+            self.components, [strategy], min_home_value, max_home_value,
+            long_format=True, top_k=top_k
+        )
+
+    def score_strategies(
+        self,
+        strategies: Optional[List[FlipStrategy]] = None,
+        min_home_value: float = 50000,
+        max_home_value: float = 500000,
+        long_format: bool = False,
+        top_k: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Same result as scoring_engine.score_strategies() for this data version."""
+        return apply_strategies(
+            self.components, strategies, min_home_value, max_home_value, long_format, top_k
+        )
+
+    # ----- Persistence -----
+
+    def save(self, cache_dir: Path) -> bool:
+        """
+        Write the store to cache_dir, replacing stores of older data versions.
+
+        Returns False if the cache directory is not writable.
+        """
+        target = _store_path(cache_dir, self.version, self.appreciation_lookback, self.metro_lookback)
+        prefix = _store_prefix(self.appreciation_lookback, self.metro_lookback)
+        try:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            _atomic_write(target, lambda tmp: pd.to_pickle(self, tmp))
+            for old in Path(cache_dir).glob(f"{prefix}*.pkl"):
+                if old != target:
+                    old.unlink()
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def load(
+        cls,
+        cache_dir: Path,
+        version: str,
+        appreciation_lookback: int = 12,
+        metro_lookback: int = 6
+    ) -> Optional['ComponentStore']:
+        """Load the saved store for a data version, or None if there is none."""
+        path = _store_path(cache_dir, version, appreciation_lookback, metro_lookback)
+        try:
+            store = pd.read_pickle(path)
+        except (OSError, ValueError, AttributeError):
+            return None
+        return store if isinstance(store, cls) and store.version == version else None
+
+
+# Stores already built or loaded in this process, by (version, lookbacks)
+_STORES: Dict[tuple, ComponentStore] = {}
+
+
+def get_component_store(
+    datasets: Optional[Dict[str, pd.DataFrame]] = None,
+    cache_dir: Optional[Path] = None,
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6
+) -> ComponentStore:
+    """
+    Get the ComponentStore for the current data, building it only if needed.
+
+    Looks in this process first, then in cache_dir (if given), and otherwise
+    computes the component table and saves it to cache_dir.
+    """
+    if datasets is None:
+        datasets = load_all_datasets()
+
+    version = data_version(datasets, appreciation_lookback, metro_lookback)
+    key = (version, appreciation_lookback, metro_lookback)
+    if key in _STORES:
+        return _STORES[key]
+
+    store = None
+    if cache_dir is not None:
+        store = ComponentStore.load(cache_dir, version, appreciation_lookback, metro_lookback)
+    if store is None:
+        store = ComponentStore.build(datasets, appreciation_lookback, metro_lookback, version)
+        if cache_dir is not None:
+            store.save(cache_dir)
+
+    # Keep one store per lookback pair; older data versions are not reused
+    for old in [k for k in _STORES if k[1:] == key[1:]]:
+        del _STORES[old]
+    _STORES[key] = store
+    return store
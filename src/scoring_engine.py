@@ -10,11 +10,13 @@ from typing import Dict, Optional, Tuple, List
 from pathlib import Path
 from dataclasses import dataclass
 
-from .data_loader import (
-    load_all_datasets,
-    get_date_columns,
-    get_metadata_columns,
-)
+from .data_loader import load_all_datasets, resolve_datasets
+from .filter_index import get_filter_index
+from .geo_cube import get_geo_cube
+from .normalization import normalize_columns, normalize_to_score
+from .profiling import PipelineProfile, profile_stage
+from .region_index import get_region_index
+from .series_panel import get_panel
 
 
 @dataclass
@@ -63,47 +65,8 @@ BALANCED = FlipStrategy(
     value_gap_weight=0.20
 )
 
-
-def normalize_to_score(
-    values: pd.Series,
-    higher_is_better: bool = True,
-    clip_percentile: float = 5.0
-) -> pd.Series:
-    """
-    Normalize values to 0-100 scale using percentile-based normalization.
-
-    Args:
-        values: Series of values to normalize
-        higher_is_better: If True, higher values get higher scores
-        clip_percentile: Clip extreme values at this percentile
-
-    Returns:
-        Series with scores 0-100
-    """
-    # Handle missing values
-    valid_mask = values.notna()
-    if valid_mask.sum() == 0:
-        return pd.Series(np.nan, index=values.index)
-
-    # Clip extreme values
-    lower = np.nanpercentile(values, clip_percentile)
-    upper = np.nanpercentile(values, 100 - clip_percentile)
-    clipped = values.clip(lower=lower, upper=upper)
-
-    # Min-max normalization
-    min_val = clipped.min()
-    max_val = clipped.max()
-
-    if max_val == min_val:
-        return pd.Series(50.0, index=values.index)
-
-    normalized = (clipped - min_val) / (max_val - min_val) * 100
-
-    # Invert if lower is better
-    if not higher_is_better:
-        normalized = 100 - normalized
-
-    return normalized
+# Strategies offered in the dashboard and exported by the scoring notebook
+STRATEGIES = [FAST_FLIP, VALUE_ADD_FLIP, BALANCED]
 
 
 def calculate_price_appreciation(
@@ -118,19 +81,15 @@ def calculate_price_appreciation(
     - appreciation_pct: % change over lookback period
     - appreciation_score: Normalized 0-100 score
     """
-    date_cols = get_date_columns(df_zhvi)
-    meta_cols = get_metadata_columns(df_zhvi)
+    panel = get_panel(df_zhvi)
 
-    if len(date_cols) < lookback_months + 1:
-        lookback_months = len(date_cols) - 1
+    if panel.n_dates < lookback_months + 1:
+        lookback_months = panel.n_dates - 1
 
     # Get latest and lookback values
-    latest_col = date_cols[-1]
-    lookback_col = date_cols[-(lookback_months + 1)]
-
-    result = df_zhvi[meta_cols].copy()
-    result['current_value'] = df_zhvi[latest_col]
-    result['previous_value'] = df_zhvi[lookback_col]
+    result = panel.meta.copy()
+    result['current_value'] = panel.latest()
+    result['previous_value'] = panel.column(-(lookback_months + 1))
 
     # Calculate appreciation
     result['appreciation_pct'] = (
@@ -154,6 +113,11 @@ def get_metro_metrics(
     """
     Extract latest metro-level market metrics.
 
+    Means are taken over the latest window only (SeriesPanel.window_mean),
+    matching DataFrame.mean over the same columns bit for bit. Means at
+    past dates (backfills) come from each panel's RollingWindow instead
+    (see score_history).
+
     Returns DataFrame indexed by metro name with:
     - days_to_pending: Average days to go under contract
     - price_cut_pct: Percentage of listings with price cuts
@@ -163,43 +127,31 @@ def get_metro_metrics(
     result_dfs = []
 
     # Days to Pending (lower is better for flippers - faster sales)
-    df = datasets['days_to_pending']
-    date_cols = get_date_columns(df)
-    recent_cols = date_cols[-lookback_months:] if len(date_cols) >= lookback_months else date_cols
-
-    dtp = df[['region_name']].copy()
-    dtp['days_to_pending'] = df[recent_cols].mean(axis=1)
+    panel = get_panel(datasets['days_to_pending'])
+    dtp = panel.meta[['region_name']].copy()
+    dtp['days_to_pending'] = panel.window_mean(lookback_months)
     dtp = dtp.rename(columns={'region_name': 'metro'})
     result_dfs.append(dtp)
 
     # Price Cuts (higher = more distress = better for buyers)
-    df = datasets['price_cuts']
-    date_cols = get_date_columns(df)
-    recent_cols = date_cols[-lookback_months:] if len(date_cols) >= lookback_months else date_cols
-
-    pc = df[['region_name']].copy()
-    pc['price_cut_pct'] = df[recent_cols].mean(axis=1) * 100  # Convert to percentage
+    panel = get_panel(datasets['price_cuts'])
+    pc = panel.meta[['region_name']].copy()
+    pc['price_cut_pct'] = panel.window_mean(lookback_months) * 100  # Convert to percentage
     pc = pc.rename(columns={'region_name': 'metro'})
     result_dfs.append(pc)
 
     # Sale to List (lower = better for buyers)
-    df = datasets['sale_to_list']
-    date_cols = get_date_columns(df)
+    panel = get_panel(datasets['sale_to_list'])
     # Sale to list is weekly, so use more recent data
-    recent_cols = date_cols[-lookback_months*4:] if len(date_cols) >= lookback_months*4 else date_cols
-
-    stl = df[['region_name']].copy()
-    stl['sale_to_list'] = df[recent_cols].mean(axis=1)
+    stl = panel.meta[['region_name']].copy()
+    stl['sale_to_list'] = panel.window_mean(lookback_months * 4)
     stl = stl.rename(columns={'region_name': 'metro'})
     result_dfs.append(stl)
 
     # Market Heat (moderate is best - too hot = expensive, too cold = slow)
-    df = datasets['market_heat']
-    date_cols = get_date_columns(df)
-    recent_cols = date_cols[-lookback_months:] if len(date_cols) >= lookback_months else date_cols
-
-    mh = df[['region_name']].copy()
-    mh['market_heat'] = df[recent_cols].mean(axis=1)
+    panel = get_panel(datasets['market_heat'])
+    mh = panel.meta[['region_name']].copy()
+    mh['market_heat'] = panel.window_mean(lookback_months)
     mh = mh.rename(columns={'region_name': 'metro'})
     result_dfs.append(mh)
 
@@ -221,19 +173,17 @@ def calculate_value_tier_gap(
     Larger gap = more room for value-add improvement.
     Uses county-level comparison since bottom tier is at county level.
     """
-    date_cols_zhvi = get_date_columns(df_zhvi)
-    date_cols_bt = get_date_columns(df_bottom_tier)
-
-    # Get latest values
-    latest_zhvi = date_cols_zhvi[-1]
-    latest_bt = date_cols_bt[-1]
+    zhvi = get_panel(df_zhvi)
+    bt = get_panel(df_bottom_tier)
 
-    # Aggregate ZHVI to county level
-    county_zhvi = df_zhvi.groupby('county_name')[latest_zhvi].median().reset_index()
+    # Aggregate latest ZHVI to county level
+    latest_zhvi = pd.Series(zhvi.latest(), index=zhvi.meta.index)
+    county_zhvi = latest_zhvi.groupby(zhvi.meta['county_name'], observed=True).median().reset_index()
     county_zhvi.columns = ['county_name', 'median_all_homes']
 
-    # Get bottom tier by county
-    bottom_tier = df_bottom_tier[['region_name', latest_bt]].copy()
+    # Get latest bottom tier by county
+    bottom_tier = bt.meta[['region_name']].copy()
+    bottom_tier['bottom_tier_value'] = bt.latest()
     bottom_tier.columns = ['county_name', 'bottom_tier_value']
     # Clean county name format (remove " County" suffix for matching)
 
@@ -276,24 +226,431 @@ def score_metros(metro_metrics: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+def lookup_positions(keys: pd.Series, table_keys: pd.Series) -> np.ndarray:
+    """
+    Row position in a lookup table for each key (first match, -1 if none).
+
+    Keys are factorized into integer codes first, so only the distinct
+    values (a few hundred metros or counties) are hashed against the
+    table; every row then resolves with an array gather. Missing keys match
+    a missing table key, as a merge would.
+    """
+    codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+    table = pd.Index(table_keys)
+    first = ~table.duplicated()
+    found = table[first].get_indexer(uniques)
+    unique_positions = np.where(found >= 0, np.flatnonzero(first)[found], -1)
+    return unique_positions[codes]
+
+
+def match_counts(keys: pd.Series, table_keys: pd.Series) -> np.ndarray:
+    """
+    Rows a left merge would produce for each key (table matches, at least 1).
+
+    Missing keys match missing table keys, as in lookup_positions().
+    """
+    codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+    counts = pd.Index(table_keys).value_counts(dropna=False)
+    unique_counts = counts.reindex(uniques).fillna(0).to_numpy(dtype=np.int64)
+    return np.maximum(unique_counts, 1)[codes]
+
+
+def extra_match_counts(
+    keys: pd.Series,
+    table_keys: pd.Series,
+    key_repeats: np.ndarray
+) -> np.ndarray:
+    """
+    Copies of each table row a left merge adds beyond the first matches.
+
+    Merging keys (each already repeated key_repeats times by an earlier
+    merge) gives every matching table row once per repeat. Gathering by
+    lookup_positions() keeps one copy of the first match per key; this is
+    how many more copies of each table row the merge would hold.
+    """
+    codes, uniques = pd.factorize(keys, use_na_sentinel=False)
+    table_codes = pd.Index(uniques).get_indexer(table_keys)
+    repeats_per_key = np.bincount(codes, weights=key_repeats, minlength=len(uniques)).astype(np.int64)
+    keys_per_key = np.bincount(codes, minlength=len(uniques))
+
+    matched = table_codes >= 0
+    counts = np.zeros(len(table_codes), dtype=np.int64)
+    counts[matched] = repeats_per_key[table_codes[matched]]
+    first = matched & ~pd.Index(table_keys).duplicated()
+    counts[first] -= keys_per_key[table_codes[first]]
+    return counts
+
+
+def gather(column: pd.Series, positions: np.ndarray) -> np.ndarray:
+    """Values of a numeric table column at positions (NaN where -1)."""
+    # Trailing NaN makes position -1 a missing value
+    values = np.append(column.to_numpy(dtype=np.float64), np.nan)
+    return values[positions]
+
+
+def top_k_positions(values: np.ndarray, k: int, ascending: bool = False) -> np.ndarray:
+    """
+    Positions of the k best values, best first, without sorting them all.
+
+    Gives exactly argsort(kind='stable')[:k] of the (negated, unless
+    ascending) values: equal values keep their original order and missing
+    values come last. np.partition finds the k-th best value in linear
+    time; only the rows at or above it are then sorted.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    key = values if ascending else -values
+    if k >= len(key):
+        return np.argsort(key, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    kth = np.partition(key, k - 1)[k - 1]
+    if np.isnan(kth):
+        # Fewer than k non-missing values: all of them, then the first NaNs
+        missing = np.isnan(key)
+        chosen = np.concatenate([
+            np.flatnonzero(~missing),
+            np.flatnonzero(missing)[:k - int((~missing).sum())]
+        ])
+    else:
+        # Ties with the k-th value are taken in original order
+        better = np.flatnonzero(key < kth)
+        ties = np.flatnonzero(key == kth)[:k - len(better)]
+        chosen = np.sort(np.concatenate([better, ties]))
+
+    return chosen[np.argsort(key[chosen], kind='stable')]
+
+
+def top_k_rows(
+    df: pd.DataFrame,
+    column: str,
+    k: int,
+    ascending: bool = False
+) -> pd.DataFrame:
+    """The k rows of df with the highest (or lowest) column values, sorted."""
+    return df.iloc[top_k_positions(df[column].to_numpy(dtype=np.float64), k, ascending)]
+
+
+def scoring_windows(
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6
+) -> Dict[str, int]:
+    """Months of history flip_opportunity_score() reads from each dataset."""
+    return {
+        'zhvi_zip': appreciation_lookback + 1,
+        'zhvi_bottom_tier': 1,
+        'market_heat': metro_lookback,
+        'days_to_pending': metro_lookback,
+        'price_cuts': metro_lookback,
+        # Weekly: lookback * 4 weeks span 28 * lookback - 21 days, which the
+        # current month plus lookback whole earlier months always cover
+        'sale_to_list': metro_lookback + 1,
+    }
+
+
+# Metro-level datasets, outer-merged by metro name in get_metro_metrics()
+METRO_DATASETS = ['days_to_pending', 'price_cuts', 'sale_to_list', 'market_heat']
+
+# Component score columns, in FlipStrategy weight order
+COMPONENT_COLUMNS = [
+    'appreciation_score', 'velocity_score', 'distress_score',
+    'pricing_power_score', 'value_gap_score'
+]
+
+# Output columns of flip_opportunity_score (those that exist are kept)
+SCORE_COLUMNS = [
+    'region_id', 'region_name', 'state', 'city', 'metro', 'county_name',
+    'current_value', 'appreciation_pct',
+    'appreciation_score', 'velocity_score', 'distress_score',
+    'pricing_power_score', 'value_gap_score', 'composite_score',
+    'days_to_pending', 'price_cut_pct', 'sale_to_list', 'value_gap_pct',
+    'strategy'
+]
+
+
+def strategy_weights(strategies: List[FlipStrategy]) -> np.ndarray:
+    """Weight matrix (5 components x N strategies) in COMPONENT_COLUMNS order."""
+    return np.array([
+        [s.appreciation_weight, s.velocity_weight, s.distress_weight,
+         s.pricing_power_weight, s.value_gap_weight]
+        for s in strategies
+    ], dtype=np.float64).T
+
+
+def strategy_column(strategy: FlipStrategy) -> str:
+    """Wide-format composite column name, e.g. 'composite_fast_flip'."""
+    return 'composite_' + strategy.name.lower().replace(' ', '_').replace('-', '_')
+
+
+def compute_component_scores(
+    datasets: Optional[Dict[str, pd.DataFrame]] = None,
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6,
+    min_home_value: Optional[float] = 50000,
+    max_home_value: Optional[float] = 500000,
+    profile: Optional[PipelineProfile] = None
+) -> pd.DataFrame:
+    """
+    Calculate the five component scores (strategy independent) for all ZIPs.
+
+    Runs the appreciation, metro and value gap steps of
+    flip_opportunity_score() and returns one row per ZIP inside the value
+    range, in data order, with every SCORE_COLUMNS column except
+    composite_score and strategy. Pass None for either bound to keep all
+    ZIPs with a current value on that side. A profile, if given, records
+    each step (see src.profiling).
+    """
+    with profile_stage(profile, 'load'):
+        if datasets is None:
+            datasets = load_all_datasets()
+        datasets = resolve_datasets(datasets, scoring_windows(appreciation_lookback, metro_lookback))
+
+    # 1. Calculate ZIP-level appreciation
+    with profile_stage(profile, 'appreciation'):
+        appreciation = calculate_price_appreciation(
+            datasets['zhvi_zip'],
+            lookback_months=appreciation_lookback
+        )
+
+    # 2. Get metro-level metrics and scores
+    with profile_stage(profile, 'metro_metrics'):
+        metro_metrics = get_metro_metrics(datasets, lookback_months=metro_lookback)
+    with profile_stage(profile, 'normalization'):
+        metro_scores = score_metros(metro_metrics)
+
+    # 3. Calculate value tier gap by county
+    with profile_stage(profile, 'value_gap'):
+        value_gap = calculate_value_tier_gap(
+            datasets['zhvi_zip'],
+            datasets['zhvi_bottom_tier']
+        )
+
+    # 4. Build result dataframe starting with appreciation (one row per ZIP)
+    result = appreciation
+
+    # 5. Attach metro scores by position
+    with profile_stage(profile, 'joins'):
+        metro_cols = ['velocity_score', 'distress_score', 'pricing_power_score',
+                      'days_to_pending', 'price_cut_pct', 'sale_to_list']
+        positions = lookup_positions(result['metro'], metro_scores['metro'])
+        for col in metro_cols:
+            result[col] = gather(metro_scores[col], positions)
+
+        # 6. Attach value gap by position
+        positions = lookup_positions(result['county_name'], value_gap['county_name'])
+        result['value_gap_pct'] = gather(value_gap['value_gap_pct'], positions)
+
+    # 7. Normalize value gap to score. Merging repeated a ZIP once per
+    # matching metro and county row (counties share names across states)
+    # until duplicates were dropped after scoring, so the clip percentiles
+    # count each ZIP that many times.
+    with profile_stage(profile, 'normalization'):
+        extra = extra_match_counts(
+            result['county_name'],
+            value_gap['county_name'],
+            match_counts(result['metro'], metro_scores['metro'])
+        )
+        merged_gaps = np.concatenate([
+            result['value_gap_pct'].to_numpy(),
+            np.repeat(value_gap['value_gap_pct'].to_numpy(dtype=np.float64), extra)
+        ])
+        value_gap_score = normalize_to_score(pd.Series(merged_gaps), higher_is_better=True)
+        result['value_gap_score'] = value_gap_score.to_numpy()[:len(result)]
+
+    # 8. Apply value filter
+    with profile_stage(profile, 'filtering'):
+        mask = result['current_value'].notna()
+        if min_home_value is not None:
+            mask &= result['current_value'] >= min_home_value
+        if max_home_value is not None:
+            mask &= result['current_value'] <= max_home_value
+        result = result[mask]
+
+    # 9. Remove duplicate ZIPs (only if the source file repeats a region)
+    with profile_stage(profile, 'dedupe'):
+        if not result['region_id'].is_unique:
+            result = result.drop_duplicates(subset=['region_id'], keep='first')
+
+    component_cols = [c for c in SCORE_COLUMNS
+                      if c in result.columns and c not in ('composite_score', 'strategy')]
+    return result[component_cols].reset_index(drop=True)
+
+
+def composite_scores(
+    components: pd.DataFrame,
+    strategies: List[FlipStrategy]
+) -> np.ndarray:
+    """
+    Composite scores of every row for every strategy in one pass.
+
+    Missing metro/value gap scores count as neutral (50); a missing
+    appreciation score leaves the composite missing. Weighted components
+    are added one at a time, in COMPONENT_COLUMNS order, for all strategies
+    at once: the same rounding as the original column-by-column sum (a
+    matrix multiply reorders the additions and moves the last bits).
+
+    Returns:
+        (n_rows, n_strategies) array
+    """
+    scores = components[COMPONENT_COLUMNS].to_numpy(dtype=np.float64)
+    scores[:, 1:] = np.where(np.isnan(scores[:, 1:]), 50.0, scores[:, 1:])
+    weights = strategy_weights(strategies)
+
+    composites = scores[:, :1] * weights[:1]
+    weighted = np.empty_like(composites)
+    for i in range(1, len(COMPONENT_COLUMNS)):
+        np.multiply(scores[:, i:i + 1], weights[i:i + 1], out=weighted)
+        composites += weighted
+    return composites
+
+
+def score_strategies(
+    datasets: Optional[Dict[str, pd.DataFrame]] = None,
+    strategies: Optional[List[FlipStrategy]] = None,
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6,
+    min_home_value: float = 50000,
+    max_home_value: float = 500000,
+    long_format: bool = False,
+    top_k: Optional[int] = None,
+    profile: Optional[PipelineProfile] = None
+) -> pd.DataFrame:
+    """
+    Score all ZIPs under several strategies in one pass.
+
+    Component scores are computed once; each strategy is then a column of
+    the weight matrix, so hundreds of custom strategies cost little more
+    than one.
+
+    Args:
+        datasets: Dict of loaded datasets or LazyDataset handles (loads if None)
+        strategies: Strategies to apply (defaults to STRATEGIES)
+        appreciation_lookback, metro_lookback, min_home_value, max_home_value:
+            As for flip_opportunity_score()
+        long_format: Return one row per (ZIP, strategy) instead of one
+                     composite column per strategy
+        top_k: Keep only the k best ZIPs per strategy (see apply_strategies)
+        profile: PipelineProfile to record each step in (off if None)
+
+    Returns:
+        Wide: component table (data order) plus a composite column per
+        strategy, named by strategy_column().
+        Long: flip_opportunity_score() output for each strategy stacked in
+        the given order, each block sorted by composite_score.
+    """
+    components = compute_component_scores(
+        datasets,
+        appreciation_lookback=appreciation_lookback,
+        metro_lookback=metro_lookback,
+        min_home_value=min_home_value,
+        max_home_value=max_home_value,
+        profile=profile
+    )
+    return apply_strategies(
+        components, strategies, long_format=long_format, top_k=top_k, profile=profile
+    )
+
+
+def apply_strategies(
+    components: pd.DataFrame,
+    strategies: Optional[List[FlipStrategy]] = None,
+    min_home_value: Optional[float] = None,
+    max_home_value: Optional[float] = None,
+    long_format: bool = False,
+    top_k: Optional[int] = None,
+    profile: Optional[PipelineProfile] = None
+) -> pd.DataFrame:
+    """
+    Turn a component table into strategy scores: value mask plus reweight.
+
+    Component scores do not depend on the value range (normalization happens
+    before the value filter), so a table computed over all ZIPs can be
+    narrowed here to any min/max home value.
+
+    Args:
+        components: Output of compute_component_scores()
+        strategies: Strategies to apply (defaults to STRATEGIES)
+        min_home_value, max_home_value: Optional value range to keep
+        long_format: See score_strategies()
+        top_k: Keep only the k highest composites per strategy. Long output
+               then has k rows per strategy; wide output keeps every row in
+               any strategy's top k, in data order. Only those rows are
+               sorted.
+        profile: PipelineProfile to record the filtering, composite, sort
+                 and output steps in (off if None)
+    """
+    strategies = list(strategies) if strategies is not None else list(STRATEGIES)
+
+    if min_home_value is not None or max_home_value is not None:
+        with profile_stage(profile, 'filtering'):
+            values = components['current_value'].to_numpy()
+            mask = np.ones(len(components), dtype=bool)
+            if min_home_value is not None:
+                mask &= values >= min_home_value
+            if max_home_value is not None:
+                mask &= values <= max_home_value
+            components = components[mask].reset_index(drop=True)
+
+    with profile_stage(profile, 'composite'):
+        composites = composite_scores(components, strategies)
+
+    # Descending per strategy, missing last (as sort_values does)
+    with profile_stage(profile, 'sort'):
+        k = len(components) if top_k is None else top_k
+        order = np.column_stack([
+            top_k_positions(composites[:, j], k) for j in range(len(strategies))
+        ])
+
+    with profile_stage(profile, 'output'):
+        if not long_format:
+            if top_k is not None:
+                keep = np.unique(order)
+                components = components.take(keep).reset_index(drop=True)
+                composites = composites[keep]
+            composite_df = pd.DataFrame(
+                composites,
+                columns=[strategy_column(s) for s in strategies],
+                index=components.index
+            )
+            return pd.concat([components, composite_df], axis=1)
+
+        rows = order.T.ravel()
+        result = components.take(rows).reset_index(drop=True)
+        result['composite_score'] = np.take_along_axis(composites, order, axis=0).T.ravel()
+        result['strategy'] = np.repeat([s.name for s in strategies], len(order))
+
+        output_cols = [c for c in SCORE_COLUMNS if c in result.columns]
+        return result[output_cols]
+
+
 def flip_opportunity_score(
     datasets: Optional[Dict[str, pd.DataFrame]] = None,
     strategy: FlipStrategy = BALANCED,
     appreciation_lookback: int = 12,
     metro_lookback: int = 6,
     min_home_value: float = 50000,
-    max_home_value: float = 500000
+    max_home_value: float = 500000,
+    top_k: Optional[int] = None,
+    profile: Optional[PipelineProfile] = None
 ) -> pd.DataFrame:
     """
     Calculate flip opportunity scores for all ZIPs.
 
     Args:
-        datasets: Dict of loaded datasets (loads if None)
+        datasets: Dict of loaded datasets (loads if None). Values may be
+                  LazyDataset handles, in which case only the date window
+                  each metric needs is loaded.
         strategy: FlipStrategy defining weights
         appreciation_lookback: Months to look back for appreciation
         metro_lookback: Months to look back for metro metrics
         min_home_value: Filter out ZIPs below this value
         max_home_value: Filter out ZIPs above this value
+        top_k: Return only the k highest-scoring ZIPs (found without
+               sorting the rest)
+        profile: Optional PipelineProfile; records wall/CPU time and memory
+                 of each step (load, appreciation, metro_metrics, value_gap,
+                 joins, normalization, filtering, dedupe, composite, sort,
+                 output)
 
     Returns:
         DataFrame with columns:
@@ -307,101 +664,27 @@ def flip_opportunity_score(
         - composite_score: Weighted average 0-100
         - strategy: Strategy name used
     """
-    if datasets is None:
-        datasets = load_all_datasets()
-
-    # 1. Calculate ZIP-level appreciation
-    appreciation = calculate_price_appreciation(
-        datasets['zhvi_zip'],
-        lookback_months=appreciation_lookback
-    )
-
-    # 2. Get metro-level metrics and scores
-    metro_metrics = get_metro_metrics(datasets, lookback_months=metro_lookback)
-    metro_scores = score_metros(metro_metrics)
-
-    # 3. Calculate value tier gap by county
-    value_gap = calculate_value_tier_gap(
-        datasets['zhvi_zip'],
-        datasets['zhvi_bottom_tier']
-    )
-
-    # 4. Build result dataframe starting with appreciation
-    result = appreciation.copy()
-
-    # 5. Join metro scores
-    result = result.merge(
-        metro_scores[['metro', 'velocity_score', 'distress_score', 'pricing_power_score',
-                     'days_to_pending', 'price_cut_pct', 'sale_to_list']],
-        on='metro',
-        how='left'
-    )
-
-    # 6. Join value gap
-    result = result.merge(
-        value_gap,
-        on='county_name',
-        how='left'
-    )
-
-    # 7. Normalize value gap to score
-    result['value_gap_score'] = normalize_to_score(
-        result['value_gap_pct'],
-        higher_is_better=True
-    )
-
-    # 8. Apply value filter
-    mask = (
-        (result['current_value'] >= min_home_value) &
-        (result['current_value'] <= max_home_value) &
-        (result['current_value'].notna())
+    return score_strategies(
+        datasets,
+        strategies=[strategy],
+        appreciation_lookback=appreciation_lookback,
+        metro_lookback=metro_lookback,
+        min_home_value=min_home_value,
+        max_home_value=max_home_value,
+        long_format=True,
+        top_k=top_k,
+        profile=profile
     )
-    result = result[mask].copy()
-
-    # 9. Calculate composite score
-    result['composite_score'] = (
-        result['appreciation_score'] * strategy.appreciation_weight +
-        result['velocity_score'].fillna(50) * strategy.velocity_weight +
-        result['distress_score'].fillna(50) * strategy.distress_weight +
-        result['pricing_power_score'].fillna(50) * strategy.pricing_power_weight +
-        result['value_gap_score'].fillna(50) * strategy.value_gap_weight
-    )
-
-    # 10. Add strategy info
-    result['strategy'] = strategy.name
-
-    # 11. Remove duplicates (can occur from merge)
-    result = result.drop_duplicates(subset=['region_id'], keep='first')
-
-    # 12. Sort by composite score
-    result = result.sort_values('composite_score', ascending=False)
-
-    # 13. Clean up columns
-    output_cols = [
-        'region_id', 'region_name', 'state', 'city', 'metro', 'county_name',
-        'current_value', 'appreciation_pct',
-        'appreciation_score', 'velocity_score', 'distress_score',
-        'pricing_power_score', 'value_gap_score', 'composite_score',
-        'days_to_pending', 'price_cut_pct', 'sale_to_list', 'value_gap_pct',
-        'strategy'
-    ]
-
-    # Only include columns that exist
-    output_cols = [c for c in output_cols if c in result.columns]
-
-    return result[output_cols].reset_index(drop=True)
 
 
 def get_score_breakdown(score_df: pd.DataFrame, zip_code: str) -> Dict:
     """
     Get detailed score breakdown for a specific ZIP.
     """
-    row = score_df[score_df['region_name'] == zip_code]
-    if len(row) == 0:
+    row = get_region_index(score_df).row(zip_code)
+    if row is None:
         return {"error": f"ZIP {zip_code} not found"}
 
-    row = row.iloc[0]
-
     return {
         'zip_code': zip_code,
         'city': row.get('city', 'N/A'),
@@ -441,31 +724,32 @@ def filter_opportunities(
     metros: Optional[List[str]] = None,
     min_appreciation: float = None,
     max_days_to_pending: float = None,
-    min_price_cuts: float = None
+    min_price_cuts: float = None,
+    top_k: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Filter opportunities based on criteria.
-    """
-    result = score_df.copy()
 
-    # Score filter
-    result = result[result['composite_score'] >= min_score]
-
-    # Geographic filters
-    if states:
-        result = result[result['state'].isin(states)]
-    if metros:
-        result = result[result['metro'].isin(metros)]
+    Criteria are answered from the table's FilterIndex (bitmaps for
+    state/metro, sorted arrays for the thresholds), built on the first call
+    and reused while the table is unchanged; matching rows are copied once.
+    With top_k, only the k highest composite scores among the matches are
+    returned, sorted descending.
+    """
+    positions = get_filter_index(score_df).positions(
+        min_score=min_score,
+        states=states,
+        metros=metros,
+        min_appreciation=min_appreciation,
+        max_days_to_pending=max_days_to_pending,
+        min_price_cuts=min_price_cuts
+    )
 
-    # Metric filters
-    if min_appreciation is not None:
-        result = result[result['appreciation_pct'] >= min_appreciation]
-    if max_days_to_pending is not None:
-        result = result[result['days_to_pending'] <= max_days_to_pending]
-    if min_price_cuts is not None:
-        result = result[result['price_cut_pct'] >= min_price_cuts]
+    if top_k is not None:
+        scores = score_df['composite_score'].to_numpy(dtype=np.float64)[positions]
+        positions = positions[top_k_positions(scores, top_k)]
 
-    return result
+    return score_df.take(positions)
 
 
 def summarize_by_geography(
@@ -475,6 +759,10 @@ def summarize_by_geography(
     """
     Summarize opportunities by geographic level.
 
+    Built from the table's GeoCube (cached per table), so further levels or
+    drill-downs (GeoCube.summarize with states/metros) combine the same
+    cell partials instead of regrouping the ZIP rows.
+
     Args:
         score_df: Scored opportunities DataFrame
         level: 'state', 'metro', or 'county'
@@ -482,22 +770,7 @@ def summarize_by_geography(
     Returns:
         Summary DataFrame with counts and average scores by geography
     """
-    group_col = {
-        'state': 'state',
-        'metro': 'metro',
-        'county': 'county_name'
-    }.get(level, 'state')
-
-    summary = score_df.groupby(group_col).agg({
-        'composite_score': ['count', 'mean', 'max'],
-        'current_value': 'median',
-        'appreciation_pct': 'mean'
-    }).round(2)
-
-    summary.columns = ['num_opportunities', 'avg_score', 'max_score',
-                       'median_value', 'avg_appreciation']
-
-    return summary.sort_values('avg_score', ascending=False)
+    return get_geo_cube(score_df).summarize(level)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""
+Seasonality Module
+
+Month-of-year profiles for every region of a value matrix at once.
+
+A profile is the mean value of each calendar month over a region's history.
+Columns are grouped by month and reduced with one np.add.reduceat per
+chunk of rows, so every ZIP's profile costs a few array passes instead of
+a Python loop over dates.
+
+Raw profiles mix trend into seasonality: in a rising market later months
+average higher. The detrended mode divides each value by its centered
+moving average (ratio-to-moving-average, the classical decomposition)
+before averaging, so a profile of 1.03 means the month runs 3% above trend.
+STL is not used; it needs statsmodels and a per-series fit.
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SeasonalProfile:
+    """
+    Calendar-month profiles of many regions.
+
+    Attributes:
+        months: Calendar months (1-12) of the profile columns, in order of
+                first appearance in the dates
+        profiles: (n_regions, len(months)) mean value per month (mean
+                  ratio to trend if detrended); NaN for months without data
+        detrended: Whether profiles are ratios to a moving average
+    """
+    months: np.ndarray
+    profiles: np.ndarray
+    detrended: bool = False
+
+    def _extremes(self):
+        has_months = ~np.isnan(self.profiles).all(axis=1)
+        high = np.where(np.isnan(self.profiles), -np.inf, self.profiles)
+        low = np.where(np.isnan(self.profiles), np.inf, self.profiles)
+        # argmax/argmin return the first extreme, in month order of appearance
+        return has_months, high, low, high.argmax(axis=1), low.argmin(axis=1)
+
+    def peaks_and_troughs(self, threshold: float = 1.05) -> Dict[str, np.ndarray]:
+        """
+        Peak and trough month of every region.
+
+        Args:
+            threshold: Peak / trough ratio above which seasonality counts
+                       as detected
+
+        Returns:
+            Dict of arrays: 'peak_month' and 'trough_month' (NaN without
+            data), 'strength' (peak / trough ratio) and 'detected'
+        """
+        has_months, high, low, peak, trough = self._extremes()
+        rows = np.arange(len(peak))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            strength = np.where(has_months, high[rows, peak] / low[rows, trough], np.nan)
+        return {
+            'peak_month': np.where(has_months, self.months[peak], np.nan),
+            'trough_month': np.where(has_months, self.months[trough], np.nan),
+            'strength': strength,
+            'detected': has_months & (strength > threshold),
+        }
+
+    def to_frame(self, index=None, threshold: float = 1.05) -> pd.DataFrame:
+        """
+        One row per region: peak_month, trough_month, seasonal_strength,
+        seasonality_detected, then the profile by calendar month (1-12).
+        """
+        summary = self.peaks_and_troughs(threshold)
+        frame = pd.DataFrame({
+            'peak_month': pd.array(summary['peak_month'], dtype='Int64'),
+            'trough_month': pd.array(summary['trough_month'], dtype='Int64'),
+            'seasonal_strength': summary['strength'],
+            'seasonality_detected': summary['detected'],
+        }, index=index)
+        for month in range(1, 13):
+            column = np.flatnonzero(self.months == month)
+            frame[month] = self.profiles[:, column[0]] if len(column) else np.nan
+        return frame
+
+
+def ratio_to_moving_average(values: np.ndarray, window: int = 12) -> np.ndarray:
+    """
+    Each value divided by its centered moving average along the rows.
+
+    An even window uses the 2 x window average (half weight on the two end
+    points), as in classical decomposition. Points whose window is not
+    fully observed are NaN, including the first and last window // 2.
+    """
+    n_rows, n_dates = values.shape
+    half = window // 2
+    ratios = np.full(values.shape, np.nan)
+    if n_dates < 2 * half + 1:
+        return ratios
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    sums = np.concatenate([np.zeros((n_rows, 1)), np.cumsum(filled, axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((n_rows, 1), dtype=np.int64), np.cumsum(valid, axis=1)], axis=1)
+
+    # Window [t - half, t + half] for every centre t that has one
+    centre = np.arange(half, n_dates - half)
+    total = sums[:, centre + half + 1] - sums[:, centre - half]
+    observed = counts[:, centre + half + 1] - counts[:, centre - half]
+    if window % 2 == 0:
+        total = total - 0.5 * (filled[:, centre - half] + filled[:, centre + half])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        average = np.where(observed == 2 * half + 1, total / window, np.nan)
+        ratios[:, centre] = values[:, centre] / average
+    return ratios
+
+
+def month_profiles(
+    values: np.ndarray,
+    dates: pd.DatetimeIndex,
+    detrend: bool = False,
+    window: int = 12,
+    chunk_size: int = 50000
+) -> SeasonalProfile:
+    """
+    Calendar-month profile of every row of a value matrix.
+
+    Args:
+        values: (n_regions, n_dates) matrix
+        dates: Dates of the columns
+        detrend: Average ratios to the centered moving average instead of
+                 raw values
+        window: Moving average length in periods (detrend only)
+        chunk_size: Rows per pass (bounds temporary memory)
+
+    Returns:
+        SeasonalProfile
+    """
+    months = np.asarray(dates.month)
+    order = pd.unique(months)
+    month_code = pd.Index(order).get_indexer(months)
+
+    # Columns grouped by month, so each month is one contiguous reduceat slice
+    perm = np.argsort(month_code, kind='stable')
+    starts = np.searchsorted(month_code[perm], np.arange(len(order)))
+
+    profiles = np.full((values.shape[0], len(order)), np.nan)
+    if len(order) == 0:
+        return SeasonalProfile(order, profiles, detrend)
+
+    for first in range(0, values.shape[0], chunk_size):
+        block = values[first:first + chunk_size]
+        if detrend:
+            block = ratio_to_moving_average(block, window)
+        block = block[:, perm]
+        valid = ~np.isnan(block)
+        sums = np.add.reduceat(np.where(valid, block, 0.0), starts, axis=1)
+        counts = np.add.reduceat(valid, starts, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            profiles[first:first + chunk_size] = np.where(counts > 0, sums / counts, np.nan)
+
+    return SeasonalProfile(order, profiles, detrend)
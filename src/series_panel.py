@@ -0,0 +1,278 @@
+"""
+Series Panel Module
+
+Matrix view of a wide Zillow dataset: one row per region, one column per date.
+
+Zillow files keep each month (or week) as its own column, so working on the
+DataFrame means regex-scanning column names and selecting columns by string.
+A SeriesPanel parses the date columns once and keeps the values as a
+contiguous NumPy matrix, so lookbacks and windows become plain slices.
+"""
+
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import get_date_columns, get_metadata_columns
+from .region_index import RegionIndex
+from .rolling import RollingWindow
+from .seasonality import SeasonalProfile, month_profiles
+
+
+class SeriesPanel:
+    """
+    Wide time series stored as a value matrix plus metadata.
+
+    Attributes:
+        values: (n_regions, n_dates) matrix, C-contiguous (read-only when
+                the source frame is memory-mapped)
+        dates: Parsed DatetimeIndex of the value columns
+        date_columns: Original date column names, aligned with dates
+        meta: Metadata columns, row-aligned with values (keeps the source index)
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        dates: pd.DatetimeIndex,
+        date_columns: List[str],
+        meta: pd.DataFrame,
+        key: str = 'region_name'
+    ):
+        self.values = values
+        self.dates = dates
+        self.date_columns = date_columns
+        self.meta = meta
+        self.key = key
+        self._regions: Optional[RegionIndex] = None
+        self._rolling: Optional[RollingWindow] = None
+        self._seasonal: Dict[bool, SeasonalProfile] = {}
+        self._source_columns = None
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        dtype=np.float64,
+        key: str = 'region_name'
+    ) -> 'SeriesPanel':
+        """Build a panel from a wide Zillow DataFrame."""
+        date_cols = get_date_columns(df)
+        meta_cols = get_metadata_columns(df)
+
+        # No-copy when the frame already wraps a matching C-ordered matrix
+        # (e.g. a memory-mapped cache entry)
+        values = np.ascontiguousarray(df[date_cols].to_numpy(dtype=dtype))
+        panel = cls(
+            values=values,
+            dates=pd.to_datetime(date_cols),
+            date_columns=date_cols,
+            meta=df[meta_cols],
+            key=key
+        )
+        panel._source_columns = df.columns
+        return panel
+
+    @property
+    def n_regions(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def n_dates(self) -> int:
+        return self.values.shape[1]
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check the panel was built from this frame's current rows/columns."""
+        return df.columns is self._source_columns and len(df) == self.n_regions
+
+    # ----- Row lookups -----
+
+    @property
+    def regions(self) -> RegionIndex:
+        """RegionIndex over the key column of meta (built once)."""
+        if self._regions is None:
+            self._regions = RegionIndex(self.meta, self.key)
+        return self._regions
+
+    @property
+    def row_index(self) -> Dict:
+        """Map of key value (e.g. ZIP) to row position; first occurrence wins."""
+        return self.regions.positions_by_key
+
+    def row_position(self, region) -> Optional[int]:
+        """Row position of a region, or None if it is not in the panel."""
+        return self.regions.position(region)
+
+    def row_positions(self, regions: Sequence) -> np.ndarray:
+        """Row positions for many regions (-1 where missing)."""
+        return self.regions.positions(regions)
+
+    def row(self, region) -> Optional[np.ndarray]:
+        """Full history of one region, or None if it is not in the panel."""
+        pos = self.row_position(region)
+        return None if pos is None else self.values[pos]
+
+    # ----- Column slices -----
+
+    def latest(self) -> np.ndarray:
+        """Most recent value for every region."""
+        return self.values[:, -1]
+
+    def column(self, offset: int) -> np.ndarray:
+        """Values at a date position (negative offsets count from the end)."""
+        return self.values[:, offset]
+
+    def window(self, n: int) -> np.ndarray:
+        """
+        Last n date columns (all columns if fewer are available).
+
+        Unlike a `[-n:]` slice, n=0 selects no columns rather than all of them.
+        """
+        if n < 0:
+            raise ValueError(f"Window size must be non-negative, got {n}")
+        return self.values[:, -n:] if n > 0 else self.values[:, :0]
+
+    @property
+    def rolling(self) -> RollingWindow:
+        """Running sums/counts for trailing means at any lookback (built once)."""
+        if self._rolling is None:
+            self._rolling = RollingWindow.from_panel(self)
+        return self._rolling
+
+    def seasonal_profile(self, detrend: bool = False) -> SeasonalProfile:
+        """Calendar-month profiles of every region (built once per mode)."""
+        if detrend not in self._seasonal:
+            self._seasonal[detrend] = month_profiles(self.values, self.dates, detrend=detrend)
+        return self._seasonal[detrend]
+
+    def window_mean(self, n: int) -> np.ndarray:
+        """
+        Mean of the last n columns per region, skipping missing values.
+
+        Sums in the same order as DataFrame.mean(axis=1) over the wide frame,
+        so results match it bit for bit: a window with gaps is summed from a
+        filled row-major copy, a complete one column by column.
+        """
+        window = self.window(n)
+        valid = ~np.isnan(window)
+        counts = valid.sum(axis=1)
+        if valid.all():
+            sums = np.asfortranarray(window).sum(axis=1)
+        else:
+            sums = np.where(valid, window, 0.0).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    # ----- Long format -----
+
+    def to_long(
+        self,
+        value_name: str = 'value',
+        regions: Optional[Sequence] = None,
+        start=None,
+        end=None,
+        id_columns: Optional[List[str]] = None,
+        categorical: bool = True,
+        date_major: bool = False
+    ) -> pd.DataFrame:
+        """
+        Long-format (region, date, value) frame built by indexing the matrix.
+
+        Rows and dates are filtered before anything is materialized. Metadata
+        is repeated as integer codes (categorical columns) rather than as
+        copies of each string, and the date column is the parsed dates tiled
+        once per region. Rows are grouped by region, dates ascending within
+        each region. Without a region/date filter the value column is a view
+        of the panel matrix.
+
+        With categorical=False and date_major=True the result matches
+        DataFrame.melt: metadata keeps its dtypes and rows are grouped by
+        date, regions in frame order within each date.
+
+        Args:
+            value_name: Name of the value column
+            regions: Keep only these key values (e.g. ZIPs)
+            start, end: Keep dates in [start, end] (inclusive, either optional)
+            id_columns: Metadata columns to carry (default: all)
+            categorical: Repeat metadata as categorical codes
+            date_major: Group rows by date instead of by region (copies
+                        the values)
+
+        Returns:
+            DataFrame with id_columns, 'date' and value_name
+        """
+        meta = self.meta
+        if regions is not None:
+            rows = np.flatnonzero(meta[self.key].isin(regions).to_numpy())
+        else:
+            rows = None
+
+        date_mask = np.ones(self.n_dates, dtype=bool)
+        if start is not None:
+            date_mask &= self.dates >= pd.Timestamp(start)
+        if end is not None:
+            date_mask &= self.dates <= pd.Timestamp(end)
+        cols = None if date_mask.all() else np.flatnonzero(date_mask)
+
+        values = self.values
+        if rows is not None:
+            values = values[rows]
+            meta = meta.iloc[rows]
+        if cols is not None:
+            values = values[:, cols]
+        dates = self.dates if cols is None else self.dates[cols]
+
+        n_rows, n_dates = values.shape
+        if date_major:
+            region_of_row = np.tile(np.arange(n_rows), n_dates)
+        else:
+            region_of_row = np.repeat(np.arange(n_rows), n_dates)
+
+        data = {}
+        for col in (id_columns if id_columns is not None else list(meta.columns)):
+            series = meta[col]
+            if categorical:
+                cat = pd.Categorical(series)
+                data[col] = pd.Categorical.from_codes(cat.codes[region_of_row], dtype=cat.dtype)
+            else:
+                data[col] = series.array.take(region_of_row)
+        if date_major:
+            data['date'] = np.repeat(dates.to_numpy(), n_rows)
+            data[value_name] = values.T.reshape(-1)
+        else:
+            data['date'] = np.tile(dates.to_numpy(), n_rows)
+            # reshape of a C-ordered matrix is a view, so nothing is copied here
+            data[value_name] = values.reshape(-1)
+
+        return pd.DataFrame(data, copy=False)
+
+
+# Panels built so far, keyed by id() of the source frame. The weakref lets an
+# entry drop out when its frame is garbage collected.
+_PANELS: Dict[int, Tuple[weakref.ref, SeriesPanel]] = {}
+
+
+def get_panel(df: pd.DataFrame) -> SeriesPanel:
+    """
+    Get the SeriesPanel for a wide Zillow frame, building it on first use.
+
+    The panel is rebuilt if columns were added/removed or the row count
+    changed. Call invalidate_panel() after editing values in place.
+    """
+    key = id(df)
+    entry = _PANELS.get(key)
+    if entry is not None:
+        ref, panel = entry
+        if ref() is df and panel.matches(df):
+            return panel
+
+    panel = SeriesPanel.from_frame(df)
+    _PANELS[key] = (weakref.ref(df, lambda _, k=key: _PANELS.pop(k, None)), panel)
+    return panel
+
+
+def invalidate_panel(df: pd.DataFrame) -> None:
+    """Drop the cached panel for a frame so the next get_panel rebuilds it."""
+    _PANELS.pop(id(df), None)
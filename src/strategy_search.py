@@ -0,0 +1,241 @@
+"""
+Strategy Search Module
+
+Finds strategy weights whose composite scores best anticipated later
+appreciation, by evaluating thousands of candidate weight vectors at once.
+
+A candidate is judged by its information coefficient (IC): the correlation
+across ZIPs, at each past month-end, between its composite score and the
+ZIP's forward ZHVI appreciation over the next 6 or 12 months. The composite
+is linear in the weights, so each month reduces to the mean, covariance and
+return covariance of the five component scores. After one pass over the
+component history, every candidate's IC at every month is a batched matrix
+product over those small moment arrays. That pass is independent of the
+number of candidates.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import load_all_datasets, resolve_datasets
+from .score_history import ScoreHistory, score_history
+from .scoring_engine import COMPONENT_COLUMNS, STRATEGIES, FlipStrategy, strategy_weights
+from .series_panel import get_panel
+
+
+# FlipStrategy fields, in COMPONENT_COLUMNS order
+WEIGHT_COLUMNS = [
+    'appreciation_weight', 'velocity_weight', 'distress_weight',
+    'pricing_power_weight', 'value_gap_weight'
+]
+
+
+# ----- Candidates -----
+
+def simplex_weights(step: float = 0.05) -> np.ndarray:
+    """
+    Every weight vector on a grid of `step` that sums to 1.
+
+    Returns:
+        (n_candidates, 5) array; step 0.05 gives 10,626 candidates,
+        including the predefined strategies
+    """
+    n = int(round(1 / step))
+    grid = np.indices((n + 1,) * 4).reshape(4, -1).T
+    grid = grid[grid.sum(axis=1) <= n]
+    units = np.column_stack([grid, n - grid.sum(axis=1)])
+    return units / n
+
+
+def random_weights(n_candidates: int, seed: Optional[int] = None) -> np.ndarray:
+    """Weight vectors drawn uniformly from the simplex, (n_candidates, 5)."""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(len(COMPONENT_COLUMNS)), size=n_candidates)
+
+
+# ----- Historical outcomes -----
+
+def outcome_moments(
+    history: ScoreHistory,
+    horizon: int,
+    n_dates: int
+) -> Dict[str, np.ndarray]:
+    """
+    Per-month moments of component scores and forward appreciation.
+
+    Uses the first n_dates months of a score history built with
+    keep_components=True. Rows are the ZIPs inside the value range with an
+    appreciation score and a known forward value; other missing components
+    count as 50, as in the composite.
+
+    Returns:
+        Dict with 'cov' (n_dates, 5, 5) component covariance, 'cross'
+        (n_dates, 5) covariance with forward appreciation, 'return_var'
+        (n_dates,) and 'count' (n_dates,) rows used
+    """
+    n_components = len(COMPONENT_COLUMNS)
+    moments = {
+        'cov': np.full((n_dates, n_components, n_components), np.nan),
+        'cross': np.full((n_dates, n_components), np.nan),
+        'return_var': np.full(n_dates, np.nan),
+        'count': np.zeros(n_dates, dtype=np.int64),
+    }
+
+    values = history.current_value
+    for j in range(n_dates):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            forward = values[:, j + horizon] / values[:, j] - 1
+
+        scores = np.column_stack([history.components[c][:, j] for c in COMPONENT_COLUMNS])
+        scores[:, 1:] = np.where(np.isnan(scores[:, 1:]), 50.0, scores[:, 1:])
+        rows = history.in_range[:, j] & ~np.isnan(scores[:, 0]) & np.isfinite(forward)
+
+        count = int(rows.sum())
+        moments['count'][j] = count
+        if count < 3:
+            continue
+        centered = scores[rows] - scores[rows].mean(axis=0)
+        returns = forward[rows] - forward[rows].mean()
+        moments['cov'][j] = centered.T @ centered / count
+        moments['cross'][j] = centered.T @ returns / count
+        moments['return_var'][j] = returns @ returns / count
+
+    return moments
+
+
+def information_coefficients(weights: np.ndarray, moments: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Correlation of each candidate's composite with forward appreciation.
+
+    Args:
+        weights: (n_candidates, 5) weight vectors
+        moments: Output of outcome_moments()
+
+    Returns:
+        (n_candidates, n_dates) ICs (NaN where undefined)
+    """
+    covariance = weights @ moments['cross'].T
+    variance = np.einsum('ci,tij,cj->ct', weights, moments['cov'], weights, optimize=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return covariance / np.sqrt(variance * moments['return_var'])
+
+
+# ----- Selection -----
+
+def pareto_front(objectives: np.ndarray) -> np.ndarray:
+    """
+    Mask of rows not dominated by any other row (all objectives maximized).
+
+    Rows are visited best-first in lexicographic order, so a row can only
+    be dominated by one already on the front. NaN counts as worst.
+    """
+    objectives = np.where(np.isnan(objectives), -np.inf, objectives)
+    order = np.lexsort(objectives.T[::-1])[::-1]
+
+    front: List[int] = []
+    for i in order:
+        if front:
+            members = objectives[front]
+            dominated = (members >= objectives[i]).all(axis=1) & (members > objectives[i]).any(axis=1)
+            if dominated.any():
+                continue
+        front.append(i)
+
+    mask = np.zeros(len(objectives), dtype=bool)
+    mask[front] = True
+    return mask
+
+
+def to_strategy(row: pd.Series, name: Optional[str] = None) -> FlipStrategy:
+    """FlipStrategy from a search_strategies() result row."""
+    weights = [float(row[c]) for c in WEIGHT_COLUMNS]
+    if name is None:
+        name = row.get('strategy')
+    if name is None or pd.isna(name):
+        name = 'Custom ' + '/'.join(f"{w:.2f}" for w in weights)
+    return FlipStrategy(name, *weights)
+
+
+def search_strategies(
+    datasets: Optional[Dict[str, pd.DataFrame]] = None,
+    candidates: Optional[np.ndarray] = None,
+    horizons: Sequence[int] = (6, 12),
+    n_months: int = 60,
+    appreciation_lookback: int = 12,
+    metro_lookback: int = 6,
+    min_home_value: float = 50000,
+    max_home_value: float = 500000,
+    objectives: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Evaluate candidate strategy weights against historical appreciation.
+
+    Scores every ZIP at each of the n_months month-ends that have a known
+    value max(horizons) months later (via score_history). Each candidate is
+    then rated by its mean IC at each horizon and by IC stability (mean / std
+    across months).
+
+    Args:
+        datasets: Dict of loaded datasets or LazyDataset handles (loads if None)
+        candidates: (n, 5) weight vectors in COMPONENT_COLUMNS order
+                    (default: simplex_weights())
+        horizons: Forward appreciation horizons in months
+        n_months: Number of month-ends to evaluate
+        appreciation_lookback, metro_lookback, min_home_value, max_home_value:
+            As for flip_opportunity_score()
+        objectives: Metric columns to maximize for the Pareto front
+                    (default: all of them)
+
+    Returns:
+        DataFrame with one row per candidate: the five weights, 'strategy'
+        (name of a matching predefined strategy, else None),
+        'ic_{h}m' and 'ic_{h}m_ir' per horizon and 'pareto'. Pareto-best
+        candidates come first, each group sorted by the first objective.
+    """
+    if datasets is None:
+        datasets = load_all_datasets()
+    datasets = resolve_datasets(datasets, {})
+    if candidates is None:
+        candidates = simplex_weights()
+    candidates = np.asarray(candidates, dtype=np.float64)
+
+    # 1. Component history over the evaluation months plus the horizon
+    zhvi_dates = get_panel(datasets['zhvi_zip']).dates
+    horizon = max(horizons)
+    first = max(len(zhvi_dates) - n_months - horizon, 0)
+    history = score_history(
+        datasets,
+        appreciation_lookback=appreciation_lookback,
+        metro_lookback=metro_lookback,
+        min_home_value=min_home_value,
+        max_home_value=max_home_value,
+        start=zhvi_dates[first] if len(zhvi_dates) else None,
+        keep_components=True
+    )
+    n_dates = max(history.n_dates - horizon, 0)
+
+    # 2. All candidates at all months, per horizon
+    result = pd.DataFrame(candidates, columns=WEIGHT_COLUMNS)
+    named = {tuple(np.round(w, 6)): s.name for s, w in zip(STRATEGIES, strategy_weights(STRATEGIES).T)}
+    result['strategy'] = [named.get(tuple(np.round(w, 6))) for w in candidates]
+
+    metrics = []
+    for h in horizons:
+        ic = information_coefficients(candidates, outcome_moments(history, h, n_dates))
+        valid = ~np.isnan(ic)
+        n_valid = valid.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(valid, ic, 0.0).sum(axis=1) / n_valid
+            std = np.sqrt(np.where(valid, (ic - mean[:, None]) ** 2, 0.0).sum(axis=1) / n_valid)
+            result[f'ic_{h}m'] = mean
+            result[f'ic_{h}m_ir'] = mean / std
+        metrics += [f'ic_{h}m', f'ic_{h}m_ir']
+
+    # 3. Pareto-best candidates
+    objectives = objectives or metrics
+    result['pareto'] = pareto_front(result[objectives].to_numpy(dtype=np.float64))
+    return result.sort_values(
+        ['pareto', objectives[0]], ascending=[False, False], kind='stable'
+    ).reset_index(drop=True)
@@ -17,13 +17,16 @@ import sys
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.data_loader import load_all_datasets, get_date_columns
+from src.data_loader import load_all_datasets, melt_to_long_format, CACHE_DIR
 from src.scoring_engine import (
-    flip_opportunity_score,
     filter_opportunities,
-    summarize_by_geography,
-    FAST_FLIP, VALUE_ADD_FLIP, BALANCED, FlipStrategy
+    FAST_FLIP, VALUE_ADD_FLIP, BALANCED, STRATEGIES, FlipStrategy
 )
+from src.geo_cube import GeoCube
+from src.profiling import profile_frame
+from src.region_index import get_region_index
+from src.score_store import get_component_store
+from src.score_history import score_history
 from src.property_analyzer import PropertyAnalyzer
 import json
 from datetime import datetime, timedelta
@@ -58,10 +61,16 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600)
 def load_data():
-    """Load and cache all datasets."""
-    return load_all_datasets()
+    """
+    Load and cache all datasets.
+
+    Cached as a resource so every rerun gets the same frames: the panels and
+    indexes built for them (keyed by frame) are reused, and memory-mapped
+    values are not pickled. The frames are shared, so treat them as read-only.
+    """
+    return load_all_datasets(cache_dir=CACHE_DIR, parallel=True)
 
 
 def load_agent_data():
@@ -112,19 +121,57 @@ def load_agent_data():
     return data
 
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600)
+def load_score_store(_datasets):
+    """Component scores for the loaded data (computed once per data version)."""
+    return get_component_store(_datasets, cache_dir=CACHE_DIR)
+
+
+@st.cache_resource(ttl=3600, max_entries=16)
 def compute_scores(_datasets, strategy_name, min_value, max_value):
-    """Compute scores with caching."""
-    strategy_map = {
-        "Fast Flip": FAST_FLIP,
-        "Value-Add Flip": VALUE_ADD_FLIP,
-        "Balanced": BALANCED
-    }
-    strategy = strategy_map[strategy_name]
+    """
+    Scores for one strategy: a reweight and mask over the component store.
+
+    Cached as a resource so sidebar reruns get the same frame back and
+    filter_opportunities can reuse its FilterIndex.
+    """
+    strategy = {s.name: s for s in STRATEGIES}[strategy_name]
+    return load_score_store(_datasets).scores(
+        strategy,
+        min_home_value=min_value,
+        max_home_value=max_value
+    )
 
-    return flip_opportunity_score(
-        datasets=_datasets,
-        strategy=strategy,
+
+@st.cache_resource(ttl=3600, max_entries=16)
+def load_geo_cube(_scores, strategy_name, min_value, max_value, min_score):
+    """
+    Geographic rollup of the ZIPs at or above min_score.
+
+    State and metro selections are slices of the cube, so changing them
+    does not rebuild it.
+    """
+    return GeoCube(filter_opportunities(_scores, min_score=min_score))
+
+
+@st.cache_resource(ttl=3600, max_entries=1)
+def load_component_history(_datasets, version):
+    """
+    Component scores at every month-end, computed once per data version.
+
+    Components do not depend on the strategy or price range, so every
+    sidebar setting reweights this one history.
+    """
+    return score_history(_datasets, keep_components=True)
+
+
+@st.cache_resource(ttl=3600, max_entries=4)
+def load_score_history(_datasets, strategy_name, min_value, max_value):
+    """Composite scores at every month-end for one strategy and price range."""
+    strategy = {s.name: s for s in STRATEGIES}[strategy_name]
+    version = load_score_store(_datasets).version
+    return load_component_history(_datasets, version).reweight(
+        strategy,
         min_home_value=min_value,
         max_home_value=max_value
     )
@@ -358,7 +405,14 @@ def main():
             st.warning("No data to display. Adjust filters.")
         else:
             # State-level summary
-            state_summary = summarize_by_geography(filtered_scores, level='state')
+            geo_cube = load_geo_cube(
+                all_scores, strategy_name, price_range[0], price_range[1], min_score
+            )
+            geo_filters = {
+                'states': selected_states if selected_states else None,
+                'metros': selected_metros if selected_metros else None
+            }
+            state_summary = geo_cube.summarize('state', **geo_filters)
             state_summary = state_summary.reset_index()
 
             # US State choropleth
@@ -411,7 +465,7 @@ def main():
             st.markdown("---")
             st.subheader("Metro Area Analysis")
 
-            metro_summary = summarize_by_geography(filtered_scores, level='metro')
+            metro_summary = geo_cube.summarize('metro', **geo_filters)
             metro_summary = metro_summary.reset_index()
             metro_summary = metro_summary[metro_summary['num_opportunities'] >= 3]  # Min 3 ZIPs
 
@@ -541,19 +595,17 @@ def main():
             if selected_trend_zips:
                 # Get ZHVI data for selected ZIPs
                 zhvi_df = datasets['zhvi_zip']
-                date_cols = get_date_columns(zhvi_df)
 
-                trend_data = zhvi_df[zhvi_df['region_name'].isin(selected_trend_zips)]
-
-                # Melt to long format
-                trend_long = trend_data.melt(
-                    id_vars=['region_name', 'city', 'state'],
-                    value_vars=date_cols,
-                    var_name='date',
-                    value_name='value'
+                # Long format for just the selected ZIPs
+                trend_long = melt_to_long_format(
+                    zhvi_df,
+                    regions=selected_trend_zips,
+                    id_columns=['region_name', 'city', 'state']
+                )
+                trend_long['label'] = (
+                    trend_long['region_name'].astype(str) + ' - ' +
+                    trend_long['city'].astype(object).fillna('')
                 )
-                trend_long['date'] = pd.to_datetime(trend_long['date'])
-                trend_long['label'] = trend_long['region_name'] + ' - ' + trend_long['city'].fillna('')
 
                 # Line chart
                 fig_trend = px.line(
@@ -592,6 +644,31 @@ def main():
                 fig_yoy.update_layout(height=400, legend=dict(orientation="h", y=-0.2))
                 st.plotly_chart(fig_yoy, use_container_width=True)
 
+                # Score history
+                st.markdown("---")
+                st.subheader("Opportunity Score History")
+
+                history = load_score_history(datasets, strategy_name, price_range[0], price_range[1])
+                score_long = history.to_long(
+                    regions=selected_trend_zips,
+                    id_columns=['region_name', 'city']
+                )
+                score_long['label'] = (
+                    score_long['region_name'].astype(str) + ' - ' +
+                    score_long['city'].astype(object).fillna('')
+                )
+
+                fig_history = px.line(
+                    score_long,
+                    x='date',
+                    y='composite_score',
+                    color='label',
+                    title=f'{strategy_name} Score by Month',
+                    labels={'composite_score': 'Composite Score', 'date': 'Date'}
+                )
+                fig_history.update_layout(height=400, legend=dict(orientation="h", y=-0.2))
+                st.plotly_chart(fig_history, use_container_width=True)
+
     # ----- TAB 5: COMPARE ZIPS -----
     with tab5:
         st.subheader("Compare ZIP Codes")
@@ -611,8 +688,9 @@ def main():
 
             if zip1 and zip2:
                 # Get data for both ZIPs
-                zip1_data = filtered_scores[filtered_scores['region_name'] == zip1].iloc[0]
-                zip2_data = filtered_scores[filtered_scores['region_name'] == zip2].iloc[0]
+                zip_index = get_region_index(all_scores)
+                zip1_data = zip_index.row(zip1)
+                zip2_data = zip_index.row(zip2)
 
                 # Comparison table
                 st.markdown("---")
@@ -709,19 +787,17 @@ def main():
                 st.subheader("Price Trend Comparison")
 
                 zhvi_df = datasets['zhvi_zip']
-                date_cols = get_date_columns(zhvi_df)
 
                 compare_zips = [zip1, zip2]
-                trend_data = zhvi_df[zhvi_df['region_name'].isin(compare_zips)]
-
-                trend_long = trend_data.melt(
-                    id_vars=['region_name', 'city'],
-                    value_vars=date_cols,
-                    var_name='date',
-                    value_name='value'
+                trend_long = melt_to_long_format(
+                    zhvi_df,
+                    regions=compare_zips,
+                    id_columns=['region_name', 'city']
+                )
+                trend_long['label'] = (
+                    trend_long['region_name'].astype(str) + ' - ' +
+                    trend_long['city'].astype(object).fillna('')
                 )
-                trend_long['date'] = pd.to_datetime(trend_long['date'])
-                trend_long['label'] = trend_long['region_name'] + ' - ' + trend_long['city'].fillna('')
 
                 fig_compare_trend = px.line(
                     trend_long,
@@ -940,6 +1016,43 @@ def main():
 
             st.markdown("---")
 
+            # ===== SCORING PIPELINE PROFILE =====
+            st.markdown("### Scoring Pipeline Profile")
+
+            scoring_logs = agent_data['agent_logs'].get('ScoringAgent', [])
+            profiles = [log for log in scoring_logs if log.get('action') == 'scoring_profiled']
+            if profiles:
+                latest_profile = profiles[-1]
+                stage_df = profile_frame(latest_profile.get('details', {})).reset_index()
+                st.caption(
+                    f"Recorded {latest_profile.get('timestamp', '')[:16]} - "
+                    f"{latest_profile['details'].get('total_seconds', 0):.2f}s total"
+                )
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    fig_stages = px.bar(
+                        stage_df,
+                        x='wall_seconds',
+                        y='stage',
+                        orientation='h',
+                        title='Wall Time by Stage (s)',
+                        hover_data=['cpu_seconds', 'allocated_mb']
+                    )
+                    fig_stages.update_layout(height=400, yaxis={'autorange': 'reversed'})
+                    st.plotly_chart(fig_stages, use_container_width=True)
+                with col2:
+                    st.dataframe(
+                        stage_df.round({'wall_seconds': 4, 'cpu_seconds': 4, 'share': 3,
+                                        'peak_rss_mb': 0, 'allocated_mb': 1}),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+            else:
+                st.info("No scoring profile logged. Run the simulation with `--profile`.")
+
+            st.markdown("---")
+
             # ===== AGENT DECISION LOG =====
             st.markdown("### Agent Decision Log")
 
@@ -993,10 +1106,11 @@ def main():
             with col2:
                 st.markdown("**Quick Actions**")
                 if st.button("🔄 Refresh Agent Data"):
-                    st.cache_data.clear()
+                    # Datasets, scores, geo cubes and history are all cached as resources
+                    st.cache_resource.clear()
                     st.rerun()
 
-                st.caption("Click to reload agent data from disk.")
+                st.caption("Click to reload agent data and scores from disk.")
 
             with col3:
                 st.markdown("**Export Options**")
@@ -0,0 +1,59 @@
+"""FilterIndex queries must select the same rows as plain boolean masks."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.filter_index import FilterIndex
+
+
+@pytest.fixture(scope='module')
+def score_df():
+    rng = np.random.default_rng(0)
+    # Not a multiple of 8, so the last packed byte is partial
+    n = 1003
+    df = pd.DataFrame({
+        'state': rng.choice(['CA', 'TX', 'OH', None], n),
+        'metro': rng.choice([f"Metro {i}" for i in range(40)] + [None], n),
+        'composite_score': rng.uniform(0, 100, n),
+        'appreciation_pct': rng.normal(3, 5, n),
+        'days_to_pending': rng.uniform(5, 90, n),
+        'price_cut_pct': rng.uniform(0, 40, n),
+    })
+    df.loc[rng.choice(n, 50), 'days_to_pending'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_positions_match_masks(score_df, seed):
+    rng = np.random.default_rng(seed)
+    criteria = {
+        'min_score': float(rng.uniform(20, 80)),
+        'states': ['TX', 'OH', 'ZZ'] if seed % 2 else None,
+        'metros': [f"Metro {i}" for i in rng.choice(40, 10)] if seed % 3 else None,
+        'min_appreciation': float(rng.uniform(-5, 8)) if seed % 4 else None,
+        'max_days_to_pending': float(rng.uniform(20, 70)),
+        'min_price_cuts': float(rng.uniform(0, 20)) if seed % 5 else None,
+    }
+
+    mask = score_df['composite_score'] >= criteria['min_score']
+    if criteria['states']:
+        mask &= score_df['state'].isin(criteria['states'])
+    if criteria['metros']:
+        mask &= score_df['metro'].isin(criteria['metros'])
+    if criteria['min_appreciation'] is not None:
+        mask &= score_df['appreciation_pct'] >= criteria['min_appreciation']
+    mask &= score_df['days_to_pending'] <= criteria['max_days_to_pending']
+    if criteria['min_price_cuts'] is not None:
+        mask &= score_df['price_cut_pct'] >= criteria['min_price_cuts']
+
+    positions = FilterIndex(score_df).positions(**criteria)
+    np.testing.assert_array_equal(positions, np.flatnonzero(mask.to_numpy()))
+
+
+def test_category_bitmaps_partition_rows(score_df):
+    uniques, bitmaps = FilterIndex(score_df)._category_index('state')
+    assert bitmaps.shape == (len(uniques), (len(score_df) + 7) // 8)
+    # Every row is set in exactly one bitmap, and padding bits stay clear
+    bits = np.unpackbits(bitmaps, axis=1)
+    assert (bits[:, :len(score_df)].sum(axis=0) == 1).all()
+    assert not bits[:, len(score_df):].any()
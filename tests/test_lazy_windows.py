@@ -0,0 +1,27 @@
+"""Lazy (windowed) loading must score exactly like loading every month."""
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_datasets
+from src.data_loader import DATASET_FILES, load_all_datasets
+from src.scoring_engine import flip_opportunity_score
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory):
+    out_dir = generate_datasets(tmp_path_factory.mktemp('zillow'), n_regions=500, n_months=40)
+    # End the weekly file early in a month, where a window of lookback
+    # calendar months holds fewer than lookback * 4 weeks
+    path = out_dir / DATASET_FILES['sale_to_list']
+    weekly = pd.read_csv(path)
+    weekly.iloc[:, :-4].to_csv(path, index=False)
+    assert pd.Timestamp(weekly.columns[-5]).day <= 7
+    return out_dir
+
+
+@pytest.mark.parametrize('metro_lookback', range(1, 7))
+def test_lazy_matches_eager(data_dir, metro_lookback):
+    eager = flip_opportunity_score(load_all_datasets(data_dir), metro_lookback=metro_lookback)
+    lazy = flip_opportunity_score(load_all_datasets(data_dir, lazy=True), metro_lookback=metro_lookback)
+    pd.testing.assert_frame_equal(lazy, eager, check_exact=True, check_categorical=False)
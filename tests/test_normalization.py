@@ -0,0 +1,55 @@
+"""Streaming (sketch) clip bounds must stay close in rank to the exact ones."""
+import numpy as np
+import pytest
+
+from src.normalization import StreamingNormalizer, quantile_bounds
+
+# Rank error allowed for the default k=200 (a few times the expected 1/k)
+MAX_RANK_ERROR = 0.02
+
+
+def _rank(sorted_values: np.ndarray, value: float) -> float:
+    """Fraction of values below value."""
+    return np.searchsorted(sorted_values, value, side='left') / len(sorted_values)
+
+
+def _rank_errors(values: np.ndarray, normalizer: StreamingNormalizer):
+    ordered = np.sort(values)
+    exact = quantile_bounds(values, normalizer.clip_percentile)
+    return [abs(_rank(ordered, s) - _rank(ordered, e)) for s, e in zip(normalizer.bounds(), exact)]
+
+
+@pytest.mark.parametrize('clip_percentile', [1.0, 5.0])
+def test_batched_bounds(clip_percentile):
+    rng = np.random.default_rng(0)
+    # Heavy-tailed, like month-over-month percent changes
+    values = rng.standard_t(3, size=200_000)
+    normalizer = StreamingNormalizer(clip_percentile=clip_percentile)
+    for batch in np.array_split(values, 50):
+        normalizer.update(batch)
+
+    assert normalizer.sketch.count == len(values)
+    assert max(_rank_errors(values, normalizer)) < MAX_RANK_ERROR
+
+
+def test_merged_bounds():
+    rng = np.random.default_rng(1)
+    # Workers see differently distributed parts of the data
+    parts = [rng.normal(loc, 1 + loc, size=40_000) for loc in range(5)]
+    merged = StreamingNormalizer()
+    for part in parts:
+        merged.merge(StreamingNormalizer().update(part))
+
+    values = np.concatenate(parts)
+    assert merged.sketch.count == len(values)
+    assert merged.sketch.min == values.min() and merged.sketch.max == values.max()
+    assert max(_rank_errors(values, merged)) < MAX_RANK_ERROR
+
+
+def test_missing_values_ignored():
+    values = np.arange(150, dtype=np.float64)
+    with_gaps = np.concatenate([values, np.full(50, np.nan)])
+    normalizer = StreamingNormalizer().update(with_gaps)
+    assert normalizer.sketch.count == len(values)
+    # Fewer than k values are kept whole: off by at most one rank
+    assert max(_rank_errors(values, normalizer)) < 1.5 / len(values)
@@ -0,0 +1,56 @@
+"""Incremental refresh: appended months and the regions they report."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_datasets
+from src.data_cache import cache_paths
+from src.data_loader import DATASET_FILES, load_all_datasets, refresh_datasets
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return generate_datasets(tmp_path / 'zillow', n_regions=50, n_months=12)
+
+
+def _write_update(data_dir, cache_dir):
+    """Cache all but the last two months of zhvi_zip, then restore them."""
+    path = data_dir / DATASET_FILES['zhvi_zip']
+    full = pd.read_csv(path, dtype={'RegionName': str})
+    full.iloc[:, :-2].to_csv(path, index=False)
+    load_all_datasets(data_dir, cache_dir=cache_dir)
+
+    # Flat new months, except region 0 moves and then returns to its last value
+    full = full.astype({col: float for col in full.columns[-2:]})
+    full.iloc[:, -2] = full.iloc[:, -3]
+    full.iloc[:, -1] = full.iloc[:, -3]
+    full.iloc[0, -2] = full.iloc[0, -3] * 1.1
+    full.to_csv(path, index=False)
+    return path, full
+
+
+def test_changed_regions_cover_every_new_month(data_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    _, full = _write_update(data_dir, cache_dir)
+
+    delta = refresh_datasets(data_dir, cache_dir)['zhvi_zip']
+    assert not delta.full_reload
+    assert delta.new_dates == list(full.columns[-2:])
+    assert delta.changed_regions == [full['RegionName'].iloc[0]]
+
+
+def test_entry_without_dates_reloads(data_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    path, _ = _write_update(data_dir, cache_dir)
+
+    manifest_path = cache_paths(path, cache_dir)['manifest']
+    manifest = json.loads(manifest_path.read_text())
+    manifest['columns'] = manifest['metadata_columns']
+    manifest['date_columns'] = []
+    manifest_path.write_text(json.dumps(manifest))
+
+    delta = refresh_datasets(data_dir, cache_dir)['zhvi_zip']
+    assert delta.full_reload
+    assert len(delta.changed_regions) == 50
@@ -0,0 +1,68 @@
+"""Trailing-window means: direct window means and RollingWindow totals."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rolling import RollingWindow
+from src.series_panel import SeriesPanel
+
+
+def _panel(values: np.ndarray) -> SeriesPanel:
+    dates = pd.date_range('2020-01-31', periods=values.shape[1], freq='ME')
+    return SeriesPanel(
+        values=values,
+        dates=dates,
+        date_columns=[d.strftime('%Y-%m-%d') for d in dates],
+        meta=pd.DataFrame({'region_name': [f"R{i}" for i in range(values.shape[0])]})
+    )
+
+
+@pytest.fixture(scope='module')
+def values():
+    rng = np.random.default_rng(0)
+    return rng.uniform(0, 1, (300, 60))
+
+
+@pytest.mark.parametrize('gaps', [False, True])
+@pytest.mark.parametrize('n', [1, 6, 12, 24, 48, 100])
+def test_window_mean_matches_dataframe_mean(values, gaps, n):
+    values = values.copy()
+    if gaps:
+        values[::7, -3] = np.nan
+        values[5, :] = np.nan
+    # One block per column, as the loaded wide frames are
+    wide = pd.DataFrame({f"c{j}": values[:, j] for j in range(values.shape[1])})
+    expected = wide.iloc[:, -n:].mean(axis=1).to_numpy()
+
+    np.testing.assert_array_equal(_panel(values).window_mean(n), expected)
+
+
+def test_appends_match_full_build(values):
+    panel = _panel(values)
+    full = RollingWindow.from_panel(panel)
+
+    grown = RollingWindow.from_values(values[:, :10], panel.dates[:10])
+    assert grown.extend(panel) == panel.n_dates - 10
+    assert grown.extend(panel) == 0
+
+    for lookback in (1, 6, 24):
+        np.testing.assert_allclose(grown.mean(lookback), full.mean(lookback), rtol=1e-12)
+        # Running-sum differences only agree with direct sums to the last bits
+        np.testing.assert_allclose(
+            grown.mean(lookback), panel.window_mean(lookback), rtol=1e-10
+        )
+
+
+def test_append_rejects_older_dates(values):
+    panel = _panel(values)
+    window = RollingWindow.from_panel(panel)
+    with pytest.raises(ValueError):
+        window.append(panel.dates[-1], values[:, -1])
+
+
+def test_window_sizes(values):
+    panel = _panel(values)
+    assert panel.window(0).shape == (300, 0)
+    assert panel.window(100).shape == (300, 60)
+    with pytest.raises(ValueError):
+        panel.window(-1)
@@ -0,0 +1,38 @@
+"""Reweighting a component history must equal scoring it from scratch."""
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generate_datasets
+from src.data_loader import load_all_datasets
+from src.score_history import score_history
+from src.scoring_engine import STRATEGIES
+
+
+@pytest.fixture(scope='module')
+def datasets(tmp_path_factory):
+    out_dir = generate_datasets(tmp_path_factory.mktemp('zillow'), n_regions=300, n_months=30)
+    return load_all_datasets(out_dir)
+
+
+@pytest.fixture(scope='module')
+def components(datasets):
+    return score_history(datasets, keep_components=True)
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES, ids=lambda s: s.name)
+@pytest.mark.parametrize('value_range', [(50000, 500000), (100000, 300000)])
+def test_reweight_matches_score_history(datasets, components, strategy, value_range):
+    min_value, max_value = value_range
+    direct = score_history(datasets, strategy, min_home_value=min_value, max_home_value=max_value)
+    reweighted = components.reweight(strategy, min_home_value=min_value, max_home_value=max_value)
+
+    np.testing.assert_array_equal(reweighted.composite, direct.composite)
+    np.testing.assert_array_equal(reweighted.in_range, direct.in_range)
+    assert reweighted.strategy is strategy
+    # Shared with the component history, not copied
+    assert reweighted.components is components.components
+
+
+def test_reweight_needs_components(datasets):
+    with pytest.raises(ValueError):
+        score_history(datasets).reweight(STRATEGIES[0])
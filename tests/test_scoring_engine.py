@@ -0,0 +1,57 @@
+"""Position-based joins must score like the merges they replace."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_datasets
+from src.data_loader import load_all_datasets
+from src.normalization import normalize_to_score
+from src.score_history import score_history
+from src.scoring_engine import (
+    calculate_price_appreciation,
+    calculate_value_tier_gap,
+    compute_component_scores,
+    get_metro_metrics,
+    score_metros,
+)
+
+
+@pytest.fixture(scope='module')
+def datasets(tmp_path_factory):
+    out_dir = generate_datasets(tmp_path_factory.mktemp('zillow'), n_regions=500, n_months=40)
+    datasets = load_all_datasets(out_dir)
+    # County names repeat across states, so one ZIP county can match
+    # several bottom-tier rows
+    bottom = datasets['zhvi_bottom_tier']
+    assert bottom['region_name'].duplicated().any()
+    return datasets
+
+
+def merged_value_gap_scores(datasets) -> pd.Series:
+    """value_gap_score by ZIP the way left merges compute it."""
+    result = calculate_price_appreciation(datasets['zhvi_zip'])
+    metro_scores = score_metros(get_metro_metrics(datasets))
+    value_gap = calculate_value_tier_gap(datasets['zhvi_zip'], datasets['zhvi_bottom_tier'])
+
+    result = result.merge(metro_scores[['metro', 'velocity_score']], on='metro', how='left')
+    result = result.merge(value_gap, on='county_name', how='left')
+    result['value_gap_score'] = normalize_to_score(result['value_gap_pct'])
+    result = result.drop_duplicates(subset=['region_id'], keep='first')
+    return result.set_index('region_name')['value_gap_score']
+
+
+def test_value_gap_matches_merge(datasets):
+    expected = merged_value_gap_scores(datasets)
+    components = compute_component_scores(datasets, min_home_value=None, max_home_value=None)
+    actual = components.set_index('region_name')['value_gap_score']
+
+    pd.testing.assert_series_equal(actual, expected.loc[actual.index], check_exact=True)
+
+
+def test_history_value_gap_matches_latest_scores(datasets):
+    components = compute_component_scores(datasets, min_home_value=None, max_home_value=None)
+    history = score_history(datasets, keep_components=True)
+
+    rows = history.panel.row_positions(components['region_name'])
+    latest = history.components['value_gap_score'][rows, -1]
+    np.testing.assert_array_equal(latest, components['value_gap_score'].to_numpy())
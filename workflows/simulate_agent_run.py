@@ -16,8 +16,11 @@ import pandas as pd
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data_loader import load_all_datasets
+from src.data_loader import load_all_datasets, CACHE_DIR, DATASET_FILES
 from src.scoring_engine import flip_opportunity_score, BALANCED, FAST_FLIP, VALUE_ADD_FLIP
+from src.score_history import score_history
+from src.series_panel import get_panel
+from src.profiling import PipelineProfile
 from src.agent_workflow import (
     AgentOrchestrator, AgentState, AgentLog,
     DataRefreshAgent, ScoringAgent, OpportunityDetectionAgent,
@@ -92,9 +95,18 @@ def generate_synthetic_opportunities(scores_df: pd.DataFrame, day: int, previous
     return opportunities
 
 
-def run_simulation(days: int = 90, output_dir: Path = None):
+def run_simulation(days: int = 90, output_dir: Path = None, use_history: bool = True,
+                   profile: bool = False):
     """
     Run the full simulation for the specified number of days.
+
+    With use_history, each simulated day sees real historical scores: the
+    last days // 30 + 1 ZHVI month-ends are replayed, one month per 30
+    simulated days. Otherwise the latest scores get synthetic noise
+    (simulate_score_variation).
+
+    With profile, one flip_opportunity_score() run is profiled stage by
+    stage and logged by the ScoringAgent on the first scoring day.
     """
     if output_dir is None:
         output_dir = Path(__file__).parent.parent / "data" / "processed" / "agent_logs"
@@ -106,17 +118,44 @@ def run_simulation(days: int = 90, output_dir: Path = None):
 
     # Load real data
     print("\nLoading datasets...")
-    datasets = load_all_datasets()
+    load_times = {}
+    datasets = load_all_datasets(cache_dir=CACHE_DIR, parallel=True, timings=load_times)
+    print(f"Datasets loaded in {load_times['total']:.2f}s "
+          f"(slowest: {max(DATASET_FILES, key=load_times.get)})")
 
     # Get base scores
-    print("Computing base scores...")
-    base_scores = flip_opportunity_score(
-        datasets=datasets,
-        strategy=BALANCED,
-        min_home_value=50000,
-        max_home_value=500000
-    )
-    print(f"Base scores computed for {len(base_scores):,} ZIPs")
+    history = None
+    history_scores = {}
+    if use_history:
+        print("Computing score history...")
+        n_months = days // 30 + 1
+        zhvi_dates = get_panel(datasets['zhvi_zip']).dates
+        history = score_history(
+            datasets=datasets,
+            strategy=BALANCED,
+            min_home_value=50000,
+            max_home_value=500000,
+            start=zhvi_dates[max(len(zhvi_dates) - n_months, 0)],
+            keep_components=True
+        )
+        base_scores = history.at()
+        print(f"Score history computed for {len(base_scores):,} ZIPs over "
+              f"{history.n_dates} months")
+    scoring_profile = PipelineProfile() if profile else None
+    if history is None or scoring_profile is not None:
+        print("Computing base scores...")
+        latest_scores = flip_opportunity_score(
+            datasets=datasets,
+            strategy=BALANCED,
+            min_home_value=50000,
+            max_home_value=500000,
+            profile=scoring_profile
+        )
+        print(f"Base scores computed for {len(latest_scores):,} ZIPs")
+        if history is None:
+            base_scores = latest_scores
+    if scoring_profile is not None:
+        print(scoring_profile.to_frame().round(4).to_string())
 
     # Initialize orchestrator
     orchestrator = AgentOrchestrator(output_dir)
@@ -148,8 +187,14 @@ def run_simulation(days: int = 90, output_dir: Path = None):
         if not (is_weekday or is_sunday):
             continue
 
-        # Simulate score variations
-        current_scores = simulate_score_variation(base_scores, day, days)
+        # Scores for this day: a replayed month-end, or simulated variation
+        if history is not None:
+            position = max(history.n_dates - 1 - (days - day) // 30, 0)
+            if position not in history_scores:
+                history_scores[position] = history.at(position=position)
+            current_scores = history_scores[position]
+        else:
+            current_scores = simulate_score_variation(base_scores, day, days)
 
         # Generate synthetic new opportunities
         new_opps = generate_synthetic_opportunities(current_scores, day, discovered_hashes)
@@ -159,7 +204,8 @@ def run_simulation(days: int = 90, output_dir: Path = None):
             'current_date': current_date,
             'state': orchestrator.state,
             'scores_df': current_scores,
-            'previous_scores_df': previous_scores
+            'previous_scores_df': previous_scores,
+            'scoring_profile': scoring_profile
         }
 
         # Data refresh check
@@ -167,6 +213,7 @@ def run_simulation(days: int = 90, output_dir: Path = None):
 
         # Scoring
         scoring_result = orchestrator.scoring_agent.run(context)
+        scoring_profile = None  # logged once
 
         # Detection (use our synthetic opportunities)
         detection_result = {
@@ -329,11 +376,16 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Simulate agent workflow")
     parser.add_argument('--days', type=int, default=90, help='Number of days to simulate')
     parser.add_argument('--output', type=str, default=None, help='Output directory')
+    parser.add_argument('--simulated-scores', action='store_true',
+                        help='Add random variation to the latest scores instead of replaying score history')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile each scoring stage (time and memory) and log it')
 
     args = parser.parse_args()
 
     output_path = Path(args.output) if args.output else None
-    summary = run_simulation(days=args.days, output_dir=output_path)
+    summary = run_simulation(days=args.days, output_dir=output_path,
+                             use_history=not args.simulated_scores, profile=args.profile)
 
     # Generate timeline data
     output_dir = output_path or Path(__file__).parent.parent / "data" / "processed" / "agent_logs"